@@ -1280,6 +1280,14 @@ class ShadowOpsBot(commands.Bot):
         if self.project_monitor:
             await self._shutdown_component("Project Monitor", self.project_monitor.stop_monitoring())
 
+        # Gepufferte A/B-Test-Ergebnisse auf die Platte schreiben
+        if getattr(self, 'prompt_ab_testing', None):
+            self.prompt_ab_testing.close()
+
+        # Gepoolten HTTP-Client des Research-Fetchers schliessen
+        if getattr(self, 'research_fetcher', None):
+            await self._shutdown_component("Research Fetcher", self.research_fetcher.aclose())
+
         # Stop GitHub webhook server
         if self.github_integration and self.github_integration.enabled:
             await self._shutdown_component("GitHub Integration", self.github_integration.stop_webhook_server())
@@ -51,6 +51,7 @@ class SecurityEventWatcher:
     """
     # Class-level defaults allow easy test overrides
     event_cache_file: Path = Path("logs/seen_events.json")
+    escalated_cache_file: Path = Path("logs/escalated_events.json")
     event_cache_duration: int = 86400  # 24 hours
 
     def __init__(self, bot, config: Dict):
@@ -65,7 +66,7 @@ class SecurityEventWatcher:
         self.max_history = 1000
         # Instance paths default to class-level for easier patching in tests
         self.event_cache_file = Path(self.event_cache_file)
-        self.escalated_cache_file = Path("logs/escalated_events.json")
+        self.escalated_cache_file = Path(self.escalated_cache_file)
         self.event_cache_duration = self.event_cache_duration
 
         # Integration references
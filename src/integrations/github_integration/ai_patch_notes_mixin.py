@@ -1388,14 +1388,14 @@ Do NOT invent features that are not tagged [FEATURE]!"""
                     if not selected_variant:
                         # Fallback wenn Variante nicht existiert
                         selected_variant = self.prompt_ab_testing.select_variant(
-                            project=repo_name, strategy='weighted_random'
+                            project=repo_name, strategy='thompson'
                         )
                         variant_id = selected_variant.id
                     self.logger.info(f"🧪 Learning-DB: Beste Variante '{variant_id}' für {repo_name}")
                 else:
                     # 3. Nicht genug DB-Daten → klassisches A/B Testing
                     selected_variant = self.prompt_ab_testing.select_variant(
-                        project=repo_name, strategy='weighted_random'
+                        project=repo_name, strategy='thompson'
                     )
                     variant_id = selected_variant.id
                     self.logger.info(f"🧪 A/B Test: Variante '{selected_variant.name}' (ID: {variant_id})")
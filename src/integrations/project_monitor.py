@@ -6,14 +6,16 @@ Health checks, uptime tracking, and Discord dashboards
 import asyncio
 import aiohttp
 import logging
-import json
 import os
+import re
 import shutil
+import signal
 import ssl
 import time
 from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from urllib.parse import urlsplit
 import discord
 
 # EmbedBuilder + Severity fuer die Enterprise-Health-Check-Erweiterung (Phase 5b, Issue #278).
@@ -41,8 +43,68 @@ except ImportError:  # pragma: no cover
         urgency_line,
     )
 
+try:  # pragma: no cover - Import-Pfad haengt von pythonpath ab
+    from utils import fast_json
+except ImportError:  # pragma: no cover
+    from src.utils import fast_json  # type: ignore[no-redef]
+
 logger = logging.getLogger('shadowops.project_monitor')
 
+# Persistenter Monitor-State (Dashboard-IDs, Check-Zaehler). Modul-Konstante,
+# damit Tests den Pfad nach tmp_path umbiegen koennen.
+DEFAULT_STATE_FILE = 'data/project_monitor_state.json'
+
+# Debounce fuer _save_state: Checks markieren den State nur als dirty, ein
+# Hintergrund-Task schreibt hoechstens einmal pro Intervall (Sekunden).
+STATE_SAVE_INTERVAL_SECONDS = 30
+
+# Dashboard-Edits werden uebersprungen solange sich der Projekt-State nicht
+# aendert — spaetestens nach dieser Zeit wird trotzdem neu gerendert, damit
+# serverseitig berechnete Angaben ("Downtime: Xm") nicht veralten.
+# "Letzter Check" ist eine Discord-Relativzeit und braucht keinen Edit.
+DASHBOARD_MAX_SKIP_SECONDS = 30 * 60
+
+# Mindestabstand zwischen zwei Dashboard-Updates. Statuswechsel innerhalb
+# dieses Fensters (z.B. mehrere Projekte auf einem ausgefallenen Host) werden
+# zu einem Edit gebuendelt — Throttle, kein Debounce: spaetestens nach diesem
+# Abstand wird editiert, auch wenn weiter Wechsel eintreffen.
+DASHBOARD_MIN_EDIT_INTERVAL_SECONDS = 10
+
+# Max. gleichzeitige ausgehende Health-Checks pro Host (project.host)
+HOST_CONCURRENCY_LIMIT = 4
+
+# Incident-/Recovery-Embeds: Humanizer-Texte, Farben und Handlungs-Zeile sind
+# statisch — einmal beim Import berechnen statt pro Alert.
+_INCIDENT_INFO = humanize_transition("ok", "unreachable")
+_RECOVERY_INFO = humanize_transition("unreachable", "ok")
+_INCIDENT_COLOR = STATUS_COLOR.get("unreachable", discord.Color.red().value)
+_RECOVERY_COLOR = STATUS_COLOR.get("ok", discord.Color.green().value)
+
+# Dashboard-Embeds: statische Titel/Footer/Farben und Latenz-Labels einmal
+# beim Import statt bei jedem Render.
+_DASHBOARD_TITLE = "📊 ShadowOps — Projekt-Dashboard"
+_DASHBOARD_FOOTER = "Aktualisiert bei Statuswechsel, sonst alle 5 Minuten"
+_EXT_DASHBOARD_FOOTER = f"ShadowOps Monitoring • {_DASHBOARD_FOOTER}"
+_DASHBOARD_OK_COLOR = discord.Color.green()
+_DASHBOARD_WARN_COLOR = discord.Color.orange()
+_DASHBOARD_DOWN_COLOR = discord.Color.red()
+_LATENCY_LABELS = (('db_ms', 'DB'), ('redis_ms', 'Redis'), ('osrm_ms', 'OSRM'))
+
+
+def _build_incident_action_text() -> Optional[str]:
+    """Dringlichkeit + optionales Runbook fuer Down-Alerts (statisch)."""
+    action_lines: list[str] = []
+    u_line = urgency_line(_INCIDENT_INFO.urgency)
+    if u_line:
+        action_lines.append(u_line)
+    runbook = runbook_for("web-prod", [])
+    if runbook is not None:
+        action_lines.append(f"→ Runbook: {runbook}")
+    return "\n".join(action_lines)[:1024] if action_lines else None
+
+
+_INCIDENT_ACTION_TEXT = _build_incident_action_text()
+
 
 # Default-Schwellen fuer die Enterprise-Health-Checks (Phase 5b).
 # Pro Projekt ueberschreibbar via projects.<name>.monitor.thresholds.* in config.yaml.
@@ -112,13 +174,30 @@ class ProjectStatus:
     def __init__(self, name: str, config: Dict):
         self.name = name
         self.url = config.get('url', '')
+        # URL einmalig parsen: kein Parse pro Check, Host fuer Per-Host-Limits
+        self.parsed_url = urlsplit(self.url.strip()) if self.url else None
+        self.host: Optional[str] = (self.parsed_url.netloc or None) if self.parsed_url else None
         self.expected_status = config.get('expected_status', 200)
         self.check_interval = config.get('check_interval', 60)
         self.timeout = config.get('timeout', 10)
         self.remediation_command = config.get('remediation_command')
         self.remediation_threshold = config.get('remediation_threshold', 3)
+        # Hartes Zeitbudget fuer remediation_command (Sekunden)
+        self.remediation_timeout = config.get('remediation_timeout', 60)
         self.log_file = config.get('log_file')
         self.log_pattern = config.get('log_pattern')
+        # Mehrere Substring-Patterns (log_patterns), Fallback auf log_pattern.
+        # Alle werden zu EINER bytes-Regex kompiliert: ein Pass ueber den Tail,
+        # kein Decode, unabhaengig von der Pattern-Anzahl.
+        self.log_patterns: List[str] = [
+            p for p in (config.get('log_patterns') or [self.log_pattern]) if p
+        ]
+        self.log_regex: Optional[re.Pattern] = re.compile(
+            b"|".join(re.escape(p.encode()) for p in self.log_patterns)
+        ) if self.log_patterns else None
+        # Log-Scan nur wenn Datei UND Pattern konfiguriert — der Poll-Loop
+        # plant _check_project_logs sonst gar nicht erst ein
+        self.has_log_scan = bool(self.log_file and self.log_regex)
         self.log_tail_bytes = config.get('log_tail_bytes', 50000)
 
         # Systemd-basiertes Health-Checking (für Services ohne HTTP-Endpoint)
@@ -147,10 +226,28 @@ class ProjectStatus:
         self.response_times: List[float] = []  # Last 100 response times
         self.max_response_times = 100
         self.last_log_pos: int = 0
+        self.last_log_inode: Optional[int] = None  # Rotation-Erkennung
 
         # Erweiterte Health-Daten (Latenz, Memory, Version)
         self.health_details: dict = {}
 
+        # Statische Embed-Skelette (Titel/Beschreibung/Farbe) — pro Alert werden
+        # nur Timestamp und dynamische Felder ergaenzt
+        self.incident_embed_template = {
+            'title': f"{_INCIDENT_INFO.emoji} {name} {_INCIDENT_INFO.headline}",
+            'description': f"**{name}** ({self.url}) antwortet nicht mehr auf den Health-Check.",
+            'color': _INCIDENT_COLOR,
+        }
+        self.recovery_embed_template = {
+            'title': f"{_RECOVERY_INFO.emoji} {name} wieder online",
+            'description': f"**{name}** ({self.url}) ist {_RECOVERY_INFO.headline}.",
+            'color': _RECOVERY_COLOR,
+        }
+
+        # Externe Kunden-Channels: (channel_id, notify_offline, notify_online),
+        # normalisiert von ProjectMonitor._load_projects (nur enabled Eintraege)
+        self.external_targets: List[tuple] = []
+
         # Incident tracking
         self.consecutive_failures = 0
         self.last_error: Optional[str] = None
@@ -176,14 +273,21 @@ class ProjectStatus:
             return None
         return datetime.now(timezone.utc) - self.current_downtime_start
 
-    def update_online(self, response_time_ms: float):
-        """Update status when health check succeeds"""
+    def update_online(self, response_time_ms: float, now: Optional[datetime] = None):
+        """Update status when health check succeeds
+
+        Args:
+            response_time_ms: Gemessene Antwortzeit
+            now: Zeitpunkt des Check-Ticks (UTC); Default: jetzt
+        """
         # Consider this a "recovery" only if we had consecutive failures
         was_recovering = self.consecutive_failures > 0
 
+        if now is None:
+            now = datetime.now(timezone.utc)
         self.is_online = True
-        self.last_check_time = datetime.now(timezone.utc)
-        self.last_online_time = datetime.now(timezone.utc)
+        self.last_check_time = now
+        self.last_online_time = now
         self.total_checks += 1
         self.successful_checks += 1
         self.consecutive_failures = 0
@@ -197,13 +301,20 @@ class ProjectStatus:
 
         return was_recovering  # True if coming back from failures
 
-    def update_offline(self, error: str):
-        """Update status when health check fails"""
+    def update_offline(self, error: str, now: Optional[datetime] = None):
+        """Update status when health check fails
+
+        Args:
+            error: Fehlerbeschreibung
+            now: Zeitpunkt des Check-Ticks (UTC); Default: jetzt
+        """
         was_online = self.is_online
 
+        if now is None:
+            now = datetime.now(timezone.utc)
         self.is_online = False
-        self.last_check_time = datetime.now(timezone.utc)
-        self.last_offline_time = datetime.now(timezone.utc)
+        self.last_check_time = now
+        self.last_offline_time = now
         self.total_checks += 1
         self.failed_checks += 1
         self.consecutive_failures += 1
@@ -211,7 +322,7 @@ class ProjectStatus:
 
         # Start downtime tracking
         if was_online:
-            self.current_downtime_start = datetime.now(timezone.utc)
+            self.current_downtime_start = now
 
         return was_online  # Return True if this is a new incident
 
@@ -260,11 +371,20 @@ class ProjectMonitor:
 
         # Project configurations
         self.projects: Dict[str, ProjectStatus] = {}
+        # Volle Projekt-Config (projects.<name>) pro ueberwachtem Projekt — O(1)-Lookup
+        self._project_configs: Dict[str, Dict] = {}
+        # Nach Name sortierte Projekte (Dashboard-Reihenfolge), gepflegt von _load_projects
+        self._sorted_projects: List[ProjectStatus] = []
         self._load_projects()
 
         # Discord channels
         self.customer_status_channel_id = self.config.customer_status_channel
         self.customer_alerts_channel_id = self.config.customer_alerts_channel
+        # Aufgeloeste Channel-Handles (invalidiert bei discord.NotFound)
+        self._channel_cache: Dict[int, discord.abc.Messageable] = {}
+
+        # Per-Host-Semaphoren fuer ausgehende HTTP-Health-Checks
+        self._host_sems: Dict[Optional[str], asyncio.Semaphore] = {}
 
         # Monitoring tasks
         self.monitor_tasks: Dict[str, asyncio.Task] = {}
@@ -273,14 +393,29 @@ class ProjectMonitor:
 
         # Dashboard update interval (seconds)
         self.dashboard_update_interval = 300  # 5 minutes
+        # Fingerprint des zuletzt gerenderten Dashboards (No-Op-Edits vermeiden)
+        self._last_dashboard_fingerprint: Optional[int] = None
+        self._last_dashboard_render = 0.0
+        # Serialisiert Dashboard-Rebuilds; laeuft schon einer, wird uebersprungen
+        self._dashboard_lock = asyncio.Lock()
+        # Wird bei Online/Offline-Wechsel gesetzt und weckt den Dashboard-Loop
+        # sofort; dashboard_update_interval ist nur noch der Keepalive
+        self._dashboard_dirty = asyncio.Event()
+        self._last_dashboard_update = 0.0
 
         # Persistence
-        self.state_file = Path('data/project_monitor_state.json')
+        self.state_file = Path(DEFAULT_STATE_FILE)
         self.load_state_enabled = True
         if isinstance(self.config, dict):
             # Unit tests supply dict configs; default to skipping persisted state
             self.load_state_enabled = self.config.get('load_state', False)
-            self.state_file = Path(self.config.get('state_file', 'data/project_monitor_state.json'))
+            self.state_file = Path(self.config.get('state_file', DEFAULT_STATE_FILE))
+        # Debounced Save: Health-Checks setzen nur _state_dirty, der
+        # State-Flush-Task schreibt gebuendelt im Thread (blockiert den Loop nicht).
+        self._state_dirty = False
+        self._last_state_save = 0.0
+        self.state_save_interval = STATE_SAVE_INTERVAL_SECONDS
+        self.state_save_task: Optional[asyncio.Task] = None
 
         self.state_file.parent.mkdir(exist_ok=True)
         if self.load_state_enabled:
@@ -332,9 +467,70 @@ class ProjectMonitor:
             if not monitor_config.get('enabled', False):
                 continue
 
-            self.projects[project_name] = ProjectStatus(project_name, monitor_config)
+            project = ProjectStatus(project_name, monitor_config)
+            if project.parsed_url and not (project.parsed_url.scheme and project.parsed_url.netloc):
+                self.logger.warning(
+                    f"⚠️ Ungueltige Health-URL fuer {project_name}: {project.url!r} "
+                    f"(Schema/Host fehlt)"
+                )
+            self.projects[project_name] = project
+            self._project_configs[project_name] = project_config
+            project.external_targets = self._build_external_targets(
+                project_name, project_config.get('external_notifications', [])
+            )
             self.logger.info(f"✅ Loaded monitoring for project: {project_name}")
 
+        self._sorted_projects = sorted(self.projects.values(), key=lambda p: p.name)
+
+    def _build_external_targets(self, project_name: str, external_notifs: List[Dict]) -> List[tuple]:
+        """Normalisiert external_notifications einmalig beim Laden.
+
+        Returns:
+            Liste von (channel_id: int, notify_offline: bool, notify_online: bool),
+            deaktivierte und ungueltige Eintraege sind bereits entfernt.
+        """
+        targets = []
+        for notif_config in external_notifs or []:
+            if not notif_config.get('enabled', False):
+                continue
+            channel_id = notif_config.get('channel_id')
+            if not channel_id:
+                continue
+            try:
+                channel_id = int(channel_id)
+            except (TypeError, ValueError):
+                self.logger.warning(
+                    f"⚠️ Ungueltige external channel_id {channel_id!r} fuer {project_name}"
+                )
+                continue
+            notify_on = notif_config.get('notify_on', {})
+            targets.append((
+                channel_id,
+                notify_on.get('offline', True),
+                notify_on.get('online', True),
+            ))
+        return targets
+
+    def _channel(self, channel_id: int):
+        """Channel-Handle aus dem Cache, sonst via bot.get_channel aufloesen."""
+        channel = self._channel_cache.get(channel_id)
+        if channel is None:
+            channel = self.bot.get_channel(channel_id)
+            if channel is not None:
+                self._channel_cache[channel_id] = channel
+        return channel
+
+    def _host_semaphore(self, host: Optional[str]) -> asyncio.Semaphore:
+        """Semaphore fuer einen Host (begrenzt parallele Checks pro Origin)."""
+        sem = self._host_sems.get(host)
+        if sem is None:
+            sem = self._host_sems[host] = asyncio.Semaphore(HOST_CONCURRENCY_LIMIT)
+        return sem
+
+    def _invalidate_channel(self, channel_id: int) -> None:
+        """Verwirft ein gecachtes Channel-Handle (z.B. Channel geloescht)."""
+        self._channel_cache.pop(channel_id, None)
+
     def _get_config_section(self, name: str, default=None):
         """Safely fetch config sections from dicts or Config objects."""
         if default is None:
@@ -355,8 +551,8 @@ class ProjectMonitor:
             return
 
         try:
-            with open(self.state_file, 'r') as f:
-                state = json.load(f)
+            with open(self.state_file, 'rb') as f:
+                state = fast_json.loads(f.read())
 
             # Load dashboard message IDs
             self.dashboard_message_id = state.get('dashboard_message_id')
@@ -385,32 +581,75 @@ class ProjectMonitor:
         except Exception as e:
             self.logger.error(f"❌ Error loading state: {e}", exc_info=True)
 
-    def _save_state(self):
-        """Persist monitoring state"""
-        try:
-            # Build state structure
-            state = {
-                'dashboard_message_id': self.dashboard_message_id,
-                'ext_dashboard_ids': getattr(self, '_ext_dashboard_ids', {}),
-                'ext_alert_ids': getattr(self, '_ext_alert_ids', {}),
-                'projects': {}
+    def _build_state(self) -> Dict[str, Any]:
+        """Snapshot des persistierbaren States (laeuft im Event-Loop-Thread)."""
+        state = {
+            'dashboard_message_id': self.dashboard_message_id,
+            'ext_dashboard_ids': dict(getattr(self, '_ext_dashboard_ids', {})),
+            'ext_alert_ids': dict(getattr(self, '_ext_alert_ids', {})),
+            'projects': {}
+        }
+
+        for project_name, project in self.projects.items():
+            state['projects'][project_name] = {
+                'total_checks': project.total_checks,
+                'successful_checks': project.successful_checks,
+                'failed_checks': project.failed_checks,
+                'is_online': project.is_online
             }
+        return state
+
+    def _write_state_file(self, state: Dict[str, Any]) -> None:
+        """Schreibt den State atomar (tmp-Datei + os.replace) — thread-safe aufrufbar."""
+        tmp_file = self.state_file.with_suffix('.tmp')
+        data = fast_json.dumps(state, indent=True)
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, self.state_file)
 
-            # Save project states
-            for project_name, project in self.projects.items():
-                state['projects'][project_name] = {
-                    'total_checks': project.total_checks,
-                    'successful_checks': project.successful_checks,
-                    'failed_checks': project.failed_checks,
-                    'is_online': project.is_online
-                }
+    def _save_state(self):
+        """Persist monitoring state (synchron, z.B. beim Shutdown)"""
+        try:
+            self._write_state_file(self._build_state())
+            self._state_dirty = False
+            self._last_state_save = time.monotonic()
+        except Exception as e:
+            self.logger.error(f"❌ Error saving state: {e}", exc_info=True)
 
-            with open(self.state_file, 'w') as f:
-                json.dump(state, f, indent=2)
+    async def _save_state_async(self):
+        """Persist monitoring state ohne den Event-Loop zu blockieren.
 
+        Der Snapshot entsteht im Loop-Thread, nur das Datei-I/O laeuft via
+        asyncio.to_thread.
+        """
+        state = self._build_state()
+        self._state_dirty = False
+        try:
+            await asyncio.to_thread(self._write_state_file, state)
+            self._last_state_save = time.monotonic()
         except Exception as e:
+            self._state_dirty = True  # naechster Flush versucht es erneut
             self.logger.error(f"❌ Error saving state: {e}", exc_info=True)
 
+    async def _flush_state_if_dirty(self):
+        """Schreibt den State, wenn er dirty ist und das Debounce-Intervall um ist."""
+        if not self._state_dirty:
+            return
+        if time.monotonic() - self._last_state_save < self.state_save_interval:
+            return
+        await self._save_state_async()
+
+    async def _state_flush_loop(self):
+        """Periodischer Debounce-Flush fuer _save_state (max. 1 Write pro Intervall)."""
+        while True:
+            try:
+                await asyncio.sleep(self.state_save_interval)
+                await self._flush_state_if_dirty()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.error(f"❌ Error in state flush loop: {e}", exc_info=True)
+
     async def start_monitoring(self):
         """Start monitoring all configured projects"""
         for project_name, project in self.projects.items():
@@ -421,6 +660,9 @@ class ProjectMonitor:
         # Start dashboard updater
         self.dashboard_task = asyncio.create_task(self._update_dashboard_loop())
 
+        # Start debounced state persistence
+        self.state_save_task = asyncio.create_task(self._state_flush_loop())
+
         self.logger.info(f"✅ Monitoring started for {len(self.projects)} projects")
 
     async def stop_monitoring(self):
@@ -442,6 +684,14 @@ class ProjectMonitor:
             except asyncio.CancelledError:
                 pass
 
+        # Stop state flusher
+        if self.state_save_task:
+            self.state_save_task.cancel()
+            try:
+                await self.state_save_task
+            except asyncio.CancelledError:
+                pass
+
         # Save final state
         self._save_state()
 
@@ -459,8 +709,9 @@ class ProjectMonitor:
 
         while True:
             try:
-                await self._check_project_logs(project)
-                await self._check_project_health(project)
+                if project.has_log_scan:
+                    await self._check_project_logs(project)
+                await self._check_health_and_mark_dashboard(project)
 
                 # Health-Check-Erweiterung (Phase 5b + 5c, Issue #278).
                 # Jede Methode hat ihren eigenen Min-Intervall-Filter — die werden
@@ -502,17 +753,16 @@ class ProjectMonitor:
 
     def _resolve_check_url(self, project_name: str, target: str) -> str:
         """Relativen Check-Pfad an die Projekt-Basis-URL haengen; absolute URL
-        (http(s)://...) unveraendert lassen. Robuste Origin-Extraktion via
-        urlparse (schneidet bestehende Pfade der Basis-URL sauber ab)."""
+        (http(s)://...) unveraendert lassen. Origin kommt aus der vorgeparsten
+        project.parsed_url (bestehende Pfade der Basis-URL werden abgeschnitten)."""
         if target.startswith(("http://", "https://")):
             return target
-        from urllib.parse import urlparse
-        base = (self.projects[project_name].url or "").strip()
-        parsed = urlparse(base)
-        if parsed.scheme and parsed.netloc:
+        project = self.projects[project_name]
+        parsed = project.parsed_url
+        if parsed and parsed.scheme and parsed.netloc:
             origin = f"{parsed.scheme}://{parsed.netloc}"
         else:
-            origin = base.rstrip("/")
+            origin = (project.url or "").strip().rstrip("/")
         if not target.startswith("/"):
             target = "/" + target
         return origin.rstrip("/") + target
@@ -653,32 +903,36 @@ class ProjectMonitor:
         Args:
             project: ProjectStatus instance to check
         """
+        # Ein Wall-Clock-Zeitpunkt pro Tick fuer alle Status-Updates
+        # (Dauer-Messung separat via perf_counter)
+        now = datetime.now(timezone.utc)
+
         # TCP-Port-basiertes Health-Checking (für DB-Ports etc.)
         if project.tcp_ports:
-            await self._check_tcp_ports(project)
+            await self._check_tcp_ports(project, now)
             # Wenn AUCH eine URL vorhanden ist → HTTP-Health-Check zusätzlich machen
             # (liefert erweiterte Daten: Latenz, Memory, Version)
-            if not project.url:
+            if not project.parsed_url:
                 return
 
         # Systemd-basiertes Health-Checking (für Services ohne HTTP-Endpoint)
         if project.systemd_services:
-            await self._check_systemd_health(project)
+            await self._check_systemd_health(project, now)
             return
 
-        if not project.url:
+        if not project.parsed_url:
             self.logger.debug(f"ℹ️ No health check URL for {project.name}")
             return
 
-        start_time = time.time()
-
         try:
-            async with aiohttp.ClientSession() as session:
+            # Per-Host-Limit: viele Projekte hinter einem Origin fluten ihn nicht
+            async with self._host_semaphore(project.host), aiohttp.ClientSession() as session:
+                start_time = time.perf_counter()  # erst nach Semaphore-Wartezeit messen
                 async with session.get(
                     project.url,
                     timeout=aiohttp.ClientTimeout(total=project.timeout)
                 ) as response:
-                    response_time_ms = (time.time() - start_time) * 1000
+                    response_time_ms = (time.perf_counter() - start_time) * 1000
 
                     if response.status == project.expected_status:
                         # Parse health details wenn verfügbar
@@ -689,7 +943,7 @@ class ProjectMonitor:
                             project.health_details = {}
 
                         # Health check succeeded
-                        was_recovering = project.update_online(response_time_ms)
+                        was_recovering = project.update_online(response_time_ms, now)
 
                         self.logger.info(
                             f"✅ {project.name} healthy "
@@ -703,7 +957,7 @@ class ProjectMonitor:
                     else:
                         # Unexpected status code
                         error = f"Status {response.status} (expected {project.expected_status})"
-                        was_new_incident = project.update_offline(error)
+                        was_new_incident = project.update_offline(error, now)
 
                         self.logger.warning(f"⚠️ {project.name}: {error}")
 
@@ -714,7 +968,7 @@ class ProjectMonitor:
 
         except asyncio.TimeoutError:
             error = f"Timeout after {project.timeout}s"
-            was_new_incident = project.update_offline(error)
+            was_new_incident = project.update_offline(error, now)
 
             self.logger.warning(f"⚠️ {project.name}: {error}")
 
@@ -724,7 +978,7 @@ class ProjectMonitor:
 
         except aiohttp.ClientError as e:
             error = f"Connection error: {str(e)}"
-            was_new_incident = project.update_offline(error)
+            was_new_incident = project.update_offline(error, now)
 
             self.logger.warning(f"⚠️ {project.name}: {error}")
 
@@ -734,7 +988,7 @@ class ProjectMonitor:
 
         except Exception as e:
             error = f"Unexpected error: {str(e)}"
-            was_new_incident = project.update_offline(error)
+            was_new_incident = project.update_offline(error, now)
 
             self.logger.error(f"❌ {project.name}: {error}", exc_info=True)
 
@@ -742,37 +996,67 @@ class ProjectMonitor:
                 await self._send_incident_alert(project, error)
             await self._attempt_remediation(project, error)
 
-        # Save state periodically
-        self._save_state()
+        # State nur als dirty markieren — der State-Flush-Task schreibt debounced
+        self._state_dirty = True
+
+    @staticmethod
+    def _read_log_tail(path: Path, start_pos: int, last_inode: Optional[int],
+                       max_bytes: int) -> Optional[tuple]:
+        """Blockierendes stat+read des Log-Tails (laeuft via asyncio.to_thread).
+
+        Liest inkrementell ab start_pos; bei Rotation (neue Inode) oder
+        Truncation von vorne, Catch-up auf max_bytes begrenzt.
+
+        Returns:
+            (data, size, inode) oder None wenn die Datei nicht existiert.
+        """
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        size = st.st_size
+        if st.st_ino != last_inode or start_pos > size:
+            start_pos = 0
+        if size - start_pos > max_bytes:
+            start_pos = size - max_bytes
+        if start_pos >= size:
+            return b'', size, st.st_ino  # nichts Neues seit dem letzten Scan
+
+        with path.open('rb') as f:
+            f.seek(start_pos)
+            data = f.read(size - start_pos)
+        return data, size, st.st_ino
 
     async def _check_project_logs(self, project: ProjectStatus):
         """Scan recent log tail for critical patterns (e.g., DB connectivity errors)."""
-        if not project.log_file or not project.log_pattern:
+        if not project.log_file or not project.log_regex:
             return
 
         log_path = Path(project.log_file)
-        if not log_path.exists():
-            self.logger.debug(f"ℹ️ Log file not found for {project.name}: {log_path}")
-            return
-
         try:
-            size = log_path.stat().st_size
-            # Seek to last position or tail window
-            start_pos = max(0, size - project.log_tail_bytes)
-            with log_path.open('rb') as f:
-                f.seek(start_pos)
-                data = f.read().decode(errors='ignore')
-
-            if project.log_pattern in data:
+            # Datei-I/O im Thread — ein langsames Disk blockiert nicht den Event-Loop
+            result = await asyncio.to_thread(
+                self._read_log_tail, log_path, project.last_log_pos,
+                project.last_log_inode, project.log_tail_bytes,
+            )
+            if result is None:
+                self.logger.debug(f"ℹ️ Log file not found for {project.name}: {log_path}")
+                return
+            data, project.last_log_pos, project.last_log_inode = result
+
+            # Suche auf bytes-Ebene: kein Decode des ganzen Tails im No-Match-Fall
+            match = project.log_regex.search(data) if data else None
+            if match:
+                pattern = match.group(0).decode(errors='replace')
                 # Only notify once per remediation window
                 self.logger.warning(
-                    f"⚠️ {project.name}: Detected log pattern '{project.log_pattern}' "
+                    f"⚠️ {project.name}: Detected log pattern '{pattern}' "
                     f"in {log_path}"
                 )
                 if project.remediation_command and not project.remediation_triggered:
                     await self._attempt_remediation(
                         project,
-                        f"Log pattern detected: {project.log_pattern}"
+                        f"Log pattern detected: {pattern}"
                     )
         except Exception as e:
             self.logger.error(
@@ -780,12 +1064,15 @@ class ProjectMonitor:
                 exc_info=True
             )
 
-    async def _check_systemd_health(self, project: ProjectStatus):
+    async def _check_systemd_health(self, project: ProjectStatus,
+                                    now: Optional[datetime] = None):
         """
         Check health via systemd service status.
         All configured services must be active for the project to be online.
         """
-        start_time = time.time()
+        if now is None:
+            now = datetime.now(timezone.utc)
+        start_time = time.perf_counter()
         failed_services = []
 
         for svc_config in project.systemd_services:
@@ -819,10 +1106,10 @@ class ProjectMonitor:
             except Exception as e:
                 failed_services.append(f"{svc_name}: {e}")
 
-        response_time_ms = (time.time() - start_time) * 1000
+        response_time_ms = (time.perf_counter() - start_time) * 1000
 
         if not failed_services:
-            was_recovering = project.update_online(response_time_ms)
+            was_recovering = project.update_online(response_time_ms, now)
             svc_count = len(project.systemd_services)
             self.logger.info(
                 f"✅ {project.name} healthy ({svc_count} services active, {response_time_ms:.0f}ms)"
@@ -831,20 +1118,23 @@ class ProjectMonitor:
                 await self._send_recovery_alert(project)
         else:
             error = f"Services down: {', '.join(failed_services)}"
-            was_new_incident = project.update_offline(error)
+            was_new_incident = project.update_offline(error, now)
             self.logger.warning(f"⚠️ {project.name}: {error}")
             if was_new_incident:
                 await self._send_incident_alert(project, error)
             await self._attempt_remediation(project, error)
 
-        self._save_state()
+        self._state_dirty = True
 
-    async def _check_tcp_ports(self, project: ProjectStatus):
+    async def _check_tcp_ports(self, project: ProjectStatus,
+                               now: Optional[datetime] = None):
         """
         Check health via TCP port connectivity.
         All configured ports must be reachable for the project to be online.
         """
-        start_time = time.time()
+        if now is None:
+            now = datetime.now(timezone.utc)
+        start_time = time.perf_counter()
         failed_ports = []
 
         for port_config in project.tcp_ports:
@@ -865,10 +1155,10 @@ class ProjectMonitor:
             except (OSError, asyncio.TimeoutError) as e:
                 failed_ports.append(f'{label} ({e.__class__.__name__})')
 
-        response_time_ms = (time.time() - start_time) * 1000
+        response_time_ms = (time.perf_counter() - start_time) * 1000
 
         if not failed_ports:
-            was_recovering = project.update_online(response_time_ms)
+            was_recovering = project.update_online(response_time_ms, now)
             port_labels = ', '.join(
                 str(p) if isinstance(p, int) else p.get('label', f":{p.get('port')}")
                 for p in project.tcp_ports
@@ -880,13 +1170,13 @@ class ProjectMonitor:
                 await self._send_recovery_alert(project)
         else:
             error = f'TCP ports unreachable: {", ".join(failed_ports)}'
-            was_new_incident = project.update_offline(error)
+            was_new_incident = project.update_offline(error, now)
             self.logger.warning(f'⚠️ {project.name}: {error}')
             if was_new_incident:
                 await self._send_incident_alert(project, error)
             await self._attempt_remediation(project, error)
 
-        self._save_state()
+        self._state_dirty = True
 
     async def _attempt_remediation(self, project: ProjectStatus, error: str):
         """Attempt automatic remediation after repeated failures."""
@@ -909,8 +1199,25 @@ class ProjectMonitor:
                 project.remediation_command,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
+                start_new_session=True,  # eigene Prozessgruppe → Timeout killt alle Kinder
             )
-            stdout, stderr = await proc.communicate()
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    proc.communicate(), timeout=project.remediation_timeout
+                )
+            except asyncio.TimeoutError:
+                # Haengendes Kommando samt Kindern killen und reapen (kein Zombie,
+                # kein Puffer-Wachstum). Nur proc.kill() traefe bloss die Shell.
+                try:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                await proc.wait()
+                self.logger.error(
+                    f"❌ Remediation command for {project.name} timed out after "
+                    f"{project.remediation_timeout}s — killed"
+                )
+                return
             if stdout:
                 self.logger.info(f"🛠️  Remediation stdout for {project.name}: {stdout.decode().strip()}")
             if stderr:
@@ -949,7 +1256,7 @@ class ProjectMonitor:
 
         # Send alert to internal channel (fallback if IncidentManager failed)
         if not self.incident_manager:
-            channel = self.bot.get_channel(self.customer_alerts_channel_id)
+            channel = self._channel(self.customer_alerts_channel_id)
             if channel:
                 embed = self._create_incident_embed(project, error)
                 await channel.send(embed=embed)
@@ -990,7 +1297,7 @@ class ProjectMonitor:
                 )
 
         # Send recovery alert to channel
-        channel = self.bot.get_channel(self.customer_alerts_channel_id)
+        channel = self._channel(self.customer_alerts_channel_id)
         if channel:
             embed = self._create_recovery_embed(project)
             await channel.send(embed=embed)
@@ -1007,13 +1314,11 @@ class ProjectMonitor:
 
         Down = Health-Check schlägt fehl → Dienst antwortet nicht. Wird als
         Übergang ok → unreachable modelliert ("nicht mehr erreichbar", CRITICAL).
+        Titel/Beschreibung/Farbe kommen aus project.incident_embed_template.
         """
-        info = humanize_transition("ok", "unreachable")
         embed = discord.Embed(
-            title=f"{info.emoji} {project.name} {info.headline}",
-            description=f"**{project.name}** ({project.url}) antwortet nicht mehr auf den Health-Check.",
-            color=STATUS_COLOR.get("unreachable", discord.Color.red().value),
             timestamp=datetime.now(timezone.utc),
+            **project.incident_embed_template,
         )
 
         # Wiederholte Fehlschläge in Klartext statt roher Zahl
@@ -1036,36 +1341,25 @@ class ProjectMonitor:
         )
 
         # Dringlichkeit + optionales Runbook
-        action_lines: list[str] = []
-        u_line = urgency_line(info.urgency)
-        if u_line:
-            action_lines.append(u_line)
-        runbook = runbook_for("web-prod", [])
-        if runbook is not None:
-            action_lines.append(f"→ Runbook: {runbook}")
-        if action_lines:
-            embed.add_field(name="​", value="\n".join(action_lines)[:1024], inline=False)
+        if _INCIDENT_ACTION_TEXT:
+            embed.add_field(name="​", value=_INCIDENT_ACTION_TEXT, inline=False)
 
         return embed
 
     def _create_recovery_embed(self, project: ProjectStatus) -> discord.Embed:
         """Recovery-Embed (Dienst wieder erreichbar) — Klartext + Downtime."""
-        info = humanize_transition("unreachable", "ok")
+        template = project.recovery_embed_template
 
         # Downtime in Klartext (last_offline_time ist bei Recovery noch gesetzt)
-        downtime_str = None
+        desc = template['description']
         if project.last_offline_time:
             secs = (datetime.now(timezone.utc) - project.last_offline_time).total_seconds()
-            downtime_str = format_downtime(secs)
-
-        desc = f"**{project.name}** ({project.url}) ist {info.headline}."
-        if downtime_str:
-            desc += f" Ausfall-Dauer: **{downtime_str}**."
+            desc += f" Ausfall-Dauer: **{format_downtime(secs)}**."
 
         embed = discord.Embed(
-            title=f"{info.emoji} {project.name} wieder online",
+            title=template['title'],
             description=desc,
-            color=STATUS_COLOR.get("ok", discord.Color.green().value),
+            color=template['color'],
             timestamp=datetime.now(timezone.utc),
         )
 
@@ -1086,77 +1380,66 @@ class ProjectMonitor:
         """
         Send notifications to external servers (customer guilds)
 
+        Alle Ziel-Channels werden parallel bedient (asyncio.gather) — die
+        Alert-Latenz ist die der langsamsten Discord-Antwort statt der Summe.
+
         Args:
             project: ProjectStatus instance
             event_type: "online", "offline", or "error"
             error: Error message (if applicable)
         """
-        # Get project config
-        project_config = None
-        for proj_name, proj_cfg in self.config.projects.items():
-            if proj_name == project.name:
-                project_config = proj_cfg
-                break
-
-        if not project_config:
-            return
-
-        # Get external notifications config
-        external_notifs = project_config.get('external_notifications', [])
-        if not external_notifs:
+        channel_ids = [
+            channel_id
+            for channel_id, notify_offline, notify_online in project.external_targets
+            if (event_type == "offline" and notify_offline)
+            or (event_type == "online" and notify_online)
+        ]
+        if not channel_ids:
             return
 
-        for notif_config in external_notifs:
-            if not notif_config.get('enabled', False):
-                continue
+        # Embed einmal pro Event bauen, an alle Channels senden
+        if event_type == "offline":
+            embed = self._create_incident_embed(project, error or "Unknown error")
+        else:
+            embed = self._create_recovery_embed(project)
 
-            # Check if this event type should be notified
-            notify_on = notif_config.get('notify_on', {})
-            if event_type == "offline" and not notify_on.get('offline', True):
-                continue
-            if event_type == "online" and not notify_on.get('online', True):
-                continue
+        if not hasattr(self, '_ext_alert_ids'):
+            self._ext_alert_ids = {}
 
-            # Get channel
-            channel_id = notif_config.get('channel_id')
-            if not channel_id:
-                continue
-
-            try:
-                channel = self.bot.get_channel(int(channel_id))
-                if not channel:
-                    self.logger.warning(f"⚠️ External channel {channel_id} not found for {project.name}")
-                    continue
+        await asyncio.gather(*(
+            self._send_external_notification(project, event_type, channel_id, embed)
+            for channel_id in channel_ids
+        ))
 
-                # Create and send embed
-                if event_type == "offline":
-                    embed = self._create_incident_embed(project, error or "Unknown error")
-                elif event_type == "online":
-                    embed = self._create_recovery_embed(project)
-                else:
-                    continue
+    async def _send_external_notification(self, project: ProjectStatus, event_type: str,
+                                          channel_id: int, embed: discord.Embed):
+        """Sendet/editiert den Alert in einem externen Channel (Fehler werden geloggt)."""
+        try:
+            channel = self._channel(channel_id)
+            if not channel:
+                self.logger.warning(f"⚠️ External channel {channel_id} not found for {project.name}")
+                return
 
-                # Persistente Alert-Nachricht: Edit statt neu senden (Anti-Flooding)
-                alert_key = f"ext_alert_{project.name}_{channel_id}"
-                if not hasattr(self, '_ext_alert_ids'):
-                    self._ext_alert_ids = {}
-
-                existing_alert_id = self._ext_alert_ids.get(alert_key)
-                if existing_alert_id:
-                    try:
-                        msg = await channel.fetch_message(existing_alert_id)
-                        await msg.edit(embed=embed)
-                    except discord.NotFound:
-                        msg = await channel.send(embed=embed)
-                        self._ext_alert_ids[alert_key] = msg.id
-                else:
+            # Persistente Alert-Nachricht: Edit statt neu senden (Anti-Flooding)
+            alert_key = f"ext_alert_{project.name}_{channel_id}"
+            existing_alert_id = self._ext_alert_ids.get(alert_key)
+            if existing_alert_id:
+                try:
+                    msg = await channel.fetch_message(existing_alert_id)
+                    await msg.edit(embed=embed)
+                except discord.NotFound:
                     msg = await channel.send(embed=embed)
                     self._ext_alert_ids[alert_key] = msg.id
+            else:
+                msg = await channel.send(embed=embed)
+                self._ext_alert_ids[alert_key] = msg.id
 
-                self.logger.info(f"📤 Sent {event_type} notification for {project.name} to external server")
+            self.logger.info(f"📤 Sent {event_type} notification for {project.name} to external server")
 
-            except Exception as e:
-                self.logger.error(f"❌ Failed to send external notification for {project.name}: {e}")
+        except Exception as e:
+            if isinstance(e, discord.NotFound):
+                self._invalidate_channel(channel_id)
+            self.logger.error(f"❌ Failed to send external notification for {project.name}: {e}")
 
     async def _send_dm_alerts(self, project: ProjectStatus, event_type: str, error: str = None):
         """
@@ -1221,12 +1504,34 @@ class ProjectMonitor:
             except Exception as e:
                 self.logger.error(f"❌ DM Alert fehlgeschlagen für User {user_id}: {e}")
 
+    async def _check_health_and_mark_dashboard(self, project: ProjectStatus):
+        """Health-Check; bei Online/Offline-Wechsel wird das Dashboard geweckt."""
+        was_online = project.is_online
+        await self._check_project_health(project)
+        if project.is_online != was_online:
+            self._dashboard_dirty.set()
+
+    async def _wait_for_dashboard_change(self):
+        """Wartet auf einen Statuswechsel, hoechstens dashboard_update_interval."""
+        try:
+            await asyncio.wait_for(self._dashboard_dirty.wait(),
+                                   timeout=self.dashboard_update_interval)
+        except asyncio.TimeoutError:
+            pass
+
+        # Throttle: weitere Wechsel waehrend der Wartezeit landen im selben Edit
+        remaining = DASHBOARD_MIN_EDIT_INTERVAL_SECONDS - (time.monotonic() - self._last_dashboard_update)
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        self._dashboard_dirty.clear()
+
     async def _update_dashboard_loop(self):
-        """Periodically update the dashboard message"""
+        """Update the dashboard on status changes (keepalive: dashboard_update_interval)"""
         while True:
             try:
-                await self._update_dashboard()
-                await asyncio.sleep(self.dashboard_update_interval)
+                await self._update_dashboard_if_idle()
+                self._last_dashboard_update = time.monotonic()
+                await self._wait_for_dashboard_change()
 
             except asyncio.CancelledError:
                 break
@@ -1234,32 +1539,66 @@ class ProjectMonitor:
                 self.logger.error(f"❌ Error updating dashboard: {e}", exc_info=True)
                 await asyncio.sleep(self.dashboard_update_interval)
 
+    async def _update_dashboard_if_idle(self) -> bool:
+        """Dashboard-Update unter _dashboard_lock (drop-if-busy).
+
+        Haengt ein vorheriger Edit noch (langsame Discord-API), wird kein
+        zweiter, konkurrierender Edit in denselben Rate-Limit-Bucket gestellt.
+
+        Returns:
+            True wenn aktualisiert wurde, False wenn uebersprungen.
+        """
+        if self._dashboard_lock.locked():
+            self.logger.debug("📊 Dashboard-Update laeuft noch — Tick uebersprungen")
+            return False
+        async with self._dashboard_lock:
+            await self._update_dashboard()
+        return True
+
     async def _update_dashboard(self):
         """Update or create the dashboard message (main + external)"""
         # === Haupt-Dashboard (DEV Server, alle Projekte) ===
-        channel = self.bot.get_channel(self.customer_status_channel_id)
+        channel = self._channel(self.customer_status_channel_id)
         if not channel:
             return
 
+        # Nichts Relevantes geaendert → kein Edit (schont Discord-Rate-Limits)
+        fingerprint = self._dashboard_fingerprint()
+        if (fingerprint == self._last_dashboard_fingerprint
+                and time.monotonic() - self._last_dashboard_render < DASHBOARD_MAX_SKIP_SECONDS):
+            self.logger.debug("📊 Dashboard unveraendert — Edit uebersprungen")
+            return
+
         embed = self._create_dashboard_embed()
 
         try:
             if self.dashboard_message_id:
-                # Try to edit existing message
-                message = await channel.fetch_message(self.dashboard_message_id)
+                # Bestehende Nachricht direkt editieren — PartialMessage spart
+                # den GET pro Update; NotFound kommt dann aus edit()
+                message = channel.get_partial_message(self.dashboard_message_id)
                 await message.edit(embed=embed)
             else:
-                # Create new dashboard message
+                # Create new dashboard message — ID sofort sichern, sonst legt
+                # ein Restart vor dem naechsten State-Flush eine zweite an
                 message = await channel.send(embed=embed)
                 self.dashboard_message_id = message.id
+                await self._save_state_async()
 
+            self._mark_dashboard_rendered(fingerprint)
             self.logger.debug("📊 Dashboard updated")
 
         except discord.NotFound:
             # Message was deleted, create new one
-            message = await channel.send(embed=embed)
-            self.dashboard_message_id = message.id
-            self.logger.info("📊 Created new dashboard message")
+            try:
+                message = await channel.send(embed=embed)
+                self.dashboard_message_id = message.id
+                await self._save_state_async()
+                self._mark_dashboard_rendered(fingerprint)
+                self.logger.info("📊 Created new dashboard message")
+            except discord.NotFound:
+                # Channel selbst ist weg — Handle beim naechsten Tick neu aufloesen
+                self._invalidate_channel(self.customer_status_channel_id)
+                self.logger.error("❌ Dashboard channel not found")
 
         except Exception as e:
             self.logger.error(f"❌ Error updating dashboard: {e}", exc_info=True)
@@ -1267,6 +1606,24 @@ class ProjectMonitor:
         # === Externe Mini-Dashboards (pro Projekt auf deren Server) ===
         await self._update_external_dashboards()
 
+    def _dashboard_fingerprint(self) -> int:
+        """Hash ueber die im Dashboard sichtbaren Projekt-Werte."""
+        return hash(tuple(
+            (
+                p.name,
+                p.is_online,
+                round(p.uptime_percentage, 1),
+                int(p.average_response_time),
+                p.last_error if not p.is_online else None,
+            )
+            for p in self._sorted_projects
+        ))
+
+    def _mark_dashboard_rendered(self, fingerprint: int) -> None:
+        """Merkt sich den erfolgreich gerenderten Dashboard-Stand."""
+        self._last_dashboard_fingerprint = fingerprint
+        self._last_dashboard_render = time.monotonic()
+
     def _create_dashboard_embed(self) -> discord.Embed:
         """Create Discord embed for project dashboard with per-service details"""
         online_count = sum(1 for p in self.projects.values() if p.is_online)
@@ -1275,54 +1632,52 @@ class ProjectMonitor:
         status_line = f"{'✅' if online_count == total_count else '⚠️'} {online_count}/{total_count} Projekte online"
 
         embed = discord.Embed(
-            title="📊 ShadowOps — Projekt-Dashboard",
+            title=_DASHBOARD_TITLE,
             description=status_line,
-            color=discord.Color.green() if online_count == total_count else discord.Color.orange(),
+            color=_DASHBOARD_OK_COLOR if online_count == total_count else _DASHBOARD_WARN_COLOR,
             timestamp=datetime.now(timezone.utc)
         )
 
-        for project in sorted(self.projects.values(), key=lambda p: p.name):
+        for project in self._sorted_projects:
             status_emoji = "🟢" if project.is_online else "🔴"
-            tag = project.name
-
+            pcfg = self._project_configs.get(project.name, {})
             # Tag aus Config holen (falls vorhanden)
-            for pname, pcfg in self.config.projects.items():
-                if pname == project.name and pcfg.get('tag'):
-                    tag = pcfg['tag']
-                    break
+            tag = pcfg.get('tag') or project.name
 
-            # Hauptzeile
+            # Hauptzeile — Zeilen sammeln, am Ende einmal joinen
+            header = f"{status_emoji} {tag}"
             if project.is_online:
-                response = f"{project.average_response_time:.0f}ms"
-                header = f"{status_emoji} {tag}"
-                main_line = f"**Online**\nAntwortzeit: {response}\nUptime: {project.uptime_percentage:.1f}%"
+                lines = [
+                    "**Online**",
+                    f"Antwortzeit: {project.average_response_time:.0f}ms",
+                    f"Uptime: {project.uptime_percentage:.1f}%",
+                ]
             else:
-                header = f"{status_emoji} {tag}"
                 error_short = (project.last_error or "Unbekannt")[:80]
-                main_line = f"**Offline**\nFehler: {error_short}\nUptime: {project.uptime_percentage:.1f}%"
+                lines = [
+                    "**Offline**",
+                    f"Fehler: {error_short}",
+                    f"Uptime: {project.uptime_percentage:.1f}%",
+                ]
                 if project.current_downtime_duration:
                     mins = int(project.current_downtime_duration.total_seconds() / 60)
-                    main_line += f"\nDowntime: {mins}m"
+                    lines.append(f"Downtime: {mins}m")
 
             # TCP-Port Details (Services)
-            for pname, pcfg in self.config.projects.items():
-                if pname != project.name:
-                    continue
-                tcp_ports = pcfg.get('monitor', {}).get('tcp_ports', [])
-                if tcp_ports:
-                    port_lines = []
-                    for pc in tcp_ports:
-                        if isinstance(pc, int):
-                            label = f"Port {pc}"
-                        else:
-                            label = pc.get('label', f"Port {pc.get('port')}")
-                        port_ok = project.is_online or (label not in str(project.last_error or ''))
-                        if not project.is_online and not project.last_error:
-                            port_ok = False
-                        icon = "🟢" if port_ok else "🔴"
-                        port_lines.append(f"{icon} {label}")
-                    main_line += "\n" + " · ".join(port_lines)
-                break
+            tcp_ports = project.tcp_ports
+            if tcp_ports:
+                port_lines = []
+                for pc in tcp_ports:
+                    if isinstance(pc, int):
+                        label = f"Port {pc}"
+                    else:
+                        label = pc.get('label', f"Port {pc.get('port')}")
+                    port_ok = project.is_online or (label not in str(project.last_error or ''))
+                    if not project.is_online and not project.last_error:
+                        port_ok = False
+                    icon = "🟢" if port_ok else "🔴"
+                    port_lines.append(f"{icon} {label}")
+                lines.append(" · ".join(port_lines))
 
             # Erweiterte Health-Daten (wenn verfügbar)
             hd = project.health_details
@@ -1332,33 +1687,29 @@ class ProjectMonitor:
                 version = hd.get('version')
 
                 if latency:
-                    lat_parts = []
-                    if latency.get('db_ms') is not None:
-                        lat_parts.append(f"DB:{latency['db_ms']}ms")
-                    if latency.get('redis_ms') is not None:
-                        lat_parts.append(f"Redis:{latency['redis_ms']}ms")
-                    if latency.get('osrm_ms') is not None:
-                        lat_parts.append(f"OSRM:{latency['osrm_ms']}ms")
+                    lat_parts = [
+                        f"{label}:{latency[key]}ms"
+                        for key, label in _LATENCY_LABELS
+                        if latency.get(key) is not None
+                    ]
                     if lat_parts:
-                        main_line += f"\n⚡ {' · '.join(lat_parts)}"
+                        lines.append(f"⚡ {' · '.join(lat_parts)}")
 
                 if memory:
-                    main_line += f"\n💾 RAM: {memory.get('rss_mb', '?')} MB · Heap: {memory.get('heap_used_mb', '?')} MB"
+                    lines.append(f"💾 RAM: {memory.get('rss_mb', '?')} MB · Heap: {memory.get('heap_used_mb', '?')} MB")
 
                 if version:
-                    main_line += f"\n📦 v{version}"
+                    lines.append(f"📦 v{version}")
 
-            # Letzter Check Zeitstempel
+            # Letzter Check als Discord-Relativzeit: der Client rendert
+            # "vor X Minuten" selbst, das Alter veraltet also ohne Edit nicht
             last_check = getattr(project, 'last_check_time', None)
             if last_check:
-                from datetime import timezone as tz
-                now = datetime.now(tz.utc)
-                ago = int((now - last_check).total_seconds() / 60)
-                main_line += f"\nLetzter Check: vor {ago} Minuten"
+                lines.append(f"Letzter Check: <t:{int(last_check.timestamp())}:R>")
 
-            embed.add_field(name=header, value=main_line, inline=True)
+            embed.add_field(name=header, value="\n".join(lines), inline=True)
 
-        embed.set_footer(text="Aktualisiert alle 5 Minuten")
+        embed.set_footer(text=_DASHBOARD_FOOTER)
 
         return embed
 
@@ -1368,24 +1719,13 @@ class ProjectMonitor:
         Zeigt nur den Status des jeweiligen Projekts — nicht alle Projekte.
         Konfiguriert via external_notifications[].channel_id pro Projekt.
         """
-        for proj_name, proj_cfg in self.config.projects.items():
-            external_notifs = proj_cfg.get('external_notifications', [])
-            if not external_notifs:
-                continue
-
-            project = self.projects.get(proj_name)
-            if not project:
+        for proj_name, project in self.projects.items():
+            if not project.external_targets:
                 continue
+            proj_cfg = self._project_configs.get(proj_name, {})
 
-            for notif_config in external_notifs:
-                if not notif_config.get('enabled', False):
-                    continue
-
-                channel_id = notif_config.get('channel_id')
-                if not channel_id:
-                    continue
-
-                channel = self.bot.get_channel(int(channel_id))
+            for channel_id, _, _ in project.external_targets:
+                channel = self._channel(channel_id)
                 if not channel:
                     continue
 
@@ -1399,7 +1739,7 @@ class ProjectMonitor:
                     existing_msg_id = getattr(self, '_ext_dashboard_ids', {}).get(state_key)
                     if existing_msg_id:
                         try:
-                            msg = await channel.fetch_message(existing_msg_id)
+                            msg = channel.get_partial_message(existing_msg_id)
                             await msg.edit(embed=embed)
                             continue
                         except discord.NotFound:
@@ -1410,8 +1750,11 @@ class ProjectMonitor:
                     if not hasattr(self, '_ext_dashboard_ids'):
                         self._ext_dashboard_ids = {}
                     self._ext_dashboard_ids[state_key] = msg.id
+                    await self._save_state_async()
 
                 except Exception as e:
+                    if isinstance(e, discord.NotFound):
+                        self._invalidate_channel(channel_id)
                     self.logger.error(f"❌ Fehler beim externen Dashboard fuer {proj_name}: {e}")
 
     def _create_single_project_dashboard(self, project, project_config) -> discord.Embed:
@@ -1428,7 +1771,7 @@ class ProjectMonitor:
         is_online = project.is_online
         status_emoji = "🟢" if is_online else "🔴"
         status_text = "Online" if is_online else "Offline"
-        color = discord.Color(color_val) if is_online else discord.Color.red()
+        color = discord.Color(color_val) if is_online else _DASHBOARD_DOWN_COLOR
 
         embed = discord.Embed(
             title=f"{status_emoji} Server Status — {tag}",
@@ -1485,13 +1828,11 @@ class ProjectMonitor:
             version = hd.get('version')
 
             if latency:
-                latency_lines = []
-                if latency.get('db_ms') is not None:
-                    latency_lines.append(f"DB: {latency['db_ms']}ms")
-                if latency.get('redis_ms') is not None:
-                    latency_lines.append(f"Redis: {latency['redis_ms']}ms")
-                if latency.get('osrm_ms') is not None:
-                    latency_lines.append(f"OSRM: {latency['osrm_ms']}ms")
+                latency_lines = [
+                    f"{label}: {latency[key]}ms"
+                    for key, label in _LATENCY_LABELS
+                    if latency.get(key) is not None
+                ]
                 if latency_lines:
                     embed.add_field(name="⚡ Latenz", value=" · ".join(latency_lines), inline=False)
 
@@ -1515,7 +1856,7 @@ class ProjectMonitor:
             inline=True
         )
 
-        embed.set_footer(text="ShadowOps Monitoring • Aktualisiert alle 5 Minuten")
+        embed.set_footer(text=_EXT_DASHBOARD_FOOTER)
 
         return embed
 
@@ -1581,12 +1922,10 @@ class ProjectMonitor:
 
     def _get_project_domain(self, project: ProjectStatus) -> Optional[str]:
         """Domain fuer SSL-Check aus project.url ableiten."""
-        if not project.url:
+        if not project.parsed_url:
             return None
         try:
-            from urllib.parse import urlparse
-            parsed = urlparse(project.url)
-            host = parsed.hostname
+            host = project.parsed_url.hostname
             if host and not host.startswith('127.') and host != 'localhost':
                 return host
         except Exception:
@@ -1675,7 +2014,7 @@ class ProjectMonitor:
             )
             return
 
-        channel = self.bot.get_channel(channel_id) if hasattr(self.bot, 'get_channel') else None
+        channel = self._channel(channel_id) if hasattr(self.bot, 'get_channel') else None
         if not channel:
             self.logger.warning(f"⚠️ Channel {channel_id} fuer {check_type}-Alert nicht gefunden")
             return
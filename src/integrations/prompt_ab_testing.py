@@ -4,16 +4,24 @@ A/B Testing System for Prompt Optimization.
 Tests multiple prompt variants and tracks which performs best.
 """
 
-import json
+import atexit
 import logging
 import random
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timezone
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+
+try:  # pragma: no cover - Import-Pfad haengt von pythonpath ab
+    from utils import fast_json
+except ImportError:  # pragma: no cover
+    from src.utils import fast_json  # type: ignore[no-redef]
 
 logger = logging.getLogger('shadowops')
 
+# Ergebnis-Zeilen werden gepuffert und spaetestens nach so vielen Records geflusht
+RESULTS_FLUSH_EVERY = 16
+
 
 @dataclass
 class PromptVariant:
@@ -25,6 +33,17 @@ class PromptVariant:
     created_at: str
     active: bool = True
 
+    def to_dict(self) -> Dict:
+        """Flaches dict fuer JSON (schneller als asdict, nur Primitive)."""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'description': self.description,
+            'template': self.template,
+            'created_at': self.created_at,
+            'active': self.active,
+        }
+
 
 @dataclass
 class PromptTestResult:
@@ -36,159 +55,25 @@ class PromptTestResult:
     user_feedback_score: float  # From reactions
     timestamp: str
 
+    def to_dict(self) -> Dict:
+        """Flaches dict fuer JSONL (schneller als asdict, nur Primitive)."""
+        return {
+            'variant_id': self.variant_id,
+            'project': self.project,
+            'version': self.version,
+            'quality_score': self.quality_score,
+            'user_feedback_score': self.user_feedback_score,
+            'timestamp': self.timestamp,
+        }
 
-class PromptABTesting:
-    """
-    Manages A/B testing of different prompt variants.
-    """
-
-    def __init__(self, data_dir: Path):
-        self.data_dir = data_dir
-        self.data_dir.mkdir(parents=True, exist_ok=True)
-
-        self.variants_file = self.data_dir / 'prompt_variants.json'
-        self.results_file = self.data_dir / 'prompt_test_results.jsonl'
-
-        # Load variants
-        self.variants: Dict[str, PromptVariant] = self._load_variants()
-
-        # Create default variants if none exist
-        if not self.variants:
-            self._create_default_variants()
-        else:
-            # Sync: Neue Default-Varianten nachtragen die in der Datei fehlen
-            self._sync_default_variants()
-
-        logger.info(f"✅ Prompt A/B Testing initialized with {len(self.variants)} variants")
-
-    def _load_variants(self) -> Dict[str, PromptVariant]:
-        """Load prompt variants from file."""
-        if not self.variants_file.exists():
-            return {}
-
-        try:
-            with open(self.variants_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return {v['id']: PromptVariant(**v) for v in data}
-        except Exception as e:
-            logger.error(f"Failed to load prompt variants: {e}")
-            return {}
-
-    def _save_variants(self) -> None:
-        """Save prompt variants to file."""
-        try:
-            data = [asdict(v) for v in self.variants.values()]
-            with open(self.variants_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            logger.error(f"Failed to save prompt variants: {e}")
-
-    def _create_default_variants(self) -> None:
-        """Create default prompt variants.
-
-        Note: Templates are stored with default language (de).
-        Use get_variant_template() to get language-specific version.
-        """
-        variants = [
-            PromptVariant(
-                id='detailed_v1',
-                name='Detailed Grouping',
-                description='Emphasizes grouping related commits into detailed feature descriptions',
-                template=self._get_detailed_template('de'),  # Default German
-                created_at=datetime.now(timezone.utc).isoformat(),
-                active=True
-            ),
-            PromptVariant(
-                id='concise_v1',
-                name='Concise Overview',
-                description='Focuses on concise, high-level overview with key points',
-                template=self._get_concise_template('de'),  # Default German
-                created_at=datetime.now(timezone.utc).isoformat(),
-                active=True
-            ),
-            PromptVariant(
-                id='benefit_focused_v1',
-                name='Benefit-Focused',
-                description='Emphasizes user benefits and impact rather than technical details',
-                template=self._get_benefit_focused_template('de'),  # Default German
-                created_at=datetime.now(timezone.utc).isoformat(),
-                active=True
-            ),
-            PromptVariant(
-                id='community_v1',
-                name='Community-Friendly',
-                description='TL;DR + Benefit-Focus + Stats — optimiert für Community und SEO',
-                template=self._get_community_template('de'),  # Default German
-                created_at=datetime.now(timezone.utc).isoformat(),
-                active=True
-            ),
-            PromptVariant(
-                id='gaming_community_v1',
-                name='Gaming Community Hype',
-                description='Spiel-Community Patchnotes — aufregend, verständlich, hyped Features statt Code',
-                template=self._get_gaming_community_template('de'),  # Default German
-                created_at=datetime.now(timezone.utc).isoformat(),
-                active=True
-            ),
-            PromptVariant(
-                id='gaming_community_v2',
-                name='Gaming Community Story-Telling',
-                description='Spiel-Community v2 — Story-Telling mit konkretem Spielgefühl, → Pfeil-Format, ausführliche Feature-Beschreibungen',
-                template=self._get_gaming_community_v2_template('de'),
-                created_at=datetime.now(timezone.utc).isoformat(),
-                active=True
-            ),
-        ]
-
-        for variant in variants:
-            self.variants[variant.id] = variant
-
-        self._save_variants()
-        logger.info(f"Created {len(variants)} default prompt variants")
-
-    def _sync_default_variants(self) -> None:
-        """Sync neue Default-Varianten in bestehende Datei nach.
-
-        Wird aufgerufen wenn die Varianten-Datei schon existiert,
-        aber neue Varianten im Code hinzugekommen sind.
-        """
-        # Temporär alle Defaults erzeugen ohne zu speichern
-        defaults = {}
-        for variant_data in [
-            ('detailed_v1', 'Detailed Grouping', 'Emphasizes grouping related commits into detailed feature descriptions', self._get_detailed_template('de')),
-            ('concise_v1', 'Concise Overview', 'Focuses on concise, high-level overview with key points', self._get_concise_template('de')),
-            ('benefit_focused_v1', 'Benefit-Focused', 'Emphasizes user benefits and impact rather than technical details', self._get_benefit_focused_template('de')),
-            ('community_v1', 'Community-Friendly', 'TL;DR + Benefit-Focus + Stats — optimiert für Community und SEO', self._get_community_template('de')),
-            ('gaming_community_v1', 'Gaming Community Hype', 'Spiel-Community Patchnotes — aufregend, verständlich, hyped Features statt Code', self._get_gaming_community_template('de')),
-            ('gaming_community_v2', 'Gaming Community Story-Telling', 'Spiel-Community v2 — Story-Telling mit konkretem Spielgefühl, → Pfeil-Format, ausführliche Feature-Beschreibungen', self._get_gaming_community_v2_template('de')),
-        ]:
-            defaults[variant_data[0]] = variant_data
-
-        added = []
-        for variant_id, (vid, name, desc, template) in defaults.items():
-            if variant_id not in self.variants:
-                self.variants[variant_id] = PromptVariant(
-                    id=vid,
-                    name=name,
-                    description=desc,
-                    template=template,
-                    created_at=datetime.now(timezone.utc).isoformat(),
-                    active=True
-                )
-                added.append(variant_id)
-
-        if added:
-            self._save_variants()
-            logger.info(f"🔄 {len(added)} neue Default-Variante(n) nachgetragen: {', '.join(added)}")
 
-    def _get_detailed_template(self, language: str = 'de') -> str:
-        """Get detailed grouping template.
+# ============================================================================
+# TEMPLATES
+# Statisch — einmal beim Import gebaut statt bei jedem Aufruf neu erzeugt.
+# ============================================================================
 
-        Args:
-            language: 'de' for German, 'en' for English
-        """
-        if language == 'en':
-            return """You are an expert technical writer creating patch notes for {project}.
+# Detailed grouping
+_DETAILED_TEMPLATE_EN = """You are an expert technical writer creating patch notes for {project}.
 
 IMPORTANT: Group related commits into comprehensive feature descriptions!
 
@@ -213,8 +98,8 @@ FORMAT:
   - Key benefit 1
   - Key benefit 2
   - Technical detail"""
-        else:  # German
-            return """Du bist ein professioneller Technical Writer und erstellst Patch Notes für {project}.
+
+_DETAILED_TEMPLATE_DE = """Du bist ein professioneller Technical Writer und erstellst Patch Notes für {project}.
 
 WICHTIG: Gruppiere verwandte Commits in umfassende Feature-Beschreibungen!
 
@@ -240,14 +125,8 @@ FORMAT:
   - Wichtiger Vorteil 2
   - Technisches Detail"""
 
-    def _get_concise_template(self, language: str = 'de') -> str:
-        """Get concise overview template.
-
-        Args:
-            language: 'de' for German, 'en' for English
-        """
-        if language == 'en':
-            return """You are an expert technical writer creating patch notes for {project}.
+# Concise overview
+_CONCISE_TEMPLATE_EN = """You are an expert technical writer creating patch notes for {project}.
 
 IMPORTANT: Be concise but informative!
 
@@ -266,8 +145,8 @@ INSTRUCTIONS:
 FORMAT:
 **🆕 New Features:**
 • **Feature Name**: Brief description of what it does"""
-        else:  # German
-            return """Du bist ein professioneller Technical Writer und erstellst Patch Notes für {project}.
+
+_CONCISE_TEMPLATE_DE = """Du bist ein professioneller Technical Writer und erstellst Patch Notes für {project}.
 
 WICHTIG: Sei prägnant aber informativ!
 
@@ -287,14 +166,8 @@ FORMAT:
 **🆕 Neue Features:**
 • **Feature Name**: Kurze Beschreibung was es tut"""
 
-    def _get_benefit_focused_template(self, language: str = 'de') -> str:
-        """Get benefit-focused template.
-
-        Args:
-            language: 'de' for German, 'en' for English
-        """
-        if language == 'en':
-            return """You are an expert technical writer creating patch notes for {project}.
+# Benefit-focused
+_BENEFIT_FOCUSED_TEMPLATE_EN = """You are an expert technical writer creating patch notes for {project}.
 
 IMPORTANT: Focus on USER BENEFITS and IMPACT!
 
@@ -313,8 +186,8 @@ INSTRUCTIONS:
 FORMAT:
 **🆕 New Features:**
 • **Feature Name**: [Benefit statement]. This means [user impact]. Technical: [how it works]"""
-        else:  # German
-            return """Du bist ein professioneller Technical Writer und erstellst Patch Notes für {project}.
+
+_BENEFIT_FOCUSED_TEMPLATE_DE = """Du bist ein professioneller Technical Writer und erstellst Patch Notes für {project}.
 
 WICHTIG: Fokussiere auf NUTZERVORTEILE und AUSWIRKUNGEN!
 
@@ -334,14 +207,8 @@ FORMAT:
 **🆕 Neue Features:**
 • **Feature Name**: [Vorteil]. Das bedeutet [Nutzerauswirkung]. Technisch: [wie es funktioniert]"""
 
-    def _get_community_template(self, language: str = 'de') -> str:
-        """Get community-friendly template with TL;DR and stats.
-
-        Args:
-            language: 'de' for German, 'en' for English
-        """
-        if language == 'en':
-            return """You are a community manager writing patch notes for {project}.
+# Community-friendly mit TL;DR und Stats
+_COMMUNITY_TEMPLATE_EN = """You are a community manager writing patch notes for {project}.
 Your audience is NON-TECHNICAL end users who want to understand what improved.
 
 # CHANGELOG INFORMATION
@@ -374,8 +241,8 @@ FORMAT:
 • **Improvement**: How the experience got better
 
 {stats_line}"""
-        else:  # German
-            return """Du bist ein Community Manager und schreibst Patch Notes für {project}.
+
+_COMMUNITY_TEMPLATE_DE = """Du bist ein Community Manager und schreibst Patch Notes für {project}.
 Deine Zielgruppe sind NICHT-TECHNISCHE Endnutzer die verstehen wollen, was sich verbessert hat.
 
 # CHANGELOG INFORMATIONEN
@@ -409,14 +276,8 @@ FORMAT:
 
 {stats_line}"""
 
-    def _get_gaming_community_template(self, language: str = 'de') -> str:
-        """Get gaming community template — hypes features for game communities.
-
-        Args:
-            language: 'de' for German, 'en' for English
-        """
-        if language == 'en':
-            return """You are the community manager for {project}, a realistic emergency dispatch simulator game.
+# Gaming community — hyped Features fuer Spiel-Communities
+_GAMING_COMMUNITY_TEMPLATE_EN = """You are the community manager for {project}, a realistic emergency dispatch simulator game.
 Your audience is GAMERS and emergency services fans on Discord. They want to know what's new, exciting, and coming soon.
 
 CRITICAL RULES:
@@ -483,8 +344,8 @@ FORMAT (choose fitting categories — not all are required):
 → Use the FEATURE BRANCHES info from the context
 
 {stats_line}"""
-        else:  # German
-            return """Du bist der Community-Manager für {project}, eine realistische Leitstellen-Simulation.
+
+_GAMING_COMMUNITY_TEMPLATE_DE = """Du bist der Community-Manager für {project}, eine realistische Leitstellen-Simulation.
 Deine Zielgruppe sind GAMER und BOS-Fans auf Discord. Sie wollen wissen, was neu, spannend und bald verfügbar ist.
 
 KRITISCHE REGELN:
@@ -554,28 +415,15 @@ FORMAT (wähle die passenden Kategorien — nicht alle sind Pflicht):
 
 {stats_line}"""
 
-    def _get_gaming_community_v2_template(self, language: str = 'de') -> str:
-        """Get gaming community v2 template — story-telling with concrete gameplay feel.
-
-        Improvements over v1:
-        - Enforces story-telling: every feature must describe HOW IT FEELS
-        - Concrete numbers required (e.g. "30 scenarios", "26 upgrades")
-        - → arrow format instead of bullet points
-        - Highlight features get 3-5 sentences with examples
-        - Good/bad examples included in template
-        - Minimum 2500, maximum 3800 characters
-
-        Args:
-            language: 'de' for German, 'en' for English
-        """
-        if language == 'en':
-            return self._get_gaming_community_v2_template_en()
-        else:
-            return self._get_gaming_community_v2_template_de()
-
-    def _get_gaming_community_v2_template_de(self) -> str:
-        """German gaming community v2 template — Story-Telling with gameplay feel."""
-        return """Du bist ein leidenschaftlicher Game-Developer der sein eigenes Update vorstellt.
+# Gaming community v2 — Story-Telling mit konkretem Spielgefuehl.
+# Improvements over v1:
+# - Enforces story-telling: every feature must describe HOW IT FEELS
+# - Concrete numbers required (e.g. "30 scenarios", "26 upgrades")
+# - → arrow format instead of bullet points
+# - Highlight features get 3-5 sentences with examples
+# - Good/bad examples included in template
+# - Minimum 2500, maximum 3800 characters
+_GAMING_COMMUNITY_V2_TEMPLATE_DE = """Du bist ein leidenschaftlicher Game-Developer der sein eigenes Update vorstellt.
 Du LIEBST dein Spiel {project} und willst, dass die Community deine Begeisterung spürt.
 Deine Zielgruppe sind GAMER und BOS-Fans auf Discord — sie wollen FÜHLEN was sich geändert hat, nicht nur lesen.
 
@@ -740,9 +588,7 @@ EMOJIS pro Type:
 
 {stats_line}"""
 
-    def _get_gaming_community_v2_template_en(self) -> str:
-        """English gaming community v2 template — Story-Telling with gameplay feel."""
-        return """You are a passionate game developer presenting your own update.
+_GAMING_COMMUNITY_V2_TEMPLATE_EN = """You are a passionate game developer presenting your own update.
 You LOVE your game {project} and want the community to feel your excitement.
 Your audience is GAMERS and emergency service fans on Discord — they want to FEEL what changed, not just read about it.
 
@@ -907,6 +753,190 @@ EMOJIS per type:
 
 {stats_line}"""
 
+# (variant_id, language) -> Template. Default-Varianten sind immer in der DB
+# mit der deutschen Fassung gespeichert.
+_TEMPLATES: Dict[Tuple[str, str], str] = {
+    ('detailed_v1', 'de'): _DETAILED_TEMPLATE_DE,
+    ('detailed_v1', 'en'): _DETAILED_TEMPLATE_EN,
+    ('concise_v1', 'de'): _CONCISE_TEMPLATE_DE,
+    ('concise_v1', 'en'): _CONCISE_TEMPLATE_EN,
+    ('benefit_focused_v1', 'de'): _BENEFIT_FOCUSED_TEMPLATE_DE,
+    ('benefit_focused_v1', 'en'): _BENEFIT_FOCUSED_TEMPLATE_EN,
+    ('community_v1', 'de'): _COMMUNITY_TEMPLATE_DE,
+    ('community_v1', 'en'): _COMMUNITY_TEMPLATE_EN,
+    ('gaming_community_v1', 'de'): _GAMING_COMMUNITY_TEMPLATE_DE,
+    ('gaming_community_v1', 'en'): _GAMING_COMMUNITY_TEMPLATE_EN,
+    ('gaming_community_v2', 'de'): _GAMING_COMMUNITY_V2_TEMPLATE_DE,
+    ('gaming_community_v2', 'en'): _GAMING_COMMUNITY_V2_TEMPLATE_EN,
+}
+
+
+class PromptABTesting:
+    """
+    Manages A/B testing of different prompt variants.
+    """
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = data_dir
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+
+        self.variants_file = self.data_dir / 'prompt_variants.json'
+        self.results_file = self.data_dir / 'prompt_test_results.jsonl'
+
+        # Laufende Aggregate pro Variante (inkl. by_project), werden in
+        # record_result in O(1) fortgeschrieben. Die Signatur (mtime_ns, size)
+        # der zuletzt eingelesenen Results-Datei erkennt fremde Schreiber.
+        self._agg: Dict[str, Dict] = {}
+        self._agg_signature: Optional[Tuple[int, int]] = None
+
+        # Kumulative Gewichte fuer weighted_random pro Projekt. Gueltig solange
+        # sich weder Aggregate noch aktive Varianten geaendert haben.
+        self._selection_version = 0
+        self._weight_cache: Dict[Optional[str], Tuple[int, List[PromptVariant], List[float]]] = {}
+
+        # Gepufferter Append-Handle fuer die Results-Datei (lazy geoeffnet)
+        self._results_fp = None
+        self._pending_results = 0
+
+        self._rebuild_aggregates()
+
+        # Load variants
+        self.variants: Dict[str, PromptVariant] = self._load_variants()
+
+        # Create default variants if none exist
+        if not self.variants:
+            self._create_default_variants()
+        else:
+            # Sync: Neue Default-Varianten nachtragen die in der Datei fehlen
+            self._sync_default_variants()
+
+        # Aktive Varianten als gepflegte Liste (add_variant/deactivate_variant)
+        self._active_variants: List[PromptVariant] = [v for v in self.variants.values() if v.active]
+
+        logger.info("✅ Prompt A/B Testing initialized with %d variants", len(self.variants))
+
+    def _load_variants(self) -> Dict[str, PromptVariant]:
+        """Load prompt variants from file."""
+        if not self.variants_file.exists():
+            return {}
+
+        try:
+            with open(self.variants_file, 'rb') as f:
+                data = fast_json.loads(f.read())
+                return {v['id']: PromptVariant(**v) for v in data}
+        except Exception as e:
+            logger.error("Failed to load prompt variants: %s", e)
+            return {}
+
+    def _save_variants(self) -> None:
+        """Save prompt variants to file."""
+        try:
+            data = [v.to_dict() for v in self.variants.values()]
+            with open(self.variants_file, 'wb') as f:
+                f.write(fast_json.dumps(data, indent=True))
+        except Exception as e:
+            logger.error("Failed to save prompt variants: %s", e)
+
+    def _create_default_variants(self) -> None:
+        """Create default prompt variants.
+
+        Note: Templates are stored with default language (de).
+        Use get_variant_template() to get language-specific version.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        variants = [
+            PromptVariant(
+                id='detailed_v1',
+                name='Detailed Grouping',
+                description='Emphasizes grouping related commits into detailed feature descriptions',
+                template=_TEMPLATES[('detailed_v1', 'de')],  # Default German
+                created_at=now,
+                active=True
+            ),
+            PromptVariant(
+                id='concise_v1',
+                name='Concise Overview',
+                description='Focuses on concise, high-level overview with key points',
+                template=_TEMPLATES[('concise_v1', 'de')],  # Default German
+                created_at=now,
+                active=True
+            ),
+            PromptVariant(
+                id='benefit_focused_v1',
+                name='Benefit-Focused',
+                description='Emphasizes user benefits and impact rather than technical details',
+                template=_TEMPLATES[('benefit_focused_v1', 'de')],  # Default German
+                created_at=now,
+                active=True
+            ),
+            PromptVariant(
+                id='community_v1',
+                name='Community-Friendly',
+                description='TL;DR + Benefit-Focus + Stats — optimiert für Community und SEO',
+                template=_TEMPLATES[('community_v1', 'de')],  # Default German
+                created_at=now,
+                active=True
+            ),
+            PromptVariant(
+                id='gaming_community_v1',
+                name='Gaming Community Hype',
+                description='Spiel-Community Patchnotes — aufregend, verständlich, hyped Features statt Code',
+                template=_TEMPLATES[('gaming_community_v1', 'de')],  # Default German
+                created_at=now,
+                active=True
+            ),
+            PromptVariant(
+                id='gaming_community_v2',
+                name='Gaming Community Story-Telling',
+                description='Spiel-Community v2 — Story-Telling mit konkretem Spielgefühl, → Pfeil-Format, ausführliche Feature-Beschreibungen',
+                template=_TEMPLATES[('gaming_community_v2', 'de')],
+                created_at=now,
+                active=True
+            ),
+        ]
+
+        for variant in variants:
+            self.variants[variant.id] = variant
+
+        self._save_variants()
+        logger.info("Created %d default prompt variants", len(variants))
+
+    def _sync_default_variants(self) -> None:
+        """Sync neue Default-Varianten in bestehende Datei nach.
+
+        Wird aufgerufen wenn die Varianten-Datei schon existiert,
+        aber neue Varianten im Code hinzugekommen sind.
+        """
+        # Temporär alle Defaults erzeugen ohne zu speichern
+        defaults = {}
+        for variant_data in [
+            ('detailed_v1', 'Detailed Grouping', 'Emphasizes grouping related commits into detailed feature descriptions', _TEMPLATES[('detailed_v1', 'de')]),
+            ('concise_v1', 'Concise Overview', 'Focuses on concise, high-level overview with key points', _TEMPLATES[('concise_v1', 'de')]),
+            ('benefit_focused_v1', 'Benefit-Focused', 'Emphasizes user benefits and impact rather than technical details', _TEMPLATES[('benefit_focused_v1', 'de')]),
+            ('community_v1', 'Community-Friendly', 'TL;DR + Benefit-Focus + Stats — optimiert für Community und SEO', _TEMPLATES[('community_v1', 'de')]),
+            ('gaming_community_v1', 'Gaming Community Hype', 'Spiel-Community Patchnotes — aufregend, verständlich, hyped Features statt Code', _TEMPLATES[('gaming_community_v1', 'de')]),
+            ('gaming_community_v2', 'Gaming Community Story-Telling', 'Spiel-Community v2 — Story-Telling mit konkretem Spielgefühl, → Pfeil-Format, ausführliche Feature-Beschreibungen', _TEMPLATES[('gaming_community_v2', 'de')]),
+        ]:
+            defaults[variant_data[0]] = variant_data
+
+        added = []
+        now = datetime.now(timezone.utc).isoformat()
+        for variant_id, (vid, name, desc, template) in defaults.items():
+            if variant_id not in self.variants:
+                self.variants[variant_id] = PromptVariant(
+                    id=vid,
+                    name=name,
+                    description=desc,
+                    template=template,
+                    created_at=now,
+                    active=True
+                )
+                added.append(variant_id)
+
+        if added:
+            self._save_variants()
+            logger.info("🔄 %d neue Default-Variante(n) nachgetragen: %s", len(added), ', '.join(added))
+
     def get_variant_template(self, variant_id: str, language: str = 'de') -> str:
         """Get the template for a specific variant in the requested language.
 
@@ -917,25 +947,17 @@ EMOJIS per type:
         Returns:
             Template string in the requested language
         """
-        if variant_id == 'detailed_v1':
-            return self._get_detailed_template(language)
-        elif variant_id == 'concise_v1':
-            return self._get_concise_template(language)
-        elif variant_id == 'benefit_focused_v1':
-            return self._get_benefit_focused_template(language)
-        elif variant_id == 'community_v1':
-            return self._get_community_template(language)
-        elif variant_id == 'gaming_community_v1':
-            return self._get_gaming_community_template(language)
-        elif variant_id == 'gaming_community_v2':
-            return self._get_gaming_community_v2_template(language)
+        # Alles ausser 'en' faellt auf die deutsche Fassung zurueck
+        template = _TEMPLATES.get((variant_id, 'en' if language == 'en' else 'de'))
+        if template is not None:
+            return template
+
+        # For custom variants, return stored template (may not have language support)
+        variant = self.variants.get(variant_id)
+        if variant:
+            return variant.template
         else:
-            # For custom variants, return stored template (may not have language support)
-            variant = self.variants.get(variant_id)
-            if variant:
-                return variant.template
-            else:
-                raise ValueError(f"Unknown variant ID: {variant_id}")
+            raise ValueError(f"Unknown variant ID: {variant_id}")
 
     def select_variant(self, project: str, strategy: str = 'weighted_random') -> PromptVariant:
         """
@@ -943,12 +965,12 @@ EMOJIS per type:
 
         Args:
             project: Project name (for project-specific weighting)
-            strategy: Selection strategy ('random', 'weighted_random', 'best_performing')
+            strategy: Selection strategy ('random', 'weighted_random', 'best_performing', 'thompson')
 
         Returns:
             Selected PromptVariant
         """
-        active_variants = [v for v in self.variants.values() if v.active]
+        active_variants = self._active_variants
 
         if not active_variants:
             raise ValueError("No active prompt variants available")
@@ -957,18 +979,11 @@ EMOJIS per type:
             return random.choice(active_variants)
 
         elif strategy == 'weighted_random':
-            # Weight by performance
-            stats = self.get_variant_statistics(project)
-            weights = []
+            variants, cum_weights = self._weighted_selection(active_variants, project)
+            return random.choices(variants, cum_weights=cum_weights)[0]
 
-            for variant in active_variants:
-                variant_stats = stats.get(variant.id, {})
-                avg_score = variant_stats.get('avg_total_score', 50)  # Default 50
-                # Weight = score / 100, minimum 0.1
-                weight = max(avg_score / 100, 0.1)
-                weights.append(weight)
-
-            return random.choices(active_variants, weights=weights)[0]
+        elif strategy == 'thompson':
+            return self._thompson_sample(active_variants, project)
 
         elif strategy == 'best_performing':
             stats = self.get_variant_statistics(project)
@@ -1002,69 +1017,209 @@ EMOJIS per type:
             timestamp=datetime.now(timezone.utc).isoformat()
         )
 
-        # Append to results file
-        with open(self.results_file, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(asdict(result)) + '\n')
+        # Aggregate nur fortschreiben wenn sie vor dem Append aktuell waren,
+        # sonst baut der naechste get_variant_statistics-Aufruf sie neu auf
+        if self._results_signature() == self._agg_signature:
+            self._add_to_aggregates(self._agg, variant_id, project,
+                                    quality_score, user_feedback_score)
+            self._selection_version += 1
+
+        # Append to results file (gepuffert)
+        self._append_result_line(fast_json.dumps(result.to_dict()) + b'\n')
+
+        logger.info("📊 A/B Test Result: variant=%s, quality=%.1f, feedback=%+.1f",
+                    variant_id, quality_score, user_feedback_score)
+
+    def _append_result_line(self, line: bytes) -> None:
+        """Haengt eine Zeile an den gepufferten Results-Handle an."""
+        if self._results_fp is None:
+            in_sync = self._results_signature() == self._agg_signature
+            self._results_fp = open(self.results_file, 'ab', buffering=1 << 16)
+            atexit.register(self.close)
+            # Oeffnen legt die Datei ggf. an — Signatur nachziehen
+            if in_sync:
+                self._agg_signature = self._results_signature()
+        self._results_fp.write(line)
+        self._pending_results += 1
+        if self._pending_results >= RESULTS_FLUSH_EVERY:
+            self.flush()
+
+    def flush(self) -> None:
+        """Schreibt gepufferte Ergebnis-Zeilen auf die Platte."""
+        if self._results_fp is None or not self._pending_results:
+            return
+        in_sync = self._results_signature() == self._agg_signature
+        self._results_fp.flush()
+        self._pending_results = 0
+        # Eigene Zeilen sind schon in den Aggregaten, kein Rescan noetig
+        if in_sync:
+            self._agg_signature = self._results_signature()
+
+    def close(self) -> None:
+        """Flusht und schliesst den Results-Handle (Shutdown)."""
+        if self._results_fp is None:
+            return
+        self.flush()
+        self._results_fp.close()
+        self._results_fp = None
+        atexit.unregister(self.close)
+
+    @staticmethod
+    def _new_bucket() -> Dict:
+        return {
+            'count': 0,
+            'total_quality': 0,
+            'total_feedback': 0,
+            # Beta-Posterior fuer Thompson Sampling (Qualitaet als Erfolgsanteil)
+            'alpha': 0.0,
+            'beta': 0.0,
+        }
+
+    @staticmethod
+    def _add_to_bucket(bucket: Dict, quality_score: float, feedback_score: float) -> None:
+        bucket['count'] += 1
+        bucket['total_quality'] += quality_score
+        bucket['total_feedback'] += feedback_score
+        success = min(max(quality_score / 100, 0.0), 1.0)
+        bucket['alpha'] += success
+        bucket['beta'] += 1.0 - success
+
+    def _add_to_aggregates(self, agg: Dict[str, Dict], variant_id: str, project: str,
+                           quality_score: float, feedback_score: float) -> None:
+        """Schreibt ein einzelnes Ergebnis in die Aggregate fort."""
+        entry = agg.get(variant_id)
+        if entry is None:
+            entry = agg[variant_id] = {'all': self._new_bucket(), 'by_project': {}}
+        self._add_to_bucket(entry['all'], quality_score, feedback_score)
+        project_bucket = entry['by_project'].get(project)
+        if project_bucket is None:
+            project_bucket = entry['by_project'][project] = self._new_bucket()
+        self._add_to_bucket(project_bucket, quality_score, feedback_score)
+
+    def _results_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = self.results_file.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _rebuild_aggregates(self) -> None:
+        """Baut die Aggregate mit einem vollen Scan der Results-Datei neu auf."""
+        self.flush()
+        agg: Dict[str, Dict] = {}
+        signature = self._results_signature()
+
+        if signature is not None:
+            try:
+                with open(self.results_file, 'rb') as f:
+                    for line in f:
+                        try:
+                            result = fast_json.loads(line)
+                            # Erst konvertieren, dann fortschreiben — keine halb
+                            # aktualisierten Buckets bei kaputten Werten
+                            # Zeilen stammen aus record_result, alle Keys sind
+                            # vorhanden; fehlende Keys -> KeyError -> Zeile skippen
+                            quality_score = float(result['quality_score'])
+                            feedback_score = float(result['user_feedback_score'])
+                            self._add_to_aggregates(
+                                agg,
+                                result['variant_id'],
+                                result['project'],
+                                quality_score,
+                                feedback_score,
+                            )
+                        except (ValueError, KeyError, TypeError, AttributeError):
+                            # Kaputte Zeile (JSONDecodeError ist ein ValueError)
+                            continue
+            except Exception as e:
+                logger.error("Failed to calculate variant statistics: %s", e)
+
+        self._agg = agg
+        self._agg_signature = signature
+        self._selection_version += 1
 
-        logger.info(f"📊 A/B Test Result: variant={variant_id}, quality={quality_score:.1f}, feedback={user_feedback_score:+.1f}")
+    def _ensure_aggregates(self) -> None:
+        """Scannt die Results-Datei neu falls sie von aussen geaendert wurde."""
+        if self._results_signature() != self._agg_signature:
+            self._rebuild_aggregates()
+
+    def _thompson_sample(self, variants: List[PromptVariant], project: Optional[str]) -> PromptVariant:
+        """Thompson Sampling: pro Variante θ ~ Beta(α+1, β+1) ziehen, argmax waehlen."""
+        self._ensure_aggregates()
+
+        best_variant = variants[0]
+        best_theta = -1.0
+        for variant in variants:
+            entry = self._agg.get(variant.id)
+            bucket = None
+            if entry:
+                bucket = entry['by_project'].get(project) if project else entry['all']
+            alpha = bucket['alpha'] if bucket else 0.0
+            beta = bucket['beta'] if bucket else 0.0
+            theta = random.betavariate(alpha + 1, beta + 1)
+            if theta > best_theta:
+                best_variant, best_theta = variant, theta
+        return best_variant
+
+    def _weighted_selection(self, active_variants: List[PromptVariant],
+                            project: Optional[str]) -> Tuple[List[PromptVariant], List[float]]:
+        """Liefert (Varianten, kumulative Gewichte) fuer weighted_random, gecacht."""
+        self._ensure_aggregates()
+
+        cached = self._weight_cache.get(project)
+        if cached is not None and cached[0] == self._selection_version:
+            return cached[1], cached[2]
+
+        # Weight by performance
+        stats = self.get_variant_statistics(project)
+        cum_weights = []
+        total = 0.0
+        for variant in active_variants:
+            avg_score = stats.get(variant.id, {}).get('avg_total_score', 50)  # Default 50
+            # Weight = score / 100, minimum 0.1
+            total += max(avg_score / 100, 0.1)
+            cum_weights.append(total)
+
+        # Snapshot, damit spaetere In-Place-Aenderungen den Cache nicht verschieben
+        variants = list(active_variants)
+        self._weight_cache[project] = (self._selection_version, variants, cum_weights)
+        return variants, cum_weights
 
     def get_variant_statistics(self, project: Optional[str] = None) -> Dict:
         """
         Get statistics for all prompt variants.
 
+        Liest aus den In-Memory-Aggregaten; die Results-Datei wird nur neu
+        gescannt wenn sie von aussen veraendert wurde.
+
         Args:
             project: Optional project filter
 
         Returns:
             Dict of {variant_id: stats}
         """
-        if not self.results_file.exists():
-            return {}
+        self._ensure_aggregates()
 
         variant_stats = {}
 
-        try:
-            with open(self.results_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    try:
-                        result = json.loads(line)
-
-                        # Filter by project if specified
-                        if project and result.get('project') != project:
-                            continue
-
-                        variant_id = result.get('variant_id')
-                        if variant_id not in variant_stats:
-                            variant_stats[variant_id] = {
-                                'count': 0,
-                                'total_quality': 0,
-                                'total_feedback': 0,
-                                'quality_scores': [],
-                                'feedback_scores': [],
-                            }
-
-                        stats = variant_stats[variant_id]
-                        stats['count'] += 1
-                        stats['total_quality'] += result.get('quality_score', 0)
-                        stats['total_feedback'] += result.get('user_feedback_score', 0)
-                        stats['quality_scores'].append(result.get('quality_score', 0))
-                        stats['feedback_scores'].append(result.get('user_feedback_score', 0))
-                    except Exception:
-                        continue
-
-            # Calculate averages and combined scores
-            for variant_id, stats in variant_stats.items():
-                if stats['count'] > 0:
-                    stats['avg_quality_score'] = stats['total_quality'] / stats['count']
-                    stats['avg_feedback_score'] = stats['total_feedback'] / stats['count']
-                    # Combined score: 70% quality, 30% user feedback
-                    stats['avg_total_score'] = (
-                        stats['avg_quality_score'] * 0.7 +
-                        stats['avg_feedback_score'] * 0.3
-                    )
-
-        except Exception as e:
-            logger.error(f"Failed to calculate variant statistics: {e}")
+        for variant_id, entry in self._agg.items():
+            bucket = entry['by_project'].get(project) if project else entry['all']
+            if not bucket:
+                continue
+
+            stats = {
+                'count': bucket['count'],
+                'total_quality': bucket['total_quality'],
+                'total_feedback': bucket['total_feedback'],
+            }
+            stats['avg_quality_score'] = stats['total_quality'] / stats['count']
+            stats['avg_feedback_score'] = stats['total_feedback'] / stats['count']
+            # Combined score: 70% quality, 30% user feedback
+            stats['avg_total_score'] = (
+                stats['avg_quality_score'] * 0.7 +
+                stats['avg_feedback_score'] * 0.3
+            )
+            variant_stats[variant_id] = stats
 
         return variant_stats
 
@@ -1113,17 +1268,23 @@ EMOJIS per type:
         )
 
         self.variants[variant_id] = variant
+        self._active_variants.append(variant)
+        self._selection_version += 1
         self._save_variants()
 
-        logger.info(f"✅ Added new prompt variant: {variant_id} ({name})")
+        logger.info("✅ Added new prompt variant: %s (%s)", variant_id, name)
         return variant_id
 
     def deactivate_variant(self, variant_id: str) -> bool:
         """Deactivate a prompt variant."""
         if variant_id in self.variants:
-            self.variants[variant_id].active = False
+            variant = self.variants[variant_id]
+            variant.active = False
+            if variant in self._active_variants:
+                self._active_variants.remove(variant)
+            self._selection_version += 1
             self._save_variants()
-            logger.info(f"Deactivated prompt variant: {variant_id}")
+            logger.info("Deactivated prompt variant: %s", variant_id)
             return True
         return False
 
@@ -5,14 +5,70 @@ Analyzes feedback and automatically adjusts prompts for better performance.
 """
 
 import logging
-import json
+import os
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import datetime, timedelta, timezone
 from collections import Counter
 
+try:  # pragma: no cover - Import-Pfad haengt von pythonpath ab
+    from utils import fast_json
+except ImportError:  # pragma: no cover
+    from src.utils import fast_json  # type: ignore[no-redef]
+
 logger = logging.getLogger('shadowops')
 
+# Memo fuer analyze_performance_patterns: max. Eintraege und Lebensdauer
+# (das Analysefenster wandert mit der Zeit, daher zusaetzlich eine TTL)
+PATTERN_CACHE_SIZE = 8
+PATTERN_CACHE_TTL_SECONDS = 600
+
+# Insight-Codes aus _generate_insights
+INSIGHT_LONGER_BETTER = 'LONGER_BETTER'
+INSIGHT_CONCISE_BETTER = 'CONCISE_BETTER'
+INSIGHT_SUB_BULLETS = 'SUB_BULLETS'
+INSIGHT_MORE_BULLETS = 'MORE_BULLETS'
+
+# Insight-Code -> (Suggestion-Typ, Prompt-Anweisung)
+_INSIGHT_SUGGESTIONS: Dict[str, Tuple[str, str]] = {
+    INSIGHT_LONGER_BETTER: (
+        'emphasis',
+        'Add instruction: "Provide comprehensive details for each feature (3-5 sentences or sub-bullets)"',
+    ),
+    INSIGHT_CONCISE_BETTER: (
+        'emphasis',
+        'Add instruction: "Keep descriptions concise (1-2 sentences per feature)"',
+    ),
+    INSIGHT_SUB_BULLETS: (
+        'structure',
+        'Add instruction: "For complex features, use sub-bullets (  - ) to list specific details"',
+    ),
+}
+
+
+def _iter_lines_reversed(path: Path, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Liefert die Zeilen einer Datei vom Ende her, blockweise gelesen.
+
+    Erlaubt Early-Exit bei chronologisch angehaengten JSONL-Logs, ohne die
+    komplette Historie zu lesen.
+    """
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        remainder = b''
+        while pos > 0:
+            read_size = min(chunk_size, pos)
+            pos -= read_size
+            f.seek(pos)
+            lines = (f.read(read_size) + remainder).split(b'\n')
+            # Erste (evtl. abgeschnittene) Zeile mit dem naechsten Block zusammensetzen
+            remainder = lines[0]
+            for line in reversed(lines[1:]):
+                if line:
+                    yield line
+        if remainder:
+            yield remainder
+
 
 class PromptAutoTuner:
     """
@@ -26,6 +82,9 @@ class PromptAutoTuner:
 
         self.tuning_log_file = self.data_dir / 'prompt_tuning_log.jsonl'
 
+        # (project, days, mtime_ns, size) -> (erstellt_monotonic, patterns)
+        self._patterns_cache: Dict[Tuple, Tuple[float, Dict]] = {}
+
         logger.info("✅ Prompt Auto-Tuner initialized")
 
     def analyze_performance_patterns(self, project: Optional[str] = None,
@@ -38,40 +97,71 @@ class PromptAutoTuner:
             days: Number of days to analyze
 
         Returns:
-            Dict with insights about what works and what doesn't
+            Dict with insights about what works and what doesn't. Ergebnisse
+            werden pro (project, days, Dateistand) fuer kurze Zeit gecacht.
         """
+        try:
+            st = self.trainer.training_data_file.stat()
+        except FileNotFoundError:
+            return {}
+
+        key = (project, days, st.st_mtime_ns, st.st_size)
+        now = time.monotonic()
+        cached = self._patterns_cache.get(key)
+        if cached is not None and now - cached[0] < PATTERN_CACHE_TTL_SECONDS:
+            return cached[1]
+
+        patterns = self._compute_performance_patterns(project, days)
+        if patterns:
+            self._patterns_cache.pop(key, None)
+            self._patterns_cache[key] = (now, patterns)
+            # Aelteste Eintraege verwerfen (dict behaelt Einfuege-Reihenfolge)
+            while len(self._patterns_cache) > PATTERN_CACHE_SIZE:
+                del self._patterns_cache[next(iter(self._patterns_cache))]
+        return patterns
+
+    def _compute_performance_patterns(self, project: Optional[str], days: int) -> Dict:
+        """Scannt die Trainingsdaten und berechnet die Muster (ohne Cache)."""
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+        # UTC-ISO-Strings (so schreibt der Trainer) sind lexikographisch sortierbar
+        cutoff_str = cutoff_date.isoformat()
 
         # Get training examples
         high_performers = []  # Score >= 80
         low_performers = []   # Score < 60
 
-        if not self.trainer.training_data_file.exists():
-            return {}
-
         try:
-            with open(self.trainer.training_data_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    try:
-                        example = json.loads(line)
-
-                        # Filter by project and date
-                        if project and example.get('project') != project:
-                            continue
-
-                        timestamp = datetime.fromisoformat(example.get('timestamp', ''))
-                        if timestamp < cutoff_date:
-                            continue
-
-                        score = example.get('quality_score', 0)
-                        if score >= 80:
-                            high_performers.append(example)
-                        elif score < 60:
-                            low_performers.append(example)
-                    except Exception:
+            # Datei wird chronologisch angehaengt: von hinten lesen und beim
+            # ersten Eintrag vor dem Cutoff aufhoeren
+            for line in _iter_lines_reversed(self.trainer.training_data_file):
+                try:
+                    example = fast_json.loads(line)
+
+                    # Zeilen stammen aus PatchNotesTrainer.save_example, alle Keys
+                    # sind vorhanden; fehlende Keys -> KeyError -> Zeile skippen
+                    timestamp = example['timestamp']
+                    if timestamp.endswith('+00:00'):
+                        too_old = timestamp < cutoff_str
+                    else:
+                        # Andere Offsets: sicher ueber datetime vergleichen
+                        too_old = datetime.fromisoformat(timestamp) < cutoff_date
+                    if too_old:
+                        break
+
+                    # Filter by project
+                    if project and example['project'] != project:
                         continue
+
+                    score = example['quality_score']
+                    if score >= 80:
+                        high_performers.append(example)
+                    elif score < 60:
+                        low_performers.append(example)
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    # Kaputte Zeile (JSONDecodeError ist ein ValueError)
+                    continue
         except Exception as e:
-            logger.error(f"Failed to analyze performance patterns: {e}")
+            logger.error("Failed to analyze performance patterns: %s", e)
             return {}
 
         # Analyze patterns
@@ -101,29 +191,32 @@ class PromptAutoTuner:
 
     def _get_common_words(self, texts: List[str], top_n: int = 10) -> List[Tuple[str, int]]:
         """Get most common words from texts."""
-        all_words = []
+        # Counter direkt fuettern statt eine Liste aller Woerter aufzubauen
+        counter = Counter()
         for text in texts:
             # Simple word extraction (lowercase, alphanumeric)
-            words = [w.lower() for w in text.split() if w.isalnum() and len(w) > 3]
-            all_words.extend(words)
-
-        counter = Counter(all_words)
+            counter.update(w.lower() for w in text.split() if w.isalnum() and len(w) > 3)
         return counter.most_common(top_n)
 
     def _analyze_structure(self, texts: List[str]) -> Dict:
         """Analyze structural patterns."""
-        bullet_counts = [text.count('•') + text.count('- ') for text in texts]
-        category_counts = [text.count('**🆕') + text.count('**🐛') + text.count('**⚡') for text in texts]
-        sub_bullet_counts = [text.count('  -') + text.count('  •') for text in texts]
+        # Ein Durchlauf ueber die Texte; str.count bleibt (C-Schleife, schneller
+        # als ein Regex-Scan mit Lookaheads ueber denselben Text)
+        bullets = categories = sub_bullets = 0
+        for text in texts:
+            bullets += text.count('•') + text.count('- ')
+            categories += text.count('**🆕') + text.count('**🐛') + text.count('**⚡')
+            sub_bullets += text.count('  -') + text.count('  •')
 
+        n = len(texts)
         return {
-            'avg_bullets': self._avg(bullet_counts),
-            'avg_categories': self._avg(category_counts),
-            'avg_sub_bullets': self._avg(sub_bullet_counts),
+            'avg_bullets': bullets / n if n else 0,
+            'avg_categories': categories / n if n else 0,
+            'avg_sub_bullets': sub_bullets / n if n else 0,
         }
 
-    def _generate_insights(self, patterns: Dict) -> List[str]:
-        """Generate actionable insights from patterns."""
+    def _generate_insights(self, patterns: Dict) -> List[Tuple[str, str]]:
+        """Generate actionable insights from patterns as (code, message) tuples."""
         insights = []
 
         high = patterns['high_performers']
@@ -131,19 +224,19 @@ class PromptAutoTuner:
 
         # Length insights
         if high['avg_length'] > low['avg_length'] * 1.3:
-            insights.append("✅ Longer, more detailed patch notes perform better")
+            insights.append((INSIGHT_LONGER_BETTER, "✅ Longer, more detailed patch notes perform better"))
         elif low['avg_length'] > high['avg_length'] * 1.3:
-            insights.append("✅ Concise patch notes perform better")
+            insights.append((INSIGHT_CONCISE_BETTER, "✅ Concise patch notes perform better"))
 
         # Structure insights
         high_struct = high['structure_patterns']
         low_struct = low['structure_patterns']
 
         if high_struct['avg_sub_bullets'] > low_struct['avg_sub_bullets'] * 1.5:
-            insights.append("✅ Using sub-bullets for details improves quality")
+            insights.append((INSIGHT_SUB_BULLETS, "✅ Using sub-bullets for details improves quality"))
 
         if high_struct['avg_bullets'] > low_struct['avg_bullets'] * 1.3:
-            insights.append("✅ More bullet points (more features) correlate with better scores")
+            insights.append((INSIGHT_MORE_BULLETS, "✅ More bullet points (more features) correlate with better scores"))
 
         return insights
 
@@ -164,24 +257,14 @@ class PromptAutoTuner:
         insights = patterns.get('insights', [])
 
         # Convert insights to prompt modifications
-        for insight in insights:
-            if "longer, more detailed" in insight.lower():
-                suggestions.append({
-                    'type': 'emphasis',
-                    'suggestion': 'Add instruction: "Provide comprehensive details for each feature (3-5 sentences or sub-bullets)"',
-                    'rationale': insight
-                })
-            elif "concise" in insight.lower():
-                suggestions.append({
-                    'type': 'emphasis',
-                    'suggestion': 'Add instruction: "Keep descriptions concise (1-2 sentences per feature)"',
-                    'rationale': insight
-                })
-            elif "sub-bullets" in insight.lower():
+        for code, message in insights:
+            mapped = _INSIGHT_SUGGESTIONS.get(code)
+            if mapped:
+                suggestion_type, suggestion = mapped
                 suggestions.append({
-                    'type': 'structure',
-                    'suggestion': 'Add instruction: "For complex features, use sub-bullets (  - ) to list specific details"',
-                    'rationale': insight
+                    'type': suggestion_type,
+                    'suggestion': suggestion,
+                    'rationale': message
                 })
 
         # Check A/B test results
@@ -217,7 +300,7 @@ class PromptAutoTuner:
         # Get original variant
         variant = self.ab_testing.variants.get(variant_id)
         if not variant:
-            logger.error(f"Variant {variant_id} not found")
+            logger.error("Variant %s not found", variant_id)
             return None
 
         # Apply suggestions to create new variant
@@ -250,10 +333,10 @@ class PromptAutoTuner:
             'suggestions_applied': suggestions,
         }
 
-        with open(self.tuning_log_file, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(tuning_log) + '\n')
+        with open(self.tuning_log_file, 'ab') as f:
+            f.write(fast_json.dumps(tuning_log) + b'\n')
 
-        logger.info(f"🎯 Auto-tuned variant {variant_id} → {new_variant_id}")
+        logger.info("🎯 Auto-tuned variant %s → %s", variant_id, new_variant_id)
         return new_variant_id
 
     def schedule_auto_tuning(self, project: Optional[str] = None,
@@ -272,7 +355,7 @@ class PromptAutoTuner:
         total_samples = sum(s['count'] for s in stats.values())
 
         if total_samples < min_samples:
-            logger.debug(f"Not enough samples for auto-tuning ({total_samples}/{min_samples})")
+            logger.debug("Not enough samples for auto-tuning (%d/%d)", total_samples, min_samples)
             return
 
         # Find best and worst performing variants
@@ -288,15 +371,15 @@ class PromptAutoTuner:
         score_gap = best_score - worst_score
 
         if score_gap < improvement_threshold:
-            logger.debug(f"Score gap too small for tuning ({score_gap:.1f} < {improvement_threshold})")
+            logger.debug("Score gap too small for tuning (%.1f < %s)", score_gap, improvement_threshold)
             return
 
         # Auto-tune the worst performing variant
-        logger.info(f"🎯 Auto-tuning triggered: score gap = {score_gap:.1f}")
+        logger.info("🎯 Auto-tuning triggered: score gap = %.1f", score_gap)
         new_variant_id = self.auto_tune_variant(worst_variant_id, project)
 
         if new_variant_id:
-            logger.info(f"✅ Created improved variant: {new_variant_id}")
+            logger.info("✅ Created improved variant: %s", new_variant_id)
 
 
 def get_prompt_auto_tuner(data_dir: Path, ab_testing, trainer) -> PromptAutoTuner:
@@ -0,0 +1,83 @@
+"""
+Persistenter Job-Store fuer den Self-Healing Coordinator
+
+Haelt offene Remediation-Jobs (wartend, freigabepflichtig, laufend) in einer
+SQLite-Tabelle, damit ein Bot-Neustart keine Jobs samt Retry-Historie
+verliert. Der Hot-State bleibt im Speicher; die Datenbank ist nur beim
+Start massgeblich. Abgeschlossene Jobs werden geloescht.
+"""
+
+import logging
+import sqlite3
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger('shadowops')
+
+
+class RemediationJobStore:
+    """
+    SQLite-Tabelle ``jobs`` mit event_id als Idempotenz-Key.
+
+    WAL + synchronous=NORMAL: ein Upsert kostet einen Append ins WAL statt
+    eines vollen fsync pro Schreibvorgang.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self._db: Optional[sqlite3.Connection] = None
+
+    def open(self) -> None:
+        """Oeffnet die Datenbank und legt das Schema an falls noetig."""
+        if self._db is not None:
+            return
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._db = sqlite3.connect(str(self.db_path))
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                event_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        self._db.commit()
+        logger.info("💾 Remediation-Job-Store geoeffnet: %s", self.db_path)
+
+    def close(self) -> None:
+        """Schliesst die Datenbankverbindung."""
+        if self._db:
+            self._db.close()
+            self._db = None
+
+    def save(self, event_id: str, status: str, payload: bytes) -> None:
+        """Legt einen Job an oder aktualisiert Status und Payload."""
+        self._db.execute(
+            """
+            INSERT INTO jobs (event_id, status, payload) VALUES (?, ?, ?)
+            ON CONFLICT(event_id) DO UPDATE SET
+                status = excluded.status,
+                payload = excluded.payload,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            (event_id, status, payload),
+        )
+        self._db.commit()
+
+    def delete(self, event_id: str) -> None:
+        """Entfernt einen abgeschlossenen Job."""
+        self._db.execute("DELETE FROM jobs WHERE event_id = ?", (event_id,))
+        self._db.commit()
+
+    def clear(self) -> None:
+        """Entfernt alle Jobs (Emergency-Stop)."""
+        self._db.execute("DELETE FROM jobs")
+        self._db.commit()
+
+    def load(self) -> List[Tuple[str, str, bytes]]:
+        """Alle offenen Jobs als (event_id, status, payload), aelteste zuerst."""
+        cursor = self._db.execute("SELECT event_id, status, payload FROM jobs ORDER BY rowid")
+        return cursor.fetchall()
@@ -7,30 +7,131 @@ Kleiner, abgesicherter HTTP-Fetcher mit Allowlist:
 - Loggt alle Zugriffe (Info/Errors) über Discord-Logger (ai_learning).
 """
 
-import json
+import asyncio
 import logging
-from typing import Optional, Dict, Any
+import random
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+from urllib.parse import urlsplit
 
 import httpx
 
+try:  # pragma: no cover - Import-Pfad haengt von pythonpath ab
+    from utils import fast_json
+except ImportError:  # pragma: no cover
+    from src.utils import fast_json  # type: ignore[no-redef]
+
 logger = logging.getLogger("shadowops.research")
 
+# Ab dieser Groesse wird JSON in einem Worker-Thread geparst, damit grosse
+# PyPI/GitHub-Antworten den Event-Loop (Discord-Handler) nicht blockieren.
+JSON_THREAD_THRESHOLD = 32_768
+
+# Max. gleichzeitige Fetches pro Host — Batch-Scans sollen GitHub/PyPI nicht
+# in Rate-Limits treiben.
+HOST_CONCURRENCY_LIMIT = 4
+
+# Retry bei Rate-Limit/Serverfehlern: Retry-After respektieren, sonst
+# exponentieller Backoff mit Jitter (gedeckelt).
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRIES = 3
+MAX_BACKOFF_SECONDS = 30.0
+
 
 class ResearchFetcher:
     def __init__(self, config=None, discord_logger=None):
         self.config = config
         self.discord_logger = discord_logger
-        self.allowed_prefixes = [
+        self.allowed_prefixes = (
             "https://pypi.org/pypi/",
             "https://registry.npmjs.org/",
             "https://api.github.com/repos/",
             "https://raw.githubusercontent.com/",
-        ]
+        )
         self.max_bytes = 200_000
         self.timeout = 12
+        # Ein gepoolter Client fuer alle Fetches (Keep-Alive statt TLS-Handshake pro Call)
+        self._client: Optional[httpx.AsyncClient] = None
+        # LRU+TTL-Cache: (url, expect_json) -> (Zeitpunkt, Ergebnis)
+        self._cache: "OrderedDict[Tuple[str, bool], Tuple[float, Any]]" = OrderedDict()
+        self._cache_ttl = 300
+        self._cache_max = 256
+        self._host_sems: Dict[str, asyncio.Semaphore] = {}
+        self._inflight: Dict[Tuple[str, bool], asyncio.Task] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Lazy erzeugter, wiederverwendeter HTTP-Client."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_keepalive_connections=8, max_connections=16),
+            )
+        return self._client
+
+    async def aclose(self):
+        """Schliesst den gepoolten Client (beim Bot-Shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        """Semaphore fuer einen Host (begrenzt parallele Fetches pro Origin)."""
+        sem = self._host_sems.get(host)
+        if sem is None:
+            sem = self._host_sems[host] = asyncio.Semaphore(HOST_CONCURRENCY_LIMIT)
+        return sem
+
+    @staticmethod
+    def _retry_delay(resp: httpx.Response, attempt: int) -> float:
+        """Wartezeit vor dem naechsten Versuch (Retry-After oder Backoff)."""
+        retry_after = resp.headers.get("retry-after", "")
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            delay = 2 ** attempt + random.random()
+        return min(max(delay, 0.0), MAX_BACKOFF_SECONDS)
+
+    async def _read_body(self, resp: httpx.Response, url: str) -> Optional[bytearray]:
+        """Liest den Body gestreamt; None wenn er max_bytes ueberschreitet."""
+        declared = resp.headers.get("content-length", "")
+        if declared.isdigit() and int(declared) > self.max_bytes:
+            self._log_too_large(int(declared), url)
+            return None
+
+        buf = bytearray()
+        async for chunk in resp.aiter_bytes():
+            buf.extend(chunk)
+            if len(buf) > self.max_bytes:
+                self._log_too_large(len(buf), url)
+                return None
+        return buf
+
+    def _cache_get(self, key: Tuple[str, bool]) -> Optional[Any]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self._cache_ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return value
+
+    def _cache_put(self, key: Tuple[str, bool], value: Any):
+        self._cache[key] = (time.monotonic(), value)
+        self._cache.move_to_end(key)
+        if len(self._cache) > self._cache_max:
+            self._cache.popitem(last=False)
+
+    def invalidate(self, url: str):
+        """Entfernt alle gecachten Varianten (Text/JSON) einer URL."""
+        self._cache.pop((url, False), None)
+        self._cache.pop((url, True), None)
 
     def _is_allowed(self, url: str) -> bool:
-        return any(url.startswith(prefix) for prefix in self.allowed_prefixes)
+        # str.startswith akzeptiert ein Tuple — ein C-Aufruf statt any()-Generator
+        return url.startswith(self.allowed_prefixes)
 
     async def fetch(self, url: str, reason: str = "", expect_json: bool = False) -> Optional[Any]:
         """
@@ -44,28 +145,62 @@ class ResearchFetcher:
             self._log_discord(f"🚫 {msg}", severity="warning")
             return None
 
+        key = (url, expect_json)
+        cached = self._cache_get(key)
+        if cached is not None:
+            logger.debug(f"🎯 Cache hit {url}")
+            return cached
+
+        # Gleichzeitige identische Fetches teilen sich einen Request. shield():
+        # bricht ein Aufrufer ab, laeuft der Fetch fuer die anderen weiter.
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_uncached(url, reason, expect_json, key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _fetch_uncached(self, url: str, reason: str, expect_json: bool,
+                              key: Tuple[str, bool]) -> Optional[Any]:
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                resp = await client.get(url)
+            # Streamen statt komplett laden: Uebergrosse Antworten werden nach
+            # Content-Length bzw. dem ersten Chunk ueber dem Limit abgebrochen.
+            # Backoff-Sleeps halten die Host-Semaphore bewusst (drosselt den Host).
+            async with self._host_semaphore(urlsplit(url).netloc):
+                for attempt in range(MAX_RETRIES + 1):
+                    async with self._get_client().stream("GET", url) as resp:
+                        if resp.status_code not in RETRY_STATUS_CODES or attempt == MAX_RETRIES:
+                            buf = await self._read_body(resp, url)
+                            break
+                        delay = self._retry_delay(resp, attempt)
+                    logger.info(f"⏳ HTTP {resp.status_code} von {url}, Retry in {delay:.1f}s")
+                    await asyncio.sleep(delay)
 
-            content_len = len(resp.content or b"")
-            if content_len > self.max_bytes:
-                self._log_discord(f"🚫 Fetch too large ({content_len} bytes): {url}", severity="warning")
+            if buf is None:
                 return None
 
+            content_len = len(buf)
             if expect_json:
-                data = resp.json()
+                if content_len > JSON_THREAD_THRESHOLD:
+                    data = await asyncio.to_thread(fast_json.loads, buf)
+                else:
+                    data = fast_json.loads(buf)
                 self._log_discord(f"🌐 Fetch OK (JSON) {url} ({content_len} bytes) {reason}", severity="info")
+                self._cache_put(key, data)
                 return data
             else:
-                text = resp.text
+                text = buf.decode("utf-8", errors="ignore")
                 self._log_discord(f"🌐 Fetch OK {url} ({content_len} bytes) {reason}", severity="info")
+                self._cache_put(key, text)
                 return text
         except Exception as e:
             self._log_discord(f"❌ Fetch failed {url}: {e}", severity="error")
             logger.debug(f"Fetch error {url}: {e}", exc_info=True)
             return None
 
+    def _log_too_large(self, size: int, url: str):
+        self._log_discord(f"🚫 Fetch too large ({size}+ bytes): {url}", severity="warning")
+
     def _log_discord(self, message: str, severity: str = "info"):
         if self.discord_logger:
             try:
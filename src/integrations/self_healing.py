@@ -4,9 +4,14 @@ Manages automatic remediation attempts with AI-powered retry logic and circuit b
 """
 
 import asyncio
+import hashlib
 import logging
+import random
+import sqlite3
+import time
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 import json
@@ -18,9 +23,91 @@ from integrations.backup_manager import BackupManager, BackupConfig
 from integrations.impact_analyzer import ImpactAnalyzer
 from integrations.service_manager import ServiceManager
 from integrations.fixers import TrivyFixer, CrowdSecFixer, Fail2banFixer, AideFixer
+from integrations.event_watcher import SecurityEvent
+from integrations.remediation_job_store import RemediationJobStore
+
+try:
+    from utils import fast_json
+except ImportError:
+    from src.utils import fast_json  # type: ignore[no-redef]
 
 logger = logging.getLogger(__name__)
 
+# Retry-Backoff: Basis * 2**(Versuch-1), gedeckelt, +/- Jitter damit
+# gleichzeitig fehlschlagende Jobs nicht im Gleichschritt zurueckkommen
+RETRY_DELAY_SECONDS = 5
+RETRY_MAX_DELAY_SECONDS = 300
+RETRY_JITTER = 0.1
+
+# Max. Schlafdauer am Stueck solange der Circuit Breaker offen ist
+CIRCUIT_BREAKER_POLL_SECONDS = 60
+
+# Parallele Remediation-Worker (auto_remediation.concurrency) — ueberlappt
+# AI-Calls und Fix-Wartezeiten statt alles seriell abzuarbeiten
+DEFAULT_WORKER_CONCURRENCY = 4
+
+# Harte Obergrenzen gegen haengende Backends (auto_remediation.ai_timeout_seconds /
+# fix_timeout_seconds). Bewusst ueber den inneren Timeouts (CLI 300s thinking +
+# Fallback, CommandExecutor 300s pro Befehl) — greifen nur bei echten Hängern
+DEFAULT_AI_TIMEOUT_SECONDS = 720
+DEFAULT_FIX_TIMEOUT_SECONDS = 1800
+
+# Offene Jobs ueberleben Neustarts (auto_remediation.job_store_path, leer = aus)
+DEFAULT_JOB_STORE_PATH = 'data/self_healing_jobs.db'
+
+# Bulkhead: max. gleichzeitige Jobs pro Event-Quelle
+# (auto_remediation.source_concurrency), damit eine Quelle nicht alle Worker belegt
+DEFAULT_SOURCE_CONCURRENCY = 2
+
+# Fertige AI-Strategien fuer identischen Kontext (Event ohne ID/Zeitstempel +
+# bisherige Versuche) werden kurz gecacht — Event-Bursts kosten einen AI-Call
+STRATEGY_CACHE_TTL_SECONDS = 300
+STRATEGY_CACHE_MAX_ENTRIES = 1024
+
+# Quellen deren Fallback-Strategie selbst das 85%-Confidence-Gate besteht:
+# der erste Versuch laeuft ohne AI, erst ein Retry fragt die AI
+# (auto_remediation.fallback_first_attempt). fail2ban (0.8) bleibt draussen,
+# sonst wuerde der erste Versuch am Gate scheitern
+FALLBACK_FIRST_SOURCES = frozenset({'crowdsec'})
+
+# Severities die ohne ApprovalModeManager eine Freigabe brauchen
+# (None = immer Freigabe)
+_APPROVAL_SEVERITIES: Dict[ApprovalMode, Optional[frozenset]] = {
+    ApprovalMode.PARANOID: None,
+    ApprovalMode.BALANCED: frozenset({'CRITICAL', 'HIGH'}),
+    ApprovalMode.AGGRESSIVE: frozenset({'CRITICAL'}),
+}
+
+# Fallback-Strategien ohne AI — einmal gebaut, steps als Tupel damit die
+# geteilten Dicts nicht versehentlich veraendert werden (Aufrufer lesen nur)
+_FALLBACK_STRATEGIES: Dict[str, Dict] = {
+    'trivy': {
+        'description': 'Update vulnerable package to fixed version',
+        'confidence': 0.7,
+        'steps': ('Identify package', 'Update to fixed version', 'Rebuild image', 'Redeploy'),
+    },
+    'crowdsec': {
+        'description': 'Ban IP and update firewall rules',
+        'confidence': 0.9,
+        'steps': ('Verify threat', 'Add permanent ban', 'Update firewall'),
+    },
+    'fail2ban': {
+        'description': 'Verify ban and extend duration',
+        'confidence': 0.8,
+        'steps': ('Check ban status', 'Extend ban duration'),
+    },
+    'aide': {
+        'description': 'Restore file from backup',
+        'confidence': 0.6,
+        'steps': ('Verify change', 'Check backup', 'Restore file', 'Update AIDE DB'),
+    },
+}
+_MANUAL_REVIEW_STRATEGY: Dict = {
+    'description': 'Manual review required',
+    'confidence': 0.3,
+    'steps': ('Escalate to administrator',),
+}
+
 
 class ApprovalView(discord.ui.View):
     """Discord UI View for approval buttons"""
@@ -84,6 +171,63 @@ class RemediationJob:
     current_strategy: Optional[str] = None
     approval_required: bool = False
     approval_message_id: Optional[int] = None
+    next_retry_at: Optional[datetime] = None
+    # event.to_dict() einmal pro Job (Events aendern sich nicht zwischen Retries)
+    event_dict: Optional[Dict] = field(default=None, repr=False)
+
+    def get_event_dict(self) -> Dict:
+        if self.event_dict is None:
+            self.event_dict = self.event.to_dict()
+        return self.event_dict
+
+    def to_payload(self) -> bytes:
+        """Serialisiert den Job fuer den RemediationJobStore."""
+        return fast_json.dumps({
+            'event': self.get_event_dict(),
+            'created_at': self.created_at.isoformat(),
+            'attempts': [
+                {
+                    'attempt_number': attempt.attempt_number,
+                    'timestamp': attempt.timestamp.isoformat(),
+                    'strategy': attempt.strategy,
+                    'result': attempt.result,
+                    'error_message': attempt.error_message,
+                    'ai_confidence': attempt.ai_confidence,
+                }
+                for attempt in self.attempts
+            ],
+            'max_attempts': self.max_attempts,
+            'current_strategy': self.current_strategy,
+            'approval_required': self.approval_required,
+        })
+
+    @classmethod
+    def from_payload(cls, payload: bytes) -> 'RemediationJob':
+        """Baut einen Job aus ``to_payload()`` wieder auf."""
+        data = fast_json.loads(payload)
+        event_data = dict(data['event'])
+        event_data['timestamp'] = datetime.fromisoformat(event_data['timestamp'])
+        event = SecurityEvent(**event_data)
+        attempts = [
+            RemediationAttempt(
+                event_id=event.event_id,
+                attempt_number=attempt['attempt_number'],
+                timestamp=datetime.fromisoformat(attempt['timestamp']),
+                strategy=attempt['strategy'],
+                result=attempt['result'],
+                error_message=attempt['error_message'],
+                ai_confidence=attempt['ai_confidence'],
+            )
+            for attempt in data['attempts']
+        ]
+        return cls(
+            event=event,
+            created_at=datetime.fromisoformat(data['created_at']),
+            attempts=attempts,
+            max_attempts=data['max_attempts'],
+            current_strategy=data['current_strategy'],
+            approval_required=data['approval_required'],
+        )
 
 
 class CircuitBreaker:
@@ -91,28 +235,55 @@ class CircuitBreaker:
     Circuit Breaker pattern to prevent infinite retry loops
 
     States: CLOSED (normal), OPEN (too many failures), HALF_OPEN (testing recovery)
+
+    HALF_OPEN laesst genau einen Probe-Job gleichzeitig durch und schliesst
+    erst nach ``success_threshold`` erfolgreichen Probes in Folge. Kein Lock
+    noetig: can_attempt/record_* laufen synchron im Event-Loop.
     """
 
-    def __init__(self, failure_threshold: int = 5, timeout_seconds: int = 3600):
+    def __init__(self, failure_threshold: int = 5, timeout_seconds: int = 3600, success_threshold: int = 2):
         self.failure_threshold = failure_threshold
         self.timeout_seconds = timeout_seconds
+        self.success_threshold = max(1, success_threshold)
         self.failure_count = 0
-        self.last_failure_time: Optional[datetime] = None
+        self._probe_in_flight = False
+        self._probe_successes = 0
+        # Monotonic fuer die Timeout-Rechnung (wird pro Job geprueft),
+        # Wall-Clock nur fuer die Anzeige in get_status()
+        self._last_failure_monotonic: Optional[float] = None
         self.state = 'CLOSED'  # CLOSED, OPEN, HALF_OPEN
 
+    @property
+    def last_failure_time(self) -> Optional[datetime]:
+        """Wall-Clock-Zeit des letzten Fehlers (nur fuer Anzeige)."""
+        if self._last_failure_monotonic is None:
+            return None
+        return datetime.now() - timedelta(seconds=time.monotonic() - self._last_failure_monotonic)
+
     def record_success(self):
         """Record successful operation"""
+        if self.state == 'HALF_OPEN':
+            self._probe_in_flight = False
+            self._probe_successes += 1
+            if self._probe_successes < self.success_threshold:
+                return
+            logger.info("🟢 Circuit Breaker CLOSED after %s successful probes", self._probe_successes)
         self.failure_count = 0
+        self._probe_successes = 0
         self.state = 'CLOSED'
 
     def record_failure(self):
         """Record failed operation"""
         self.failure_count += 1
-        self.last_failure_time = datetime.now()
+        self._last_failure_monotonic = time.monotonic()
+        self._probe_in_flight = False
+        self._probe_successes = 0
 
+        # Fehlgeschlagene Probe oeffnet sofort wieder (failure_count liegt
+        # im HALF_OPEN noch ueber dem Threshold)
         if self.failure_count >= self.failure_threshold:
             self.state = 'OPEN'
-            logger.warning(f"🔴 Circuit Breaker OPEN: {self.failure_count} failures")
+            logger.warning("🔴 Circuit Breaker OPEN: %s failures", self.failure_count)
 
     def can_attempt(self) -> bool:
         """Check if operation can be attempted"""
@@ -121,18 +292,29 @@ class CircuitBreaker:
 
         if self.state == 'OPEN':
             # Check if timeout expired
-            if self.last_failure_time:
-                elapsed = (datetime.now() - self.last_failure_time).total_seconds()
+            if self._last_failure_monotonic is not None:
+                elapsed = time.monotonic() - self._last_failure_monotonic
                 if elapsed > self.timeout_seconds:
                     self.state = 'HALF_OPEN'
                     logger.info("🟡 Circuit Breaker HALF_OPEN: Testing recovery")
+                    self._probe_in_flight = True
                     return True
 
             return False
 
-        # HALF_OPEN: Allow one attempt
+        # HALF_OPEN: nur eine Probe gleichzeitig
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
         return True
 
+    def time_until_retry(self) -> float:
+        """Sekunden bis ein offener Breaker wieder einen Versuch erlaubt."""
+        if self.state != 'OPEN' or self._last_failure_monotonic is None:
+            return 0.0
+        elapsed = time.monotonic() - self._last_failure_monotonic
+        return max(0.0, self.timeout_seconds - elapsed)
+
     def get_status(self) -> Dict:
         """Get circuit breaker status"""
         return {
@@ -162,25 +344,47 @@ class SelfHealingCoordinator:
         # Approval mode - Config ist ein Objekt, kein Dict
         approval_mode_str = config.auto_remediation.get('approval_mode', 'paranoid')
         self.approval_mode = ApprovalMode(approval_mode_str)
+        self._severity_needs_approval = _APPROVAL_SEVERITIES[self.approval_mode]
 
         # Approval Mode Manager (will be set during initialization with context manager)
         self.approval_manager = None
-        logger.info(f"🎯 Approval Mode: {self.approval_mode.value}")
-
-        # Job queue
-        self.job_queue: List[RemediationJob] = []
+        logger.info("🎯 Approval Mode: %s", self.approval_mode.value)
+
+        # Job-Queue indexiert statt Listen-Scans: freigegebene Jobs als
+        # asyncio.Queue von event_ids (weckt den Worker ohne Polling),
+        # wartende Freigaben und alle wartenden Jobs als Dicts
+        self._pending: asyncio.Queue = asyncio.Queue()
+        self._awaiting_approval: Dict[str, RemediationJob] = {}
+        self._jobs: Dict[str, RemediationJob] = {}
         self.active_jobs: Dict[str, RemediationJob] = {}
-        self.completed_jobs: List[RemediationJob] = []
+        # Ringpuffer: append verdraengt den aeltesten Job in O(1)
         self.max_completed_history = 500
-
-        # Circuit breaker
-        self.circuit_breaker = CircuitBreaker(
-            failure_threshold=config.auto_remediation.get('circuit_breaker_threshold', 5),
-            timeout_seconds=config.auto_remediation.get('circuit_breaker_timeout', 3600)
-        )
-
-        # Worker task
-        self.worker_task: Optional[asyncio.Task] = None
+        self.completed_jobs: Deque[RemediationJob] = deque(maxlen=self.max_completed_history)
+
+        # Circuit Breaker pro Event-Quelle: eine fehlschlagende Quelle (z.B.
+        # trivy) sperrt nur sich selbst, nicht crowdsec/fail2ban
+        self._breaker_threshold = config.auto_remediation.get('circuit_breaker_threshold', 5)
+        self._breaker_timeout = config.auto_remediation.get('circuit_breaker_timeout', 3600)
+        self._breaker_success_threshold = config.auto_remediation.get('circuit_breaker_success_threshold', 2)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+        # Worker-Pool (teilen sich die _pending-Queue)
+        self.worker_count = max(1, int(config.auto_remediation.get('concurrency', DEFAULT_WORKER_CONCURRENCY)))
+        # Pro Quelle laufende Jobs + geparkte event_ids ueber dem Limit
+        self.source_concurrency = max(1, int(config.auto_remediation.get('source_concurrency', DEFAULT_SOURCE_CONCURRENCY)))
+        self._source_active: Dict[str, int] = {}
+        self._source_parked: Dict[str, Deque[str]] = {}
+
+        # Timeouts: ein haengender Call belegt sonst dauerhaft einen Worker
+        self.ai_timeout = float(config.auto_remediation.get('ai_timeout_seconds', DEFAULT_AI_TIMEOUT_SECONDS))
+        self.fix_timeout = float(config.auto_remediation.get('fix_timeout_seconds', DEFAULT_FIX_TIMEOUT_SECONDS))
+        self.fallback_first_attempt = bool(config.auto_remediation.get('fallback_first_attempt', True))
+
+        # Persistenz offener Jobs (wird in start() geoeffnet und wiederhergestellt)
+        self.job_store_path = config.auto_remediation.get('job_store_path', DEFAULT_JOB_STORE_PATH)
+        self._job_store: Optional[RemediationJobStore] = None
+        self._restore_tasks: List[asyncio.Task] = []
+        self.worker_tasks: List[asyncio.Task] = []
         self.running = False
 
         # Statistics
@@ -196,6 +400,10 @@ class SelfHealingCoordinator:
         # AI service (will be set during initialization)
         self.ai_service = None
 
+        # Strategie-Dedup: laufende AI-Calls teilen, fertige kurz cachen
+        self._strategy_inflight: Dict[str, asyncio.Task] = {}
+        self._strategy_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
         # Infrastructure components (will be initialized)
         self.command_executor = None
         self.backup_manager = None
@@ -208,6 +416,14 @@ class SelfHealingCoordinator:
         self.fail2ban_fixer = None
         self.aide_fixer = None
 
+        # Dispatch event.source -> Fix-Handler (neue Quellen hier registrieren)
+        self._fix_handlers: Dict[str, Callable[['SecurityEvent', Dict], Awaitable[Dict]]] = {
+            'trivy': self._fix_trivy,
+            'crowdsec': self._fix_crowdsec,
+            'fail2ban': self._fix_fail2ban,
+            'aide': self._fix_aide,
+        }
+
     async def initialize(self, ai_service):
         """Initialize with AI service and context manager"""
         self.ai_service = ai_service
@@ -243,8 +459,8 @@ class SelfHealingCoordinator:
         self.aide_fixer = AideFixer(self.command_executor, self.backup_manager)
 
         logger.info("✅ Self-Healing Coordinator initialized with all components")
-        logger.info(f"   Dry-run mode: {executor_config.dry_run}")
-        logger.info(f"   Backup retention: {backup_config.retention_days} days")
+        logger.info("   Dry-run mode: %s", executor_config.dry_run)
+        logger.info("   Backup retention: %s days", backup_config.retention_days)
 
     async def start(self):
         """Start self-healing worker"""
@@ -253,23 +469,86 @@ class SelfHealingCoordinator:
             return
 
         self.running = True
-        self.worker_task = asyncio.create_task(self._worker_loop())
-        logger.info("✅ Self-Healing Worker started")
+        restored = self._open_job_store()
+        self.worker_tasks = [
+            asyncio.create_task(self._worker_loop()) for _ in range(self.worker_count)
+        ]
+        logger.info("✅ Self-Healing Worker started (%s workers)", self.worker_count)
+
+        # Alte Approval-Buttons sind nach dem Neustart tot -> neu anfragen
+        self._restore_tasks = [
+            asyncio.create_task(self._request_approval(job))
+            for job in restored if job.approval_required
+        ]
 
     async def stop(self):
         """Stop self-healing worker"""
         logger.info("🛑 Stopping Self-Healing Worker...")
         self.running = False
 
-        if self.worker_task:
-            self.worker_task.cancel()
-            try:
-                await self.worker_task
-            except asyncio.CancelledError:
-                pass
+        for task in self.worker_tasks + self._restore_tasks:
+            task.cancel()
+        await asyncio.gather(*self.worker_tasks, *self._restore_tasks, return_exceptions=True)
+        self.worker_tasks = []
+        self._restore_tasks = []
+
+        # Laufende Jobs bleiben im Store und starten beim naechsten start() neu
+        if self._job_store:
+            self._job_store.close()
+            self._job_store = None
 
         logger.info("✅ Self-Healing Worker stopped")
 
+    def _open_job_store(self) -> List[RemediationJob]:
+        """Oeffnet den Job-Store und reiht dort gespeicherte offene Jobs wieder ein."""
+        if not self.job_store_path or self._job_store:
+            return []
+        store = RemediationJobStore(self.job_store_path)
+        try:
+            store.open()
+            rows = store.load()
+        except sqlite3.Error as e:
+            logger.error("❌ Job-Store nicht verfuegbar, Jobs nur im Speicher: %s", e)
+            store.close()
+            return []
+        self._job_store = store
+
+        restored = []
+        for event_id, _status, payload in rows:
+            try:
+                job = RemediationJob.from_payload(payload)
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning("⚠️ Verwerfe unlesbaren Job %s aus dem Store: %s", event_id, e)
+                self._forget_job(event_id)
+                continue
+            if event_id in self._jobs or event_id in self.active_jobs:
+                continue
+            job.status = 'requires_approval' if job.approval_required else 'pending'
+            self._enqueue_job(job)
+            restored.append(job)
+
+        if restored:
+            logger.info("♻️ %s offene Remediation-Jobs aus dem Store wiederhergestellt", len(restored))
+        return restored
+
+    def _persist_job(self, job: RemediationJob):
+        """Schreibt den offenen Job in den Store (no-op ohne Store)."""
+        if self._job_store is None:
+            return
+        try:
+            self._job_store.save(job.event.event_id, job.status, job.to_payload())
+        except sqlite3.Error as e:
+            logger.error("❌ Job %s nicht persistiert: %s", job.event.event_id, e)
+
+    def _forget_job(self, event_id: str):
+        """Entfernt einen abgeschlossenen Job aus dem Store."""
+        if self._job_store is None:
+            return
+        try:
+            self._job_store.delete(event_id)
+        except sqlite3.Error as e:
+            logger.error("❌ Job %s nicht aus dem Store entfernt: %s", event_id, e)
+
     async def handle_event(self, event: 'SecurityEvent'):
         """
         Handle new security event
@@ -277,7 +556,7 @@ class SelfHealingCoordinator:
         Args:
             event: Security event from Event Watcher
         """
-        logger.info(f"🔧 Self-Healing: Processing {event.severity} event from {event.source}")
+        logger.info("🔧 Self-Healing: Processing %s event from %s", event.severity, event.source)
 
         # Check if approval required based on mode
         approval_required = self._requires_approval(event)
@@ -288,15 +567,15 @@ class SelfHealingCoordinator:
             approval_required=approval_required
         )
 
-        self.job_queue.append(job)
+        self._enqueue_job(job)
         self.stats['total_jobs'] += 1
 
         if approval_required:
             self.stats['requires_approval'] += 1
-            logger.info(f"✋ Approval required for {event.severity} event")
+            logger.info("✋ Approval required for %s event", event.severity)
             await self._request_approval(job)
         else:
-            logger.info(f"✅ Auto-fix approved for {event.severity} event")
+            logger.info("✅ Auto-fix approved for %s event", event.severity)
 
     async def _worker_loop(self):
         """Main worker loop - processes job queue"""
@@ -304,42 +583,78 @@ class SelfHealingCoordinator:
 
         while self.running:
             try:
-                # Process pending jobs
-                await self._process_queue()
-
-                # Check circuit breaker status
-                if self.circuit_breaker.state == 'OPEN':
-                    logger.warning("⏸️ Circuit breaker OPEN, pausing remediation")
-                    await asyncio.sleep(60)  # Wait 1 minute before checking again
-                    continue
-
-                # Wait before next iteration
-                await asyncio.sleep(5)
+                await self._process_next_job()
 
             except Exception as e:
-                logger.error(f"❌ Worker loop error: {e}", exc_info=True)
+                logger.error("❌ Worker loop error: %s", e, exc_info=True)
                 await asyncio.sleep(10)
 
-    async def _process_queue(self):
-        """Process pending jobs in queue"""
-        if not self.job_queue:
-            return
+    def _enqueue_job(self, job: RemediationJob, delay: float = 0.0):
+        """
+        Reiht einen Job ein — wartet auf Freigabe oder ist direkt ausfuehrbar.
 
-        # Get next pending job
-        for job in self.job_queue[:]:
-            if job.status == 'pending' and not job.approval_required:
-                # Check circuit breaker
-                if not self.circuit_breaker.can_attempt():
-                    logger.warning(f"⏸️ Circuit breaker preventing job {job.event.event_id}")
-                    continue
+        Mit ``delay`` (Retries) zaehlt der Job sofort als wartend, der Worker
+        bekommt die event_id aber erst nach Ablauf der Wartezeit.
+        """
+        event_id = job.event.event_id
+        self._jobs[event_id] = job
+        self._persist_job(job)
+        if job.approval_required:
+            self._awaiting_approval[event_id] = job
+        elif delay > 0:
+            asyncio.get_running_loop().call_later(delay, self._pending.put_nowait, event_id)
+        else:
+            self._pending.put_nowait(event_id)
+
+    def _breaker_for(self, source: str) -> CircuitBreaker:
+        """Circuit Breaker der Event-Quelle (wird beim ersten Zugriff angelegt)."""
+        breaker = self._breakers.get(source)
+        if breaker is None:
+            breaker = self._breakers[source] = CircuitBreaker(
+                failure_threshold=self._breaker_threshold,
+                timeout_seconds=self._breaker_timeout,
+                success_threshold=self._breaker_success_threshold,
+            )
+        return breaker
+
+    async def _process_next_job(self):
+        """Wartet auf den naechsten freigegebenen Job und fuehrt ihn aus."""
+        event_id = await self._pending.get()
 
-                # Move to active
-                self.job_queue.remove(job)
-                self.active_jobs[job.event.event_id] = job
-                job.status = 'in_progress'
+        job = self._jobs.get(event_id)
+        if job is None:
+            return  # zwischenzeitlich entfernt (z.B. Emergency-Stop)
+        source = job.event.source
 
-                # Process job
-                await self._execute_remediation(job)
+        # Quelle am Limit: parken, ein fertiger Job derselben Quelle reiht ihn wieder ein
+        if self._source_active.get(source, 0) >= self.source_concurrency:
+            self._source_parked.setdefault(source, deque()).append(event_id)
+            return
+
+        # Offener Breaker der Quelle: Job spaeter erneut einreihen, der Worker
+        # bleibt frei fuer Jobs anderer Quellen. Zuletzt pruefen — ein
+        # HALF_OPEN-Breaker vergibt hier seinen einzigen Probe-Slot
+        breaker = self._breaker_for(source)
+        if not breaker.can_attempt():
+            wait = max(min(breaker.time_until_retry(), CIRCUIT_BREAKER_POLL_SECONDS), 1.0)
+            logger.warning("⏸️ Circuit breaker OPEN for %s, deferring %s by %.0fs", source, event_id, wait)
+            asyncio.get_running_loop().call_later(wait, self._pending.put_nowait, event_id)
+            return
+
+        del self._jobs[event_id]
+        self._source_active[source] = self._source_active.get(source, 0) + 1
+        try:
+            # Move to active
+            self.active_jobs[event_id] = job
+            job.status = 'in_progress'
+
+            # Process job
+            await self._execute_remediation(job)
+        finally:
+            self._source_active[source] -= 1
+            parked = self._source_parked.get(source)
+            if parked:
+                self._pending.put_nowait(parked.popleft())
 
     async def _execute_remediation(self, job: RemediationJob):
         """
@@ -351,21 +666,21 @@ class SelfHealingCoordinator:
         event = job.event
         attempt_num = len(job.attempts) + 1
 
-        logger.info(f"🔧 Executing remediation attempt {attempt_num}/{job.max_attempts} for {event.event_id}")
+        logger.info("🔧 Executing remediation attempt %s/%s for %s", attempt_num, job.max_attempts, event.event_id)
 
         try:
             # Generate fix strategy using AI
             strategy = await self._generate_fix_strategy(job)
 
             if not strategy:
-                logger.error(f"❌ Failed to generate fix strategy for {event.event_id}")
+                logger.error("❌ Failed to generate fix strategy for %s", event.event_id)
                 await self._handle_failure(job, "Strategy generation failed")
                 return
 
             # CONFIDENCE-PRÜFUNG: Verhindere unsichere Fixes
             confidence = strategy.get('confidence', 0)
             if confidence < 0.85:
-                logger.error(f"🚨 ABGEBROCHEN: Confidence {confidence:.0%} < 85% - zu riskant für automatische Ausführung!")
+                logger.error("🚨 ABGEBROCHEN: Confidence %.0f%% < 85%% - zu riskant für automatische Ausführung!", confidence * 100)
                 await self._handle_failure(job, f"Confidence zu niedrig ({confidence:.0%} < 85%). Manuelle Prüfung erforderlich.")
                 return
 
@@ -394,7 +709,7 @@ class SelfHealingCoordinator:
                 await self._handle_failure(job, result.get('error', 'Unknown error'))
 
         except Exception as e:
-            logger.error(f"❌ Remediation execution error: {e}", exc_info=True)
+            logger.error("❌ Remediation execution error: %s", e, exc_info=True)
             await self._handle_failure(job, str(e))
 
     async def _generate_fix_strategy(self, job: RemediationJob, streaming_state: Optional[Dict] = None) -> Optional[Dict]:
@@ -406,9 +721,15 @@ class SelfHealingCoordinator:
         """
         event = job.event
 
+        # Erster stiller Versuch fuer Quellen mit sicherer Standard-Strategie:
+        # kein AI-Roundtrip, erst ein Retry eskaliert zur AI
+        if (streaming_state is None and self.fallback_first_attempt
+                and not job.attempts and event.source in FALLBACK_FIRST_SOURCES):
+            return self._get_fallback_strategy(event)
+
         # Build context with previous attempts
         context = {
-            'event': event.to_dict(),
+            'event': job.get_event_dict(),
             'previous_attempts': [
                 {
                     'strategy': attempt.strategy,
@@ -425,48 +746,76 @@ class SelfHealingCoordinator:
 
         # Request AI analysis
         if self.ai_service:
-            try:
-                strategy = await self.ai_service.generate_fix_strategy(context)
-                return strategy
-            except Exception as e:
-                logger.error(f"AI strategy generation failed: {e}")
-                return None
+            # Live-Updates brauchen ihren eigenen Call (streaming_state wird
+            # waehrenddessen befuellt) — nur der stille Pfad wird geteilt
+            if streaming_state is not None:
+                return await self._request_ai_strategy(context)
+
+            key = self._strategy_key(context)
+            cached = self._strategy_cache_get(key)
+            if cached is not None:
+                logger.debug("🎯 Strategy cache hit for %s", event.event_id)
+                return cached
+
+            # Identischer Kontext im Burst -> ein AI-Call. shield(): bricht ein
+            # Wartender ab, laeuft der Call fuer die anderen weiter.
+            task = self._strategy_inflight.get(key)
+            if task is None:
+                task = asyncio.create_task(self._request_ai_strategy(context, key))
+                self._strategy_inflight[key] = task
+                task.add_done_callback(lambda _t: self._strategy_inflight.pop(key, None))
+            return await asyncio.shield(task)
 
         # Fallback: Use predefined strategies
         return self._get_fallback_strategy(event)
 
-    def _get_fallback_strategy(self, event: 'SecurityEvent') -> Dict:
-        """Fallback strategy if AI is unavailable"""
-        if event.source == 'trivy':
-            return {
-                'description': 'Update vulnerable package to fixed version',
-                'confidence': 0.7,
-                'steps': ['Identify package', 'Update to fixed version', 'Rebuild image', 'Redeploy']
-            }
-        elif event.source == 'crowdsec':
-            return {
-                'description': 'Ban IP and update firewall rules',
-                'confidence': 0.9,
-                'steps': ['Verify threat', 'Add permanent ban', 'Update firewall']
-            }
-        elif event.source == 'fail2ban':
-            return {
-                'description': 'Verify ban and extend duration',
-                'confidence': 0.8,
-                'steps': ['Check ban status', 'Extend ban duration']
-            }
-        elif event.source == 'aide':
-            return {
-                'description': 'Restore file from backup',
-                'confidence': 0.6,
-                'steps': ['Verify change', 'Check backup', 'Restore file', 'Update AIDE DB']
-            }
+    async def _request_ai_strategy(self, context: Dict, cache_key: Optional[str] = None) -> Optional[Dict]:
+        """Ein AI-Call; erfolgreiche Strategien landen im Cache."""
+        try:
+            strategy = await asyncio.wait_for(self.ai_service.generate_fix_strategy(context), self.ai_timeout)
+        except asyncio.TimeoutError:
+            logger.error("AI strategy generation timed out after %.0fs", self.ai_timeout)
+            return None
+        except Exception as e:
+            logger.error("AI strategy generation failed: %s", e)
+            return None
+        if strategy and cache_key is not None:
+            self._strategy_cache_put(cache_key, strategy)
+        return strategy
 
-        return {
-            'description': 'Manual review required',
-            'confidence': 0.3,
-            'steps': ['Escalate to administrator']
-        }
+    @staticmethod
+    def _strategy_key(context: Dict) -> str:
+        """
+        Fingerprint des AI-Kontexts ohne event_id und Zeitstempel — die sind
+        pro Event eindeutig, gleiche Bedrohungen sollen aber kollidieren.
+        """
+        event = {k: v for k, v in context['event'].items() if k not in ('event_id', 'timestamp')}
+        payload = fast_json.dumps(
+            {'event': event, 'previous_attempts': context['previous_attempts']},
+            sort_keys=True, default=str,
+        )
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def _strategy_cache_get(self, key: str) -> Optional[Dict]:
+        entry = self._strategy_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, strategy = entry
+        if time.monotonic() - stored_at > STRATEGY_CACHE_TTL_SECONDS:
+            del self._strategy_cache[key]
+            return None
+        self._strategy_cache.move_to_end(key)
+        return strategy
+
+    def _strategy_cache_put(self, key: str, strategy: Dict):
+        self._strategy_cache[key] = (time.monotonic(), strategy)
+        self._strategy_cache.move_to_end(key)
+        if len(self._strategy_cache) > STRATEGY_CACHE_MAX_ENTRIES:
+            self._strategy_cache.popitem(last=False)
+
+    def _get_fallback_strategy(self, event: 'SecurityEvent') -> Dict:
+        """Fallback strategy if AI is unavailable (read-only, nicht mutieren)"""
+        return _FALLBACK_STRATEGIES.get(event.source, _MANUAL_REVIEW_STRATEGY)
 
     async def _apply_fix(self, event: 'SecurityEvent', strategy: Dict) -> Dict:
         """
@@ -474,26 +823,25 @@ class SelfHealingCoordinator:
 
         Returns: Dict with 'status' ('success'/'failed') and optional 'error'
         """
+        handler = self._fix_handlers.get(event.source)
+        if handler is None:
+            return {'status': 'failed', 'error': f'Unknown source: {event.source}'}
+
         try:
-            if event.source == 'trivy':
-                return await self._fix_trivy(event, strategy)
-            elif event.source == 'crowdsec':
-                return await self._fix_crowdsec(event, strategy)
-            elif event.source == 'fail2ban':
-                return await self._fix_fail2ban(event, strategy)
-            elif event.source == 'aide':
-                return await self._fix_aide(event, strategy)
-            else:
-                return {'status': 'failed', 'error': f'Unknown source: {event.source}'}
+            return await asyncio.wait_for(handler(event, strategy), self.fix_timeout)
+
+        except asyncio.TimeoutError:
+            logger.error("Fix for %s timed out after %.0fs", event.event_id, self.fix_timeout)
+            return {'status': 'failed', 'error': f'timeout after {self.fix_timeout:.0f}s'}
 
         except Exception as e:
-            logger.error(f"Fix application error: {e}", exc_info=True)
+            logger.error("Fix application error: %s", e, exc_info=True)
             return {'status': 'failed', 'error': str(e)}
 
     async def _fix_trivy(self, event: 'SecurityEvent', strategy: Dict) -> Dict:
         """Fix Docker vulnerability using TrivyFixer"""
         strategy_desc = strategy.get('description', strategy.get('analysis', 'Trivy Fix'))
-        logger.info(f"🐳 Applying Trivy fix: {strategy_desc}")
+        logger.info("🐳 Applying Trivy fix: %s", strategy_desc)
 
         # Discord Channel Logger: Fix Start
         if self.discord_logger:
@@ -536,7 +884,7 @@ class SelfHealingCoordinator:
             return result
 
         except Exception as e:
-            logger.error(f"❌ Trivy fix error: {e}", exc_info=True)
+            logger.error("❌ Trivy fix error: %s", e, exc_info=True)
 
             # Discord Channel Logger: Exception
             if self.discord_logger:
@@ -553,7 +901,7 @@ class SelfHealingCoordinator:
 
     async def _fix_crowdsec(self, event: 'SecurityEvent', strategy: Dict) -> Dict:
         """Fix CrowdSec threat using CrowdSecFixer"""
-        logger.info(f"🛡️ Applying CrowdSec fix: {strategy.get('description', 'CrowdSec Fix')}")
+        logger.info("🛡️ Applying CrowdSec fix: %s", strategy.get('description', 'CrowdSec Fix'))
 
         try:
             # Convert SecurityEvent to dict for fixer
@@ -568,7 +916,7 @@ class SelfHealingCoordinator:
             return result
 
         except Exception as e:
-            logger.error(f"❌ CrowdSec fix error: {e}", exc_info=True)
+            logger.error("❌ CrowdSec fix error: %s", e, exc_info=True)
             return {
                 'status': 'failed',
                 'error': str(e)
@@ -576,7 +924,7 @@ class SelfHealingCoordinator:
 
     async def _fix_fail2ban(self, event: 'SecurityEvent', strategy: Dict) -> Dict:
         """Fix Fail2ban issue using Fail2banFixer"""
-        logger.info(f"🚫 Applying Fail2ban fix: {strategy.get('description', 'Fail2ban Fix')}")
+        logger.info("🚫 Applying Fail2ban fix: %s", strategy.get('description', 'Fail2ban Fix'))
 
         try:
             # Convert SecurityEvent to dict for fixer
@@ -591,7 +939,7 @@ class SelfHealingCoordinator:
             return result
 
         except Exception as e:
-            logger.error(f"❌ Fail2ban fix error: {e}", exc_info=True)
+            logger.error("❌ Fail2ban fix error: %s", e, exc_info=True)
             return {
                 'status': 'failed',
                 'error': str(e)
@@ -599,7 +947,7 @@ class SelfHealingCoordinator:
 
     async def _fix_aide(self, event: 'SecurityEvent', strategy: Dict) -> Dict:
         """Fix AIDE integrity violation using AideFixer"""
-        logger.info(f"📁 Applying AIDE fix: {strategy.get('description', 'AIDE Fix')}")
+        logger.info("📁 Applying AIDE fix: %s", strategy.get('description', 'AIDE Fix'))
 
         try:
             # Convert SecurityEvent to dict for fixer
@@ -614,7 +962,7 @@ class SelfHealingCoordinator:
             return result
 
         except Exception as e:
-            logger.error(f"❌ AIDE fix error: {e}", exc_info=True)
+            logger.error("❌ AIDE fix error: %s", e, exc_info=True)
             return {
                 'status': 'failed',
                 'error': str(e)
@@ -655,57 +1003,63 @@ class SelfHealingCoordinator:
                 await channel.send(embed=embed)
 
         except Exception as e:
-            logger.error(f"❌ Discord notification error: {e}")
+            logger.error("❌ Discord notification error: %s", e)
 
     async def _handle_success(self, job: RemediationJob):
         """Handle successful remediation"""
-        logger.info(f"✅ Remediation successful for {job.event.event_id} after {len(job.attempts)} attempts")
+        logger.info("✅ Remediation successful for %s after %s attempts", job.event.event_id, len(job.attempts))
 
         job.status = 'success'
         self.stats['successful'] += 1
-        self.circuit_breaker.record_success()
+        self._forget_job(job.event.event_id)
+        self._breaker_for(job.event.source).record_success()
 
         # Move to completed
         if job.event.event_id in self.active_jobs:
             del self.active_jobs[job.event.event_id]
 
         self.completed_jobs.append(job)
-        if len(self.completed_jobs) > self.max_completed_history:
-            self.completed_jobs.pop(0)
 
         # Send Discord notification
         await self._send_success_notification(job)
 
     async def _handle_failure(self, job: RemediationJob, error: str):
         """Handle failed remediation attempt"""
-        logger.warning(f"⚠️ Remediation attempt failed for {job.event.event_id}: {error}")
+        logger.warning("⚠️ Remediation attempt failed for %s: %s", job.event.event_id, error)
 
-        self.circuit_breaker.record_failure()
+        self._breaker_for(job.event.source).record_failure()
 
         # Check if we should retry
         if len(job.attempts) < job.max_attempts:
-            logger.info(f"🔄 Will retry {job.event.event_id} (attempt {len(job.attempts) + 1}/{job.max_attempts})")
+            logger.info("🔄 Will retry %s (attempt %s/%s)", job.event.event_id, len(job.attempts) + 1, job.max_attempts)
             # Put back in queue for retry
             job.status = 'pending'
             if job.event.event_id in self.active_jobs:
                 del self.active_jobs[job.event.event_id]
-            self.job_queue.append(job)
+            delay = self._retry_delay(len(job.attempts))
+            job.next_retry_at = datetime.now() + timedelta(seconds=delay)
+            self._enqueue_job(job, delay=delay)
         else:
-            logger.error(f"❌ Max attempts reached for {job.event.event_id}, giving up")
+            logger.error("❌ Max attempts reached for %s, giving up", job.event.event_id)
             job.status = 'failed'
             self.stats['failed'] += 1
+            self._forget_job(job.event.event_id)
 
             # Move to completed
             if job.event.event_id in self.active_jobs:
                 del self.active_jobs[job.event.event_id]
 
             self.completed_jobs.append(job)
-            if len(self.completed_jobs) > self.max_completed_history:
-                self.completed_jobs.pop(0)
 
             # Send Discord notification
             await self._send_failure_notification(job)
 
+    @staticmethod
+    def _retry_delay(failed_attempts: int) -> float:
+        """Exponentieller Backoff mit Jitter fuer den naechsten Retry."""
+        delay = min(RETRY_MAX_DELAY_SECONDS, RETRY_DELAY_SECONDS * 2 ** max(failed_attempts - 1, 0))
+        return delay * (1 + random.uniform(-RETRY_JITTER, RETRY_JITTER))
+
     def _requires_approval(self, event: 'SecurityEvent', fix_strategy: Optional[Dict] = None) -> bool:
         """
         Determine if event requires human approval
@@ -729,21 +1083,19 @@ class SelfHealingCoordinator:
         # Use ApprovalModeManager for intelligent decision
         if self.approval_manager:
             decision = self.approval_manager.should_auto_execute(event, fix_strategy)
-            logger.info(f"📊 Approval Decision: auto_execute={decision.should_auto_execute}, reason={decision.reason}")
+            logger.info("📊 Approval Decision: auto_execute=%s, reason=%s", decision.should_auto_execute, decision.reason)
             return not decision.should_auto_execute
 
         # Fallback to old logic if no approval manager
-        if self.approval_mode == ApprovalMode.PARANOID:
+        severities = self._severity_needs_approval
+        if severities is None:
             return True
 
-        if self.approval_mode == ApprovalMode.AGGRESSIVE:
-            return event.severity == 'CRITICAL'
-
-        # BALANCED mode
-        if event.source == 'fail2ban':
+        # BALANCED mode: fail2ban nach Aktivitaetsmuster statt Severity
+        if self.approval_mode == ApprovalMode.BALANCED and event.source == 'fail2ban':
             return self._is_suspicious_fail2ban_activity(event)
 
-        return event.severity in ['CRITICAL', 'HIGH']
+        return event.severity in severities
 
     async def _generate_fix_strategy_with_live_updates(self, job: RemediationJob, channel) -> Optional[Dict]:
         """
@@ -911,7 +1263,7 @@ class SelfHealingCoordinator:
             return strategy
 
         except Exception as e:
-            logger.error(f"Live update error: {e}", exc_info=True)
+            logger.error("Live update error: %s", e, exc_info=True)
             await self._update_status(status_message, status_embed,
                 f"❌ Fehler bei KI-Analyse",
                 progress="▰▰▰▰▰▰▰▰▰▰ 100%",
@@ -939,7 +1291,7 @@ class SelfHealingCoordinator:
             await message.edit(embed=embed)
             await asyncio.sleep(0.5)  # Rate limiting
         except Exception as e:
-            logger.error(f"Failed to update status: {e}")
+            logger.error("Failed to update status: %s", e)
 
     def _is_suspicious_fail2ban_activity(self, event: 'SecurityEvent') -> bool:
         """
@@ -956,23 +1308,23 @@ class SelfHealingCoordinator:
         # VERDÄCHTIG wenn:
         # 1. MASSIVER koordinierter Angriff (>50 IPs gleichzeitig = DDoS/Botnet)
         if total_bans > 50:
-            logger.warning(f"🚨 VERDÄCHTIG: MASSIVER koordinierter Angriff erkannt - {total_bans} Bans!")
+            logger.warning("🚨 VERDÄCHTIG: MASSIVER koordinierter Angriff erkannt - %s Bans!", total_bans)
             return True
 
         # 2. Gezielte SSH-Bruteforce-Attacke (>=10 SSH-Bans = ernsthafte Bedrohung)
         bans_list = details.get('Bans', [])
         ssh_bans = sum(1 for ban in bans_list if 'sshd' in ban.get('jail', '').lower())
         if ssh_bans >= 10:
-            logger.warning(f"🚨 VERDÄCHTIG: Gezielte SSH-Bruteforce-Attacke - {ssh_bans} SSH-Bans!")
+            logger.warning("🚨 VERDÄCHTIG: Gezielte SSH-Bruteforce-Attacke - %s SSH-Bans!", ssh_bans)
             return True
 
         # Ansonsten: Normal, keine Approval nötig (Fail2ban hat bereits gebannt)
-        logger.info(f"✅ Fail2ban: {total_bans} Bans - Bereits gebannt (keine Approval nötig)")
+        logger.info("✅ Fail2ban: %s Bans - Bereits gebannt (keine Approval nötig)", total_bans)
         return False
 
     async def _request_approval(self, job: RemediationJob):
         """Request human approval via Discord"""
-        logger.info(f"✋ Requesting approval for {job.event.event_id}")
+        logger.info("✋ Requesting approval for %s", job.event.event_id)
 
         try:
             # Get approval channel
@@ -983,7 +1335,7 @@ class SelfHealingCoordinator:
 
             channel = self.bot.get_channel(channel_id)
             if not channel:
-                logger.error(f"Approvals channel {channel_id} not found")
+                logger.error("Approvals channel %s not found", channel_id)
                 return
 
             event = job.event
@@ -992,7 +1344,7 @@ class SelfHealingCoordinator:
             strategy = await self._generate_fix_strategy_with_live_updates(job, channel)
 
             if not strategy:
-                logger.error(f"❌ KI-Analyse fehlgeschlagen für {event.event_id}")
+                logger.error("❌ KI-Analyse fehlgeschlagen für %s", event.event_id)
                 # Send error message to channel
                 await channel.send(f"❌ **KI-Analyse fehlgeschlagen** für Event `{event.event_id}`\n"
                                  f"Keine Fix-Strategie konnte generiert werden.")
@@ -1203,7 +1555,7 @@ class SelfHealingCoordinator:
             message = await channel.send(embed=embed, view=view)
 
             job.approval_message_id = message.id
-            logger.info(f"✅ Approval request sent to channel {channel_id}")
+            logger.info("✅ Approval request sent to channel %s", channel_id)
 
             # Also send status update to bot-status channel
             await self._send_status_update(
@@ -1215,7 +1567,7 @@ class SelfHealingCoordinator:
             )
 
         except Exception as e:
-            logger.error(f"Failed to send approval request: {e}", exc_info=True)
+            logger.error("Failed to send approval request: %s", e, exc_info=True)
 
     async def _send_status_update(self, message: str, color: int = 0x3498DB):
         """Send status update to bot-status channel"""
@@ -1231,7 +1583,7 @@ class SelfHealingCoordinator:
                     )
                     await channel.send(embed=embed)
         except Exception as e:
-            logger.error(f"Failed to send status update: {e}")
+            logger.error("Failed to send status update: %s", e)
 
     async def _send_success_notification(self, job: RemediationJob):
         """Send success notification to Discord"""
@@ -1277,7 +1629,7 @@ class SelfHealingCoordinator:
             )
 
         except Exception as e:
-            logger.error(f"Failed to send success notification: {e}", exc_info=True)
+            logger.error("Failed to send success notification: %s", e, exc_info=True)
 
     async def _send_failure_notification(self, job: RemediationJob):
         """Send failure notification to Discord"""
@@ -1330,7 +1682,7 @@ class SelfHealingCoordinator:
             )
 
         except Exception as e:
-            logger.error(f"Failed to send failure notification: {e}", exc_info=True)
+            logger.error("Failed to send failure notification: %s", e, exc_info=True)
 
     def get_statistics(self) -> Dict:
         """Get self-healing statistics"""
@@ -1341,45 +1693,58 @@ class SelfHealingCoordinator:
 
         return {
             **self.stats,
-            'pending_jobs': len(self.job_queue),
+            'pending_jobs': len(self._jobs),
             'active_jobs': len(self.active_jobs),
             'completed_jobs': len(self.completed_jobs),
-            'circuit_breaker': self.circuit_breaker.get_status(),
+            'circuit_breakers': {source: breaker.get_status() for source, breaker in self._breakers.items()},
+            'source_active_jobs': {source: n for source, n in self._source_active.items() if n},
             'approval_mode': self.approval_mode.value,
         }
 
     async def approve_job(self, event_id: str) -> bool:
         """Approve a pending job"""
-        for job in self.job_queue:
-            if job.event.event_id == event_id and job.approval_required:
-                job.approval_required = False
-                job.status = 'pending'
-                logger.info(f"✅ Job {event_id} approved")
-                return True
+        job = self._awaiting_approval.pop(event_id, None)
+        if job is None:
+            return False
 
-        return False
+        job.approval_required = False
+        job.status = 'pending'
+        self._persist_job(job)
+        self._pending.put_nowait(event_id)
+        logger.info("✅ Job %s approved", event_id)
+        return True
 
     async def reject_job(self, event_id: str) -> bool:
         """Reject a pending job"""
-        for job in self.job_queue:
-            if job.event.event_id == event_id and job.approval_required:
-                self.job_queue.remove(job)
-                job.status = 'rejected'
-                self.completed_jobs.append(job)
-                logger.info(f"❌ Job {event_id} rejected")
-                return True
+        job = self._awaiting_approval.pop(event_id, None)
+        if job is None:
+            return False
 
-        return False
+        self._jobs.pop(event_id, None)
+        self._forget_job(event_id)
+        job.status = 'rejected'
+        self.completed_jobs.append(job)
+        logger.info("❌ Job %s rejected", event_id)
+        return True
 
     async def stop_all_jobs(self):
         """Emergency stop - clear all pending jobs"""
         logger.warning("🛑 EMERGENCY STOP: Clearing all pending jobs")
 
-        cleared_count = len(self.job_queue) + len(self.active_jobs)
+        cleared_count = len(self._jobs) + len(self.active_jobs)
 
-        self.job_queue.clear()
+        while not self._pending.empty():
+            self._pending.get_nowait()
+        self._awaiting_approval.clear()
+        self._source_parked.clear()
+        self._jobs.clear()
         self.active_jobs.clear()
+        if self._job_store:
+            try:
+                self._job_store.clear()
+            except sqlite3.Error as e:
+                logger.error("❌ Job-Store konnte nicht geleert werden: %s", e)
 
-        logger.info(f"✅ Stopped {cleared_count} jobs")
+        logger.info("✅ Stopped %s jobs", cleared_count)
 
         return cleared_count
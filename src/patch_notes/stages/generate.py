@@ -92,9 +92,9 @@ async def _select_variant(ctx: PipelineContext, bot) -> str:
         except Exception as e:
             logger.debug(f"Learning-DB Varianten-Abfrage fehlgeschlagen: {e}")
 
-    # 3. Weighted Random
+    # 3. A/B Test (Thompson Sampling)
     try:
-        variant = ab.select_variant(ctx.project, strategy='weighted_random')
+        variant = ab.select_variant(ctx.project, strategy='thompson')
         logger.info(f"🧪 A/B Test: Variante '{variant.name}' (ID: {variant.id})")
         return variant.id
     except Exception as e:
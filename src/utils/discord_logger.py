@@ -11,6 +11,11 @@ import discord
 
 logger = logging.getLogger('shadowops.discord_logger')
 
+# Direkt aufeinanderfolgende Text-Logs fuer denselben Channel werden zu einem
+# send gebuendelt (Discord-Limit 2000 Zeichen) — ein API-Call statt vieler.
+DISCORD_MESSAGE_LIMIT = 2000
+MAX_BATCHED_LOGS = 10
+
 
 class DiscordChannelLogger:
     """
@@ -94,16 +99,24 @@ class DiscordChannelLogger:
 
     async def _message_sender_loop(self):
         """Background task that sends queued messages"""
+        pending = None  # schon entnommene Nachricht, die nicht mehr in den Batch passte
         while self.running:
             try:
-                # Get message from queue (wait max 1 second)
-                try:
-                    channel_key, message, embed = await asyncio.wait_for(
-                        self.message_queue.get(),
-                        timeout=1.0
-                    )
-                except asyncio.TimeoutError:
-                    continue
+                if pending is not None:
+                    item, pending = pending, None
+                else:
+                    # Get message from queue (wait max 1 second)
+                    try:
+                        item = await asyncio.wait_for(
+                            self.message_queue.get(),
+                            timeout=1.0
+                        )
+                    except asyncio.TimeoutError:
+                        continue
+
+                channel_key, message, embed = item
+                if embed is None and message:
+                    message, pending = self._batch_text_logs(channel_key, message)
 
                 # Send message
                 await self._send_to_channel(channel_key, message, embed)
@@ -115,6 +128,29 @@ class DiscordChannelLogger:
                 logger.error(f"Error in message sender loop: {e}")
                 await asyncio.sleep(1)
 
+    def _batch_text_logs(self, channel_key: str, message: str):
+        """
+        Haengt bereits wartende Text-Logs fuer denselben Channel an ``message`` an.
+
+        Returns:
+            (gebuendelter Text, erste nicht passende Nachricht oder None)
+        """
+        lines = [message]
+        size = len(message)
+        while len(lines) < MAX_BATCHED_LOGS:
+            try:
+                item = self.message_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            key, text, embed = item
+            if (key != channel_key or embed is not None or not text
+                    or size + 1 + len(text) > DISCORD_MESSAGE_LIMIT):
+                return "\n".join(lines), item
+            lines.append(text)
+            size += 1 + len(text)
+            self.message_queue.task_done()
+        return "\n".join(lines), None
+
     async def _send_to_channel(self, channel_key: str, message: str, embed: Optional[discord.Embed] = None):
         """Send message to Discord channel"""
         try:
@@ -0,0 +1,49 @@
+"""
+Schnelle JSON-Serialisierung fuer Hot-Paths (State-Files, JSONL-Logs).
+
+Nutzt orjson wenn installiert, sonst stdlib json als Fallback. Beide Pfade
+liefern bytes beim Schreiben und akzeptieren bytes/str beim Lesen, damit
+Aufrufer nicht unterscheiden muessen.
+"""
+
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:  # pragma: no cover - abhaengig von installierten Paketen
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def dumps(
+    obj: Any,
+    *,
+    indent: bool = False,
+    sort_keys: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> bytes:
+    """
+    Serialisiert ``obj`` zu UTF-8-bytes (optional mit 2er-Einrueckung).
+
+    ``sort_keys`` liefert eine stabile Byte-Folge (z.B. fuer Hash-Keys),
+    ``default`` wandelt nicht serialisierbare Objekte um.
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=default, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False, sort_keys=sort_keys,
+                          default=default).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), sort_keys=sort_keys,
+                      default=default).encode('utf-8')
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parst JSON aus bytes oder str."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
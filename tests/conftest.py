@@ -23,6 +23,34 @@ def event_loop():
     loop.close()
 
 
+# ============================================================================
+# RUNTIME-STATE ISOLATION
+# ============================================================================
+
+@pytest.fixture(autouse=True)
+def isolated_runtime_state(tmp_path, monkeypatch):
+    """Leitet Runtime-State-Dateien (data/) pro Test nach tmp_path um.
+
+    Ohne diese Fixture schreiben ProjectMonitor, der Self-Healing-Job-Store
+    und der StateManager-Singleton in das echte data/-Verzeichnis des
+    Working-Trees.
+    """
+    monkeypatch.setattr(
+        'src.integrations.project_monitor.DEFAULT_STATE_FILE',
+        str(tmp_path / 'project_monitor_state.json'),
+    )
+    monkeypatch.setattr(
+        'src.integrations.self_healing.DEFAULT_JOB_STORE_PATH',
+        str(tmp_path / 'self_healing_jobs.db'),
+    )
+    for module_name in ('utils.state_manager', 'src.utils.state_manager'):
+        module = __import__(module_name, fromlist=['StateManager'])
+        monkeypatch.setattr(
+            module, 'state_manager',
+            module.StateManager(str(tmp_path / 'state.json')),
+        )
+
+
 # ============================================================================
 # MOCK CONFIG FIXTURES
 # ============================================================================
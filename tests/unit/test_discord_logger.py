@@ -0,0 +1,54 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.utils.discord_logger import DISCORD_MESSAGE_LIMIT, MAX_BATCHED_LOGS, DiscordChannelLogger
+
+
+async def _drain(items):
+    """Fuellt die Queue, laesst den Sender-Loop laufen und liefert die sends."""
+    dl = DiscordChannelLogger()
+    dl._send_to_channel = AsyncMock()
+    for item in items:
+        dl.message_queue.put_nowait(item)
+
+    await dl.start()
+    await asyncio.wait_for(dl.message_queue.join(), timeout=2)
+    await dl.stop()
+    return [c.args for c in dl._send_to_channel.await_args_list]
+
+
+class TestBatching:
+    @pytest.mark.asyncio
+    async def test_consecutive_text_logs_share_one_send(self):
+        sends = await _drain([('ai_learning', f'log {i}', None) for i in range(3)])
+
+        assert sends == [('ai_learning', 'log 0\nlog 1\nlog 2', None)]
+
+    @pytest.mark.asyncio
+    async def test_channel_switch_and_embeds_break_batch_in_order(self):
+        embed = Mock()
+        sends = await _drain([
+            ('ai_learning', 'a1', None),
+            ('ai_learning', 'a2', None),
+            ('alerts', 'b1', None),
+            ('alerts', 'b2', embed),
+            ('alerts', 'b3', None),
+        ])
+
+        assert sends == [
+            ('ai_learning', 'a1\na2', None),
+            ('alerts', 'b1', None),
+            ('alerts', 'b2', embed),
+            ('alerts', 'b3', None),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batch_respects_count_and_length_limits(self):
+        many = await _drain([('ai_learning', 'x', None)] * (MAX_BATCHED_LOGS + 2))
+        assert [s[1].count('x') for s in many] == [MAX_BATCHED_LOGS, 2]
+
+        half = 'y' * (DISCORD_MESSAGE_LIMIT // 2 - 1)
+        long = await _drain([('ai_learning', half, None)] * 3)
+        assert [len(s[1]) for s in long] == [2 * len(half) + 1, len(half)]
@@ -18,6 +18,13 @@ import asyncio
 from src.integrations.event_watcher import SecurityEvent, SecurityEventWatcher
 
 
+@pytest.fixture(autouse=True)
+def isolated_event_caches(tmp_path, monkeypatch):
+    """Seen-/Escalated-Caches nach tmp_path statt ins echte logs/."""
+    monkeypatch.setattr(SecurityEventWatcher, 'event_cache_file', tmp_path / 'seen_events.json')
+    monkeypatch.setattr(SecurityEventWatcher, 'escalated_cache_file', tmp_path / 'escalated_events.json')
+
+
 class TestSecurityEvent:
     """Tests for SecurityEvent dataclass"""
 
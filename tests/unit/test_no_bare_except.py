@@ -0,0 +1,19 @@
+"""Guard: kein nacktes ``except:`` in src/ — faengt sonst auch
+KeyboardInterrupt/SystemExit und blockiert den sauberen Bot-Shutdown."""
+
+import ast
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[2] / 'src'
+
+
+def test_src_has_no_bare_except():
+    offenders = []
+    for path in sorted(SRC.rglob('*.py')):
+        tree = ast.parse(path.read_text(encoding='utf-8'), filename=str(path))
+        offenders.extend(
+            f"{path.relative_to(SRC)}:{node.lineno}"
+            for node in ast.walk(tree)
+            if isinstance(node, ast.ExceptHandler) and node.type is None
+        )
+    assert offenders == []
@@ -2,10 +2,15 @@
 Unit Tests for Project Monitor
 """
 
+import asyncio
+import json
+import time
+
 import pytest
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from datetime import datetime, timedelta, timezone
 import aiohttp
+import discord
 
 from src.integrations.project_monitor import ProjectMonitor, ProjectStatus
 
@@ -31,6 +36,26 @@ class TestProjectStatusClass:
         assert status.is_online is False
         assert status.total_checks == 0
 
+    def test_url_parsed_once(self):
+        status = ProjectStatus('p', {'url': 'https://example.com:8443/api/health'})
+        assert status.parsed_url.scheme == 'https'
+        assert status.host == 'example.com:8443'
+
+        no_url = ProjectStatus('p', {})
+        assert no_url.parsed_url is None
+        assert no_url.host is None
+
+    def test_invalid_url_warned_at_load(self, caplog):
+        config = MagicMock()
+        config.projects = {
+            'bad': {'enabled': True, 'monitor': {'enabled': True, 'url': 'example.com/health'}},
+        }
+        config.customer_status_channel = 12345
+
+        ProjectMonitor(Mock(), config)
+
+        assert 'Ungueltige Health-URL fuer bad' in caplog.text
+
     def test_update_online(self):
         """Test updating status when health check succeeds"""
         config = {'url': 'https://example.com'}
@@ -66,6 +91,30 @@ class TestProjectStatusClass:
         assert status.last_error == 'Connection timeout'
         assert was_new_incident is True  # This was a new failure
 
+    def test_update_timestamps_share_one_clock_read(self):
+        """last_check/last_online bzw. last_offline/downtime_start sind identisch."""
+        status = ProjectStatus('test-project', {'url': 'https://example.com'})
+
+        status.update_online(100.0)
+        assert status.last_check_time == status.last_online_time
+
+        status.update_offline('Error')
+        assert status.last_check_time == status.last_offline_time
+        assert status.current_downtime_start == status.last_offline_time
+
+    def test_injected_clock(self):
+        """Der Aufrufer kann den Tick-Zeitpunkt injizieren (deterministisch)."""
+        status = ProjectStatus('test-project', {'url': 'https://example.com'})
+        t0 = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+        t1 = t0 + timedelta(minutes=1)
+
+        status.update_online(100.0, t0)
+        status.update_offline('Error', t1)
+
+        assert status.last_online_time == t0
+        assert status.last_offline_time == t1
+        assert status.current_downtime_start == t1
+
     def test_uptime_percentage(self):
         """Test uptime percentage calculation"""
         config = {'url': 'https://example.com'}
@@ -272,6 +321,98 @@ class TestHealthChecks:
         assert 'Timeout' in project.last_error
 
 
+    @pytest.mark.asyncio
+    async def test_check_uses_one_timestamp_per_tick(self):
+        """Alle Status-Updates eines Checks nutzen denselben Wall-Clock-Zeitpunkt."""
+        config = MagicMock()
+        config.projects = {
+            'test-project': {
+                'enabled': True,
+                'monitor': {'enabled': True, 'url': 'https://example.com/health'},
+            }
+        }
+        config.customer_status_channel = 12345
+        monitor = ProjectMonitor(Mock(), config)
+        monitor._send_incident_alert = AsyncMock()
+        project = monitor.projects['test-project']
+        project.update_online(100.0)
+
+        mock_session = MagicMock()
+        mock_session.get.side_effect = aiohttp.ClientError('refused')
+        mock_session.__aenter__.return_value = mock_session
+        mock_session.__aexit__.return_value = None
+
+        with patch('aiohttp.ClientSession', return_value=mock_session):
+            await monitor._check_project_health(project)
+
+        assert project.last_check_time == project.last_offline_time
+        assert project.current_downtime_start == project.last_offline_time
+
+    @pytest.mark.asyncio
+    async def test_checks_share_per_host_semaphore(self):
+        """Projekte mit gleichem Host teilen sich eine Semaphore."""
+        config = MagicMock()
+        config.projects = {
+            name: {'enabled': True, 'monitor': {'enabled': True, 'url': url}}
+            for name, url in (
+                ('a', 'https://shared.example/a/health'),
+                ('b', 'https://shared.example/b/health'),
+                ('c', 'https://other.example/health'),
+            )
+        }
+        config.customer_status_channel = 12345
+        monitor = ProjectMonitor(Mock(), config)
+        sem = lambda name: monitor._host_semaphore(monitor.projects[name].host)
+
+        assert sem('a') is sem('b')
+        assert sem('a') is not sem('c')
+
+    @pytest.mark.asyncio
+    async def test_host_limit_bounds_concurrency(self):
+        from src.integrations import project_monitor as pm
+
+        config = MagicMock()
+        config.projects = {
+            f'p{i}': {'enabled': True, 'monitor': {'enabled': True, 'url': 'https://one.example/h'}}
+            for i in range(pm.HOST_CONCURRENCY_LIMIT + 3)
+        }
+        config.customer_status_channel = 12345
+        monitor = ProjectMonitor(Mock(), config)
+
+        in_flight = 0
+        peak = 0
+
+        class Response:
+            status = 200
+
+            async def __aenter__(self):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                return self
+
+            async def __aexit__(self, *exc):
+                nonlocal in_flight
+                in_flight -= 1
+
+            async def json(self):
+                return {}
+
+        mock_session = MagicMock()
+        mock_session.get.side_effect = lambda *a, **kw: Response()
+        mock_session.__aenter__.return_value = mock_session
+        mock_session.__aexit__.return_value = None
+
+        with patch('aiohttp.ClientSession', return_value=mock_session):
+            await asyncio.gather(*(
+                monitor._check_project_health(p) for p in monitor.projects.values()
+            ))
+
+        assert peak == pm.HOST_CONCURRENCY_LIMIT
+        assert all(p.is_online for p in monitor.projects.values())
+
+
 class TestAlerts:
     """Tests for alert functionality"""
 
@@ -431,3 +572,744 @@ class TestHumanizedEmbeds:
         # Downtime-Klartext in Beschreibung
         assert 'Ausfall-Dauer' in embed.description
         assert 'Min' in embed.description
+
+    def test_embed_templates_prebuilt_per_project(self):
+        monitor = self._monitor()
+        status = ProjectStatus('ZERODOX', {'url': 'https://zerodox.de/health'})
+        status.update_offline('Timeout')
+
+        first = monitor._create_incident_embed(status, 'Timeout')
+        second = monitor._create_incident_embed(status, 'Timeout')
+
+        assert first.title == status.incident_embed_template['title']
+        assert first.color.value == status.incident_embed_template['color']
+        assert first.timestamp is not None
+        # Alerts teilen sich das Skelett, aber nicht die Felder
+        assert first is not second
+        assert len(first.fields) == len(second.fields)
+        assert 'fields' not in status.incident_embed_template
+
+
+class TestDebouncedStateSave:
+    """_save_state wird debounced und schreibt atomar ausserhalb des Event-Loops."""
+
+    def _monitor(self, tmp_path):
+        config = MagicMock()
+        config.projects = {
+            'test-project': {
+                'enabled': True,
+                'monitor': {'enabled': True, 'url': 'https://example.com/health'},
+            }
+        }
+        config.customer_status_channel = 12345
+        monitor = ProjectMonitor(Mock(), config)
+        monitor.state_file = tmp_path / 'monitor_state.json'
+        return monitor
+
+    @pytest.mark.asyncio
+    async def test_health_check_only_marks_state_dirty(self, tmp_path):
+        monitor = self._monitor(tmp_path)
+        project = monitor.projects['test-project']
+
+        mock_response = MagicMock()
+        mock_response.status = 200
+        mock_response.__aenter__.return_value = mock_response
+        mock_response.__aexit__.return_value = None
+        mock_session = MagicMock()
+        mock_session.get.return_value = mock_response
+        mock_session.__aenter__.return_value = mock_session
+        mock_session.__aexit__.return_value = None
+
+        with patch('aiohttp.ClientSession', return_value=mock_session):
+            await monitor._check_project_health(project)
+
+        assert monitor._state_dirty is True
+        assert not monitor.state_file.exists()
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_once_per_interval(self, tmp_path):
+        monitor = self._monitor(tmp_path)
+        monitor.projects['test-project'].update_online(100.0)
+        monitor._state_dirty = True
+
+        await monitor._flush_state_if_dirty()
+
+        state = json.loads(monitor.state_file.read_text())
+        assert state['projects']['test-project']['successful_checks'] == 1
+        assert monitor._state_dirty is False
+        assert not monitor.state_file.with_suffix('.tmp').exists()
+
+        # Innerhalb des Debounce-Intervalls wird nicht erneut geschrieben
+        monitor.projects['test-project'].update_online(100.0)
+        monitor._state_dirty = True
+        await monitor._flush_state_if_dirty()
+        state = json.loads(monitor.state_file.read_text())
+        assert state['projects']['test-project']['successful_checks'] == 1
+        assert monitor._state_dirty is True
+
+    @pytest.mark.asyncio
+    async def test_flush_skips_when_clean(self, tmp_path):
+        monitor = self._monitor(tmp_path)
+        await monitor._flush_state_if_dirty()
+        assert not monitor.state_file.exists()
+
+
+class TestLogScan:
+    """_check_project_logs durchsucht den Log-Tail nach log_pattern."""
+
+    def _monitor(self, log_file, **monitor_cfg):
+        config = MagicMock()
+        config.projects = {
+            'test-project': {
+                'enabled': True,
+                'monitor': {
+                    'enabled': True,
+                    'url': 'https://example.com/health',
+                    'log_file': str(log_file),
+                    'log_pattern': 'DB connection refused',
+                    'remediation_command': 'true',
+                    **monitor_cfg,
+                },
+            }
+        }
+        config.customer_status_channel = 12345
+        monitor = ProjectMonitor(Mock(), config)
+        monitor._attempt_remediation = AsyncMock()
+        return monitor
+
+    def test_pattern_precompiled_as_bytes_regex(self, tmp_path):
+        status = ProjectStatus('p', {'log_file': 'x.log', 'log_pattern': 'OOM (killed)'})
+        assert status.log_patterns == ['OOM (killed)']
+        assert status.log_regex.search('x OOM (killed) y'.encode())
+        assert not status.log_regex.search(b'OOM killed')  # Substring, keine Regex-Syntax
+        assert ProjectStatus('p', {}).log_regex is None
+
+    def test_multiple_patterns_compile_to_one_regex(self):
+        status = ProjectStatus('p', {
+            'log_pattern': 'ignored',
+            'log_patterns': ['DB connection refused', 'Out of memory', ''],
+        })
+        assert status.log_patterns == ['DB connection refused', 'Out of memory']
+        assert status.log_regex.search(b'fatal: Out of memory').group(0) == b'Out of memory'
+
+    @pytest.mark.asyncio
+    async def test_any_of_multiple_patterns_triggers(self, tmp_path, caplog):
+        log_file = tmp_path / 'app.log'
+        log_file.write_text('kernel: Out of memory\n')
+        monitor = self._monitor(log_file, log_patterns=['DB connection refused', 'Out of memory'])
+
+        await monitor._check_project_logs(monitor.projects['test-project'])
+
+        monitor._attempt_remediation.assert_awaited_once()
+        assert "Detected log pattern 'Out of memory'" in caplog.text
+
+    def test_has_log_scan_requires_file_and_pattern(self):
+        assert ProjectStatus('p', {'log_file': 'a.log', 'log_pattern': 'x'}).has_log_scan
+        assert not ProjectStatus('p', {'log_file': 'a.log'}).has_log_scan
+        assert not ProjectStatus('p', {'log_pattern': 'x'}).has_log_scan
+
+    @pytest.mark.asyncio
+    async def test_monitor_loop_skips_log_scan_without_config(self):
+        config = MagicMock()
+        config.projects = {
+            'test-project': {
+                'enabled': True,
+                'monitor': {'enabled': True, 'url': 'https://example.com/health'},
+            }
+        }
+        config.customer_status_channel = 12345
+        monitor = ProjectMonitor(Mock(), config)
+        monitor.startup_grace_seconds = 0
+        monitor._check_project_logs = AsyncMock()
+        # Erster Check beendet den Loop, weitere Checks sind egal
+        monitor._check_project_health = AsyncMock(side_effect=asyncio.CancelledError)
+
+        await monitor._monitor_project(monitor.projects['test-project'])
+
+        monitor._check_project_logs.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_match_triggers_remediation(self, tmp_path):
+        log_file = tmp_path / 'app.log'
+        log_file.write_bytes(b'ok\n\xff\xfe broken utf8\nERROR DB connection refused\n')
+        monitor = self._monitor(log_file)
+
+        await monitor._check_project_logs(monitor.projects['test-project'])
+
+        monitor._attempt_remediation.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_no_match_no_remediation(self, tmp_path):
+        log_file = tmp_path / 'app.log'
+        log_file.write_text('all good\n')
+        monitor = self._monitor(log_file)
+
+        await monitor._check_project_logs(monitor.projects['test-project'])
+
+        monitor._attempt_remediation.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_only_new_bytes_are_scanned(self, tmp_path):
+        log_file = tmp_path / 'app.log'
+        log_file.write_text('ERROR DB connection refused\n')
+        monitor = self._monitor(log_file)
+        project = monitor.projects['test-project']
+
+        await monitor._check_project_logs(project)
+        assert project.last_log_pos == log_file.stat().st_size
+
+        # Kein neuer Inhalt -> derselbe Treffer loest nicht erneut aus
+        await monitor._check_project_logs(project)
+        assert monitor._attempt_remediation.await_count == 1
+
+        with log_file.open('a') as f:
+            f.write('ERROR DB connection refused\n')
+        await monitor._check_project_logs(project)
+        assert monitor._attempt_remediation.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_truncated_log_is_rescanned_from_start(self, tmp_path):
+        log_file = tmp_path / 'app.log'
+        log_file.write_text('x' * 200 + '\n')
+        monitor = self._monitor(log_file)
+        project = monitor.projects['test-project']
+        await monitor._check_project_logs(project)
+
+        log_file.write_text('ERROR DB connection refused\n')  # kuerzer als vorher
+        await monitor._check_project_logs(project)
+
+        monitor._attempt_remediation.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_catch_up_is_capped_to_tail_window(self, tmp_path):
+        log_file = tmp_path / 'app.log'
+        log_file.write_text('ERROR DB connection refused\n' + 'x' * 500)
+        monitor = self._monitor(log_file, log_tail_bytes=100)
+
+        await monitor._check_project_logs(monitor.projects['test-project'])
+
+        monitor._attempt_remediation.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_file_io_runs_in_thread(self, tmp_path):
+        log_file = tmp_path / 'app.log'
+        log_file.write_text('ERROR DB connection refused\n')
+        monitor = self._monitor(log_file)
+
+        with patch('asyncio.to_thread', wraps=asyncio.to_thread) as to_thread:
+            await monitor._check_project_logs(monitor.projects['test-project'])
+
+        assert to_thread.call_args[0][0] == monitor._read_log_tail
+        monitor._attempt_remediation.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_missing_log_file_is_ignored(self, tmp_path):
+        monitor = self._monitor(tmp_path / 'missing.log')
+
+        await monitor._check_project_logs(monitor.projects['test-project'])
+
+        monitor._attempt_remediation.assert_not_awaited()
+
+
+class TestExternalNotifications:
+    """Externe Alerts auf Kunden-Servern (external_notifications pro Projekt)."""
+
+    def _monitor(self, notifs):
+        config = MagicMock()
+        config.projects = {
+            'test-project': {
+                'enabled': True,
+                'monitor': {'enabled': True, 'url': 'https://example.com/health'},
+                'external_notifications': notifs,
+            },
+            'other': {'enabled': True, 'monitor': {'enabled': False}},
+        }
+        config.customer_status_channel = 12345
+        bot = Mock()
+        channel = AsyncMock()
+        channel.send.return_value = Mock(id=777)
+        bot.get_channel.return_value = channel
+        return ProjectMonitor(bot, config), channel
+
+    def test_project_configs_cached_at_load(self):
+        monitor, _ = self._monitor([])
+        assert set(monitor._project_configs) == {'test-project'}
+
+    def test_external_targets_normalized_at_load(self):
+        monitor, _ = self._monitor([
+            {'enabled': True, 'channel_id': '555', 'notify_on': {'online': False}},
+            {'enabled': False, 'channel_id': '666'},
+            {'enabled': True, 'channel_id': 'not-a-number'},
+            {'enabled': True},
+        ])
+        assert monitor.projects['test-project'].external_targets == [(555, True, False)]
+
+    @pytest.mark.asyncio
+    async def test_offline_notification_sent(self):
+        monitor, channel = self._monitor([
+            {'enabled': True, 'channel_id': '555', 'notify_on': {'offline': True}},
+        ])
+        project = monitor.projects['test-project']
+        project.update_offline('Timeout')
+
+        await monitor._send_external_notifications(project, 'offline', error='Timeout')
+
+        monitor.bot.get_channel.assert_called_with(555)
+        channel.send.assert_awaited_once()
+        assert monitor._ext_alert_ids == {'ext_alert_test-project_555': 777}
+
+    @pytest.mark.asyncio
+    async def test_disabled_or_muted_targets_skipped(self):
+        monitor, channel = self._monitor([
+            {'enabled': False, 'channel_id': 1},
+            {'enabled': True, 'channel_id': 2, 'notify_on': {'online': False}},
+        ])
+
+        await monitor._send_external_notifications(monitor.projects['test-project'], 'online')
+
+        channel.send.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_unknown_project_is_ignored(self):
+        monitor, channel = self._monitor([{'enabled': True, 'channel_id': 1}])
+
+        await monitor._send_external_notifications(ProjectStatus('ghost', {}), 'offline')
+
+        channel.send.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_targets_are_sent_concurrently(self):
+        monitor, _ = self._monitor([
+            {'enabled': True, 'channel_id': 1},
+            {'enabled': True, 'channel_id': 2},
+            {'enabled': True, 'channel_id': 3},
+        ])
+        in_flight = 0
+        peak = 0
+
+        async def send(embed):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return Mock(id=1)
+
+        channels = {cid: AsyncMock() for cid in (1, 2, 3)}
+        for ch in channels.values():
+            ch.send.side_effect = send
+        monitor.bot.get_channel.side_effect = channels.get
+
+        await monitor._send_external_notifications(
+            monitor.projects['test-project'], 'offline', error='x'
+        )
+
+        assert peak == 3
+        assert all(ch.send.await_count == 1 for ch in channels.values())
+
+    @pytest.mark.asyncio
+    async def test_one_failing_target_does_not_block_others(self):
+        monitor, _ = self._monitor([
+            {'enabled': True, 'channel_id': 1},
+            {'enabled': True, 'channel_id': 2},
+        ])
+        broken, ok = AsyncMock(), AsyncMock()
+        broken.send.side_effect = RuntimeError('boom')
+        ok.send.return_value = Mock(id=9)
+        monitor.bot.get_channel.side_effect = {1: broken, 2: ok}.get
+
+        await monitor._send_external_notifications(monitor.projects['test-project'], 'online')
+
+        ok.send.assert_awaited_once()
+        assert monitor._ext_alert_ids == {'ext_alert_test-project_2': 9}
+
+    def test_channel_handles_are_cached(self):
+        monitor, channel = self._monitor([])
+
+        assert monitor._channel(555) is channel
+        assert monitor._channel(555) is channel
+        monitor.bot.get_channel.assert_called_once_with(555)
+
+    def test_missing_channel_is_not_cached(self):
+        monitor, _ = self._monitor([])
+        monitor.bot.get_channel.return_value = None
+
+        assert monitor._channel(555) is None
+        assert 555 not in monitor._channel_cache
+
+    @pytest.mark.asyncio
+    async def test_not_found_invalidates_cached_channel(self):
+        monitor, channel = self._monitor([{'enabled': True, 'channel_id': 555}])
+        channel.send.side_effect = discord.NotFound(Mock(status=404), 'Unknown Channel')
+        project = monitor.projects['test-project']
+
+        await monitor._send_external_notifications(project, 'offline', error='x')
+
+        assert 555 not in monitor._channel_cache
+
+
+class TestDashboardUpdates:
+    """Dashboard-Edits nur bei relevanten State-Aenderungen."""
+
+    def _monitor(self):
+        config = MagicMock()
+        config.projects = {
+            'test-project': {
+                'enabled': True,
+                'monitor': {'enabled': True, 'url': 'https://example.com/health'},
+            }
+        }
+        config.customer_status_channel = 12345
+        bot = Mock()
+        channel = AsyncMock()
+        message = AsyncMock()
+        message.id = 42
+        channel.send.return_value = message
+        channel.get_partial_message = Mock(return_value=message)
+        bot.get_channel.return_value = channel
+        monitor = ProjectMonitor(bot, config)
+        monitor._update_external_dashboards = AsyncMock()
+        return monitor, channel, message
+
+    @pytest.mark.asyncio
+    async def test_unchanged_state_skips_edit(self):
+        monitor, channel, message = self._monitor()
+        monitor.projects['test-project'].update_online(100.0)
+
+        await monitor._update_dashboard()
+        await monitor._update_dashboard()
+
+        channel.send.assert_awaited_once()
+        message.edit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_state_change_triggers_edit(self):
+        monitor, channel, message = self._monitor()
+        project = monitor.projects['test-project']
+        project.update_online(100.0)
+        await monitor._update_dashboard()
+
+        project.update_offline('Timeout')
+        await monitor._update_dashboard()
+
+        message.edit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_persisted_message_is_edited_without_fetch(self):
+        monitor, channel, message = self._monitor()
+        monitor.dashboard_message_id = 42
+
+        await monitor._update_dashboard()
+
+        channel.get_partial_message.assert_called_once_with(42)
+        message.edit.assert_awaited_once()
+        channel.fetch_message.assert_not_awaited()
+        channel.send.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_deleted_message_is_recreated(self):
+        monitor, channel, message = self._monitor()
+        monitor.dashboard_message_id = 41
+        message.edit.side_effect = discord.NotFound(Mock(status=404), 'Unknown Message')
+
+        await monitor._update_dashboard()
+
+        channel.send.assert_awaited_once()
+        assert monitor.dashboard_message_id == 42
+
+    @pytest.mark.asyncio
+    async def test_new_dashboard_id_is_persisted_immediately(self):
+        monitor, channel, _ = self._monitor()
+
+        await monitor._update_dashboard()
+
+        state = json.loads(monitor.state_file.read_text())
+        assert state['dashboard_message_id'] == 42
+
+        restarted, channel2, message2 = self._monitor()
+        restarted.state_file = monitor.state_file
+        restarted._load_state()
+        await restarted._update_dashboard()
+
+        channel2.send.assert_not_awaited()
+        message2.edit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_edit_does_not_mark_rendered(self):
+        monitor, channel, message = self._monitor()
+        monitor.dashboard_message_id = 42
+        message.edit.side_effect = discord.HTTPException(Mock(status=500), 'boom')
+
+        await monitor._update_dashboard()
+        assert monitor._last_dashboard_fingerprint is None
+
+        message.edit.side_effect = None
+        await monitor._update_dashboard()
+        assert message.edit.await_count == 2
+        assert monitor._last_dashboard_fingerprint == monitor._dashboard_fingerprint()
+
+    @pytest.mark.asyncio
+    async def test_overlapping_updates_are_dropped(self):
+        monitor, _, _ = self._monitor()
+        release = asyncio.Event()
+        calls = 0
+
+        async def slow_update():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+
+        monitor._update_dashboard = slow_update
+
+        first = asyncio.create_task(monitor._update_dashboard_if_idle())
+        await asyncio.sleep(0)
+        assert await monitor._update_dashboard_if_idle() is False
+
+        release.set()
+        assert await first is True
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_dashboard_is_rerendered(self):
+        monitor, channel, message = self._monitor()
+        await monitor._update_dashboard()
+        monitor._last_dashboard_render -= 31 * 60
+
+        await monitor._update_dashboard()
+
+        message.edit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_status_flip_marks_dashboard_dirty(self):
+        monitor, _, _ = self._monitor()
+        project = monitor.projects['test-project']
+        project.update_online(100.0)
+
+        async def go_offline(p):
+            p.update_offline('Timeout')
+
+        monitor._check_project_health = go_offline
+        await monitor._check_health_and_mark_dashboard(project)
+        assert monitor._dashboard_dirty.is_set()
+
+    @pytest.mark.asyncio
+    async def test_unchanged_status_does_not_mark_dashboard(self):
+        monitor, _, _ = self._monitor()
+        project = monitor.projects['test-project']
+        project.update_online(100.0)
+
+        async def stay_online(p):
+            p.update_online(90.0)
+
+        monitor._check_project_health = stay_online
+        await monitor._check_health_and_mark_dashboard(project)
+        assert not monitor._dashboard_dirty.is_set()
+
+    @pytest.mark.asyncio
+    async def test_dirty_event_wakes_loop_before_keepalive(self):
+        monitor, _, _ = self._monitor()
+        monitor.dashboard_update_interval = 3600
+        updates = asyncio.Queue()
+
+        async def fake_update():
+            updates.put_nowait(True)
+            return True
+
+        monitor._update_dashboard_if_idle = fake_update
+        task = asyncio.create_task(monitor._update_dashboard_loop())
+        throttle = patch('src.integrations.project_monitor.DASHBOARD_MIN_EDIT_INTERVAL_SECONDS', 0)
+        throttle.start()
+        try:
+            await asyncio.wait_for(updates.get(), timeout=1)
+            monitor._dashboard_dirty.set()
+            await asyncio.wait_for(updates.get(), timeout=1)
+            assert not monitor._dashboard_dirty.is_set()
+        finally:
+            throttle.stop()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    @pytest.mark.asyncio
+    async def test_burst_of_flips_is_coalesced_by_throttle(self):
+        monitor, _, _ = self._monitor()
+        monitor._last_dashboard_update = time.monotonic()
+        monitor._dashboard_dirty.set()
+
+        with patch('src.integrations.project_monitor.DASHBOARD_MIN_EDIT_INTERVAL_SECONDS', 0.2):
+            waiter = asyncio.create_task(monitor._wait_for_dashboard_change())
+            await asyncio.sleep(0.05)
+            assert not waiter.done()
+            # Weiterer Wechsel waehrend des Throttle-Fensters
+            monitor._dashboard_dirty.set()
+            await asyncio.wait_for(waiter, timeout=1)
+
+        assert not monitor._dashboard_dirty.is_set()
+
+    @pytest.mark.asyncio
+    async def test_no_throttle_delay_after_quiet_period(self):
+        monitor, _, _ = self._monitor()
+        monitor._last_dashboard_update = time.monotonic() - 3600
+        monitor._dashboard_dirty.set()
+
+        await asyncio.wait_for(monitor._wait_for_dashboard_change(), timeout=0.5)
+
+    def test_dashboard_embed_uses_presorted_projects(self):
+        config = MagicMock()
+        config.projects = {
+            name: {
+                'enabled': True,
+                'tag': f'[{name.upper()}]',
+                'monitor': {'enabled': True, 'url': f'https://{name}.example'},
+            }
+            for name in ('zeta', 'alpha', 'mid')
+        }
+        config.customer_status_channel = 12345
+        monitor = ProjectMonitor(Mock(), config)
+
+        assert [p.name for p in monitor._sorted_projects] == ['alpha', 'mid', 'zeta']
+        embed = monitor._create_dashboard_embed()
+        assert [f.name for f in embed.fields] == ['🔴 [ALPHA]', '🔴 [MID]', '🔴 [ZETA]']
+
+
+
+class TestDashboardEmbeds:
+    """Render-Ausgabe der Dashboard-Embeds."""
+
+    def _monitor(self):
+        config = MagicMock()
+        config.projects = {
+            'test-project': {
+                'enabled': True,
+                'tag': '[TP]',
+                'monitor': {'enabled': True, 'url': 'https://example.com/health'},
+            }
+        }
+        config.customer_status_channel = 12345
+        monitor = ProjectMonitor(Mock(), config)
+        project = monitor.projects['test-project']
+        project.update_online(120.0)
+        project.health_details = {
+            'latency': {'db_ms': 3, 'redis_ms': None, 'osrm_ms': 9},
+            'version': '1.2.3',
+        }
+        return monitor, project
+
+    def test_main_dashboard_static_parts(self):
+        monitor, _ = self._monitor()
+
+        embed = monitor._create_dashboard_embed()
+
+        assert embed.title == '📊 ShadowOps — Projekt-Dashboard'
+        assert embed.footer.text == 'Aktualisiert bei Statuswechsel, sonst alle 5 Minuten'
+        assert embed.color == discord.Color.green()
+        assert '⚡ DB:3ms · OSRM:9ms' in embed.fields[0].value
+        assert '📦 v1.2.3' in embed.fields[0].value
+
+    def test_main_dashboard_field_lines(self):
+        monitor, project = self._monitor()
+        project.health_details['memory'] = {'rss_mb': 80, 'heap_used_mb': 40}
+
+        embed = monitor._create_dashboard_embed()
+
+        assert embed.fields[0].value.split('\n')[:6] == [
+            '**Online**',
+            'Antwortzeit: 120ms',
+            'Uptime: 100.0%',
+            '⚡ DB:3ms · OSRM:9ms',
+            '💾 RAM: 80 MB · Heap: 40 MB',
+            '📦 v1.2.3',
+        ]
+
+    def test_last_check_is_rendered_from_stored_datetime(self):
+        monitor, project = self._monitor()
+        assert isinstance(project.last_check_time, datetime)
+        project.last_check_time = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+        embed = monitor._create_dashboard_embed()
+
+        assert embed.fields[0].value.endswith('Letzter Check: <t:1767268800:R>')
+
+    def test_elapsed_time_alone_does_not_change_render(self):
+        monitor, project = self._monitor()
+        project.last_check_time = datetime.now(timezone.utc) - timedelta(minutes=1)
+        fingerprint = monitor._dashboard_fingerprint()
+        before = [f.value for f in monitor._create_dashboard_embed().fields]
+
+        with patch('src.integrations.project_monitor.datetime') as fake_dt:
+            fake_dt.now.return_value = datetime.now(timezone.utc) + timedelta(minutes=25)
+            after = [f.value for f in monitor._create_dashboard_embed().fields]
+
+        assert after == before
+        assert monitor._dashboard_fingerprint() == fingerprint
+
+    def test_one_clock_read_per_render(self):
+        config = MagicMock()
+        config.projects = {
+            name: {'enabled': True, 'monitor': {'enabled': True, 'url': f'https://{name}.example'}}
+            for name in ('a', 'b', 'c')
+        }
+        config.customer_status_channel = 12345
+        monitor = ProjectMonitor(Mock(), config)
+        fixed = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+        for project in monitor.projects.values():
+            project.update_online(50.0, now=fixed - timedelta(minutes=2))
+
+        with patch('src.integrations.project_monitor.datetime') as fake_dt:
+            fake_dt.now.return_value = fixed
+            embed = monitor._create_dashboard_embed()
+
+        fake_dt.now.assert_called_once_with(timezone.utc)
+        assert embed.timestamp == fixed
+
+    def test_external_dashboard_latency_and_footer(self):
+        monitor, project = self._monitor()
+        project.update_offline('Timeout')
+
+        embed = monitor._create_single_project_dashboard(project, monitor._project_configs['test-project'])
+
+        fields = {f.name: f.value for f in embed.fields}
+        assert fields['⚡ Latenz'] == 'DB: 3ms · OSRM: 9ms'
+        assert embed.color == discord.Color.red()
+        assert embed.footer.text.startswith('ShadowOps Monitoring • ')
+
+
+class TestRemediation:
+    """_attempt_remediation fuehrt remediation_command mit Zeitbudget aus."""
+
+    def _project(self, command, timeout):
+        project = ProjectStatus('test-project', {
+            'url': 'https://example.com',
+            'remediation_command': command,
+            'remediation_threshold': 1,
+            'remediation_timeout': timeout,
+        })
+        project.update_offline('down')
+        return project
+
+    def _monitor(self):
+        config = MagicMock()
+        config.projects = {}
+        config.customer_status_channel = 12345
+        return ProjectMonitor(Mock(), config)
+
+    def test_timeout_default(self):
+        assert ProjectStatus('p', {}).remediation_timeout == 60
+
+    @pytest.mark.asyncio
+    async def test_hanging_command_is_killed(self, caplog):
+        monitor = self._monitor()
+        project = self._project('sleep 30', timeout=0.2)
+
+        await asyncio.wait_for(monitor._attempt_remediation(project, 'down'), timeout=5)
+
+        assert project.remediation_triggered is True
+        assert 'timed out' in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_fast_command_completes(self, caplog):
+        monitor = self._monitor()
+        project = self._project('echo healed', timeout=5)
+
+        await monitor._attempt_remediation(project, 'down')
+
+        assert 'timed out' not in caplog.text
@@ -31,3 +31,352 @@ def test_get_prompt_ab_testing_custom_dir(mock_init):
     ab_testing = get_prompt_ab_testing(data_dir=custom_dir)
     mock_init.assert_called_once_with(custom_dir)
     assert isinstance(ab_testing, PromptABTesting)
+
+
+# ============================================================================
+# SERIALIZATION
+# ============================================================================
+
+from dataclasses import asdict
+import json
+
+from src.integrations.prompt_ab_testing import PromptVariant, PromptTestResult
+
+
+@pytest.fixture
+def ab_testing(tmp_path):
+    instance = PromptABTesting(tmp_path)
+    yield instance
+    instance.close()
+
+
+class TestSerialization:
+    def test_variant_to_dict_matches_asdict(self):
+        variant = PromptVariant(id='v1', name='N', description='D', template='T {project}',
+                                created_at='2026-01-01T00:00:00+00:00', active=False)
+        assert variant.to_dict() == asdict(variant)
+
+    def test_result_to_dict_matches_asdict(self):
+        result = PromptTestResult(variant_id='v1', project='p', version='1.0',
+                                  quality_score=80.0, user_feedback_score=1.5,
+                                  timestamp='2026-01-01T00:00:00+00:00')
+        assert result.to_dict() == asdict(result)
+
+    @pytest.mark.parametrize('cls', [PromptVariant, PromptTestResult])
+    def test_to_dict_covers_all_dataclass_fields(self, cls):
+        # to_dict ist handgeschrieben — neue Felder muessen dort nachgezogen werden
+        from dataclasses import fields
+        instance = cls(**{f.name: f.name for f in fields(cls)})
+        assert list(instance.to_dict()) == [f.name for f in fields(cls)]
+
+    def test_variants_roundtrip_through_file(self, ab_testing, tmp_path):
+        reloaded = PromptABTesting(tmp_path)
+        assert set(reloaded.variants) == set(ab_testing.variants)
+        assert reloaded.variants['detailed_v1'].template == ab_testing.variants['detailed_v1'].template
+
+    def test_result_timestamp_is_iso_utc(self, ab_testing):
+        # Dateiformat ist dokumentiert (CHANGELOG) — ISO-8601 in UTC, kein Epoch-Float
+        from datetime import datetime, timezone
+        ab_testing.record_result('detailed_v1', 'proj', '1.0', 90.0)
+        ab_testing.flush()
+        row = json.loads(ab_testing.results_file.read_text(encoding='utf-8').splitlines()[0])
+        assert isinstance(row['timestamp'], str)
+        assert datetime.fromisoformat(row['timestamp']).utcoffset() == timezone.utc.utcoffset(None)
+
+    def test_record_result_writes_jsonl_line(self, ab_testing):
+        ab_testing.record_result('detailed_v1', 'proj', '1.0', 90.0, 2.0)
+        ab_testing.flush()
+        lines = ab_testing.results_file.read_text(encoding='utf-8').splitlines()
+        assert len(lines) == 1
+        row = json.loads(lines[0])
+        assert row['variant_id'] == 'detailed_v1'
+        assert row['quality_score'] == 90.0
+
+
+class TestStatisticsCache:
+    def test_unchanged_file_is_not_reparsed(self, ab_testing):
+        ab_testing.record_result('detailed_v1', 'proj', '1.0', 80.0)
+        ab_testing.get_variant_statistics('proj')
+        with patch('builtins.open', side_effect=AssertionError('reparsed')):
+            stats = ab_testing.get_variant_statistics('proj')
+        assert stats['detailed_v1']['count'] == 1
+
+    def test_new_result_invalidates_cache(self, ab_testing):
+        ab_testing.record_result('detailed_v1', 'proj', '1.0', 80.0)
+        ab_testing.get_variant_statistics('proj')
+        ab_testing.record_result('detailed_v1', 'proj', '1.1', 60.0)
+        stats = ab_testing.get_variant_statistics('proj')
+        assert stats['detailed_v1']['count'] == 2
+        assert stats['detailed_v1']['avg_quality_score'] == 70.0
+
+    def test_missing_results_file_returns_empty(self, ab_testing):
+        assert ab_testing.get_variant_statistics() == {}
+
+
+class TestIncrementalAggregates:
+    def test_record_result_updates_aggregates_without_rescan(self, ab_testing):
+        ab_testing.record_result('detailed_v1', 'a', '1.0', 80.0, 10.0)
+        with patch.object(ab_testing, '_rebuild_aggregates',
+                          side_effect=AssertionError('rescan')):
+            ab_testing.record_result('concise_v1', 'b', '1.0', 40.0)
+            stats = ab_testing.get_variant_statistics()
+        assert stats['detailed_v1']['avg_total_score'] == pytest.approx(80 * 0.7 + 10 * 0.3)
+        assert stats['concise_v1']['count'] == 1
+
+    def test_project_filter_uses_per_project_bucket(self, ab_testing):
+        ab_testing.record_result('detailed_v1', 'a', '1.0', 80.0)
+        ab_testing.record_result('detailed_v1', 'b', '1.0', 20.0)
+        assert ab_testing.get_variant_statistics('a')['detailed_v1']['avg_quality_score'] == 80.0
+        assert ab_testing.get_variant_statistics()['detailed_v1']['count'] == 2
+        assert ab_testing.get_variant_statistics('missing') == {}
+
+    def test_aggregates_are_rebuilt_from_existing_file(self, ab_testing, tmp_path):
+        ab_testing.record_result('detailed_v1', 'a', '1.0', 80.0)
+        ab_testing.close()
+        reloaded = PromptABTesting(tmp_path)
+        assert reloaded.get_variant_statistics('a')['detailed_v1']['count'] == 1
+
+    def test_external_append_triggers_rescan(self, ab_testing):
+        ab_testing.record_result('detailed_v1', 'a', '1.0', 80.0)
+        ab_testing.get_variant_statistics()
+        with open(ab_testing.results_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'variant_id': 'concise_v1', 'project': 'a', 'version': '2',
+                                'quality_score': 50.0, 'user_feedback_score': 0.0,
+                                'timestamp': '2026-01-01T00:00:00+00:00'}) + '\n')
+        assert ab_testing.get_variant_statistics()['concise_v1']['count'] == 1
+
+
+class TestBufferedResults:
+    def test_results_are_buffered_until_threshold(self, ab_testing):
+        from src.integrations.prompt_ab_testing import RESULTS_FLUSH_EVERY
+        for i in range(RESULTS_FLUSH_EVERY - 1):
+            ab_testing.record_result('detailed_v1', 'a', str(i), 70.0)
+        assert not ab_testing.results_file.exists() or ab_testing.results_file.stat().st_size == 0
+        ab_testing.record_result('detailed_v1', 'a', 'last', 70.0)
+        lines = ab_testing.results_file.read_text(encoding='utf-8').splitlines()
+        assert len(lines) == RESULTS_FLUSH_EVERY
+
+    def test_buffered_results_count_in_statistics(self, ab_testing):
+        ab_testing.record_result('detailed_v1', 'a', '1', 70.0)
+        assert ab_testing.get_variant_statistics()['detailed_v1']['count'] == 1
+
+    def test_own_flush_does_not_trigger_rescan(self, ab_testing):
+        ab_testing.record_result('detailed_v1', 'a', '1', 70.0)
+        ab_testing.flush()
+        with patch.object(ab_testing, '_rebuild_aggregates',
+                          side_effect=AssertionError('rescan')):
+            assert ab_testing.get_variant_statistics()['detailed_v1']['count'] == 1
+
+    def test_close_flushes_pending_lines(self, ab_testing):
+        ab_testing.record_result('detailed_v1', 'a', '1', 70.0)
+        ab_testing.close()
+        assert len(ab_testing.results_file.read_text(encoding='utf-8').splitlines()) == 1
+
+
+class TestTemplates:
+    def test_builtin_templates_come_from_module_table(self, ab_testing):
+        from src.integrations.prompt_ab_testing import _TEMPLATES
+        assert ab_testing.get_variant_template('detailed_v1', 'en') is _TEMPLATES[('detailed_v1', 'en')]
+        assert ab_testing.get_variant_template('gaming_community_v2', 'de') is _TEMPLATES[('gaming_community_v2', 'de')]
+
+    def test_unknown_language_falls_back_to_german(self, ab_testing):
+        assert ab_testing.get_variant_template('concise_v1', 'fr') == ab_testing.get_variant_template('concise_v1', 'de')
+
+    def test_default_variants_store_german_template(self, ab_testing):
+        from src.integrations.prompt_ab_testing import _TEMPLATES
+        for (variant_id, language), template in _TEMPLATES.items():
+            if language == 'de':
+                assert ab_testing.variants[variant_id].template == template
+
+    def test_custom_variant_uses_stored_template(self, ab_testing):
+        variant_id = ab_testing.add_variant('Custom', 'desc', 'custom {project}')
+        assert ab_testing.get_variant_template(variant_id, 'en') == 'custom {project}'
+
+    def test_unknown_variant_raises(self, ab_testing):
+        with pytest.raises(ValueError):
+            ab_testing.get_variant_template('nope')
+
+
+class TestThompsonSampling:
+    def test_posterior_tracks_quality_as_success_rate(self, ab_testing):
+        ab_testing.record_result('detailed_v1', 'a', '1', 75.0)
+        bucket = ab_testing._agg['detailed_v1']['by_project']['a']
+        assert bucket['alpha'] == pytest.approx(0.75)
+        assert bucket['beta'] == pytest.approx(0.25)
+
+    def test_out_of_range_scores_are_clamped(self, ab_testing):
+        ab_testing.record_result('detailed_v1', 'a', '1', 150.0)
+        bucket = ab_testing._agg['detailed_v1']['all']
+        assert (bucket['alpha'], bucket['beta']) == (1.0, 0.0)
+
+    def test_converges_on_clearly_better_variant(self, ab_testing):
+        for variant_id in list(ab_testing.variants):
+            if variant_id not in ('detailed_v1', 'concise_v1'):
+                ab_testing.deactivate_variant(variant_id)
+        for i in range(40):
+            ab_testing.record_result('detailed_v1', 'a', str(i), 95.0)
+            ab_testing.record_result('concise_v1', 'a', str(i), 5.0)
+
+        picks = [ab_testing.select_variant('a', strategy='thompson').id for _ in range(200)]
+        assert picks.count('detailed_v1') > 190
+
+    def test_unseen_variants_are_still_explored(self, ab_testing):
+        picks = {ab_testing.select_variant('fresh', strategy='thompson').id for _ in range(300)}
+        assert len(picks) > 1
+
+
+class TestFastJsonBackend:
+    @pytest.fixture(params=[True, False], ids=['orjson', 'stdlib'])
+    def backend(self, request, monkeypatch):
+        from src.utils import fast_json as src_fast_json
+        from utils import fast_json as utils_fast_json
+        for module in (src_fast_json, utils_fast_json):
+            if request.param and not module.ORJSON_AVAILABLE:
+                pytest.skip('orjson nicht installiert')
+            monkeypatch.setattr(module, 'ORJSON_AVAILABLE', request.param)
+        return request.param
+
+    def test_results_and_variants_roundtrip(self, backend, tmp_path):
+        ab = PromptABTesting(tmp_path)
+        ab.add_variant('Umlaut', 'Beschreibung äöü', 'Template {project}')
+        ab.record_result('detailed_v1', 'proj', '1.0', 88.0, 1.0)
+        ab.close()
+
+        reloaded = PromptABTesting(tmp_path)
+        try:
+            assert any(v.description == 'Beschreibung äöü' for v in reloaded.variants.values())
+            assert reloaded.get_variant_statistics('proj')['detailed_v1']['count'] == 1
+        finally:
+            reloaded.close()
+
+
+class TestWeightedSelectionCache:
+    def test_cum_weights_reused_until_change(self, ab_testing):
+        ab_testing.record_result('detailed_v1', 'a', '1', 90.0)
+        ab_testing.select_variant('a')
+        with patch.object(ab_testing, 'get_variant_statistics',
+                          side_effect=AssertionError('recomputed')):
+            for _ in range(20):
+                ab_testing.select_variant('a')
+
+    def test_cum_weights_reflect_scores(self, ab_testing):
+        ab_testing.record_result('detailed_v1', 'a', '1', 90.0)
+        active = [v for v in ab_testing.variants.values() if v.active]
+        variants, cum = ab_testing._weighted_selection(active, 'a')
+        weights = [b - a for a, b in zip([0.0] + cum, cum)]
+        by_id = dict(zip((v.id for v in variants), weights))
+        assert by_id['detailed_v1'] == pytest.approx(0.9 * 0.7)
+        assert by_id['concise_v1'] == pytest.approx(0.5)
+
+    @pytest.mark.parametrize('change', ['record', 'add', 'deactivate'])
+    def test_changes_invalidate_cache(self, ab_testing, change):
+        ab_testing.select_variant('a')
+        version = ab_testing._selection_version
+        if change == 'record':
+            ab_testing.record_result('detailed_v1', 'a', '1', 90.0)
+        elif change == 'add':
+            ab_testing.add_variant('New', 'd', 't')
+        else:
+            ab_testing.deactivate_variant('concise_v1')
+        assert ab_testing._selection_version > version
+        picked = {ab_testing.select_variant('a').id for _ in range(200)}
+        if change == 'deactivate':
+            assert 'concise_v1' not in picked
+
+
+class TestActiveVariants:
+    def test_active_list_tracks_add_and_deactivate(self, ab_testing):
+        initial = len(ab_testing._active_variants)
+        variant_id = ab_testing.add_variant('New', 'd', 't')
+        assert ab_testing._active_variants[-1].id == variant_id
+        assert ab_testing.deactivate_variant(variant_id)
+        assert ab_testing.deactivate_variant(variant_id)  # zweimal ist harmlos
+        assert len(ab_testing._active_variants) == initial
+        assert all(v.active for v in ab_testing._active_variants)
+
+    def test_inactive_variants_loaded_from_file_are_excluded(self, ab_testing, tmp_path):
+        ab_testing.deactivate_variant('concise_v1')
+        reloaded = PromptABTesting(tmp_path)
+        try:
+            assert 'concise_v1' not in {v.id for v in reloaded._active_variants}
+            for _ in range(50):
+                assert reloaded.select_variant('p', strategy='random').id != 'concise_v1'
+        finally:
+            reloaded.close()
+
+    def test_no_active_variants_raises(self, ab_testing):
+        for variant_id in list(ab_testing.variants):
+            ab_testing.deactivate_variant(variant_id)
+        with pytest.raises(ValueError):
+            ab_testing.select_variant('p')
+
+
+class TestStatisticsShape:
+    def test_statistics_only_keep_sums_and_averages(self, ab_testing):
+        for i in range(5):
+            ab_testing.record_result('detailed_v1', 'a', str(i), 80.0, 1.0)
+        stats = ab_testing.get_variant_statistics()['detailed_v1']
+        assert set(stats) == {'count', 'total_quality', 'total_feedback',
+                              'avg_quality_score', 'avg_feedback_score', 'avg_total_score'}
+        assert not any(isinstance(v, list) for v in ab_testing._agg['detailed_v1']['all'].values())
+
+
+class TestMalformedResults:
+    def test_malformed_lines_are_skipped(self, tmp_path):
+        results = tmp_path / 'prompt_test_results.jsonl'
+        results.write_text(
+            'not json\n'
+            '[1, 2]\n'
+            '{"variant_id": "detailed_v1", "project": "a", "quality_score": null}\n'
+            '{"variant_id": "detailed_v1", "project": "a", "quality_score": 80, "user_feedback_score": 0}\n',
+            encoding='utf-8')
+        ab = PromptABTesting(tmp_path)
+        try:
+            assert ab.get_variant_statistics()['detailed_v1']['count'] == 1
+        finally:
+            ab.close()
+
+    def test_unexpected_errors_are_not_swallowed_per_line(self, ab_testing, caplog):
+        ab_testing.record_result('detailed_v1', 'a', '1', 80.0)
+        ab_testing.flush()
+        with patch('src.integrations.prompt_ab_testing.fast_json.loads', side_effect=RuntimeError('boom')):
+            ab_testing._rebuild_aggregates()
+        assert 'Failed to calculate variant statistics' in caplog.text
+
+    def test_rows_missing_keys_are_skipped(self, tmp_path):
+        results = tmp_path / 'prompt_test_results.jsonl'
+        results.write_text(
+            '{"variant_id": "detailed_v1", "project": "a", "quality_score": 80}\n'
+            '{"variant_id": "detailed_v1", "project": "a", "quality_score": 60, "user_feedback_score": 0}\n',
+            encoding='utf-8')
+        ab = PromptABTesting(tmp_path)
+        try:
+            assert ab.get_variant_statistics()['detailed_v1']['count'] == 1
+        finally:
+            ab.close()
+
+
+class TestDefaultVariantTimestamps:
+    def test_defaults_share_one_creation_timestamp(self, ab_testing):
+        defaults = [v for v in ab_testing.variants.values() if not v.id.startswith('custom_')]
+        assert len({v.created_at for v in defaults}) == 1
+
+    def test_synced_defaults_share_one_timestamp(self, ab_testing, tmp_path):
+        for variant_id in ('concise_v1', 'community_v1'):
+            del ab_testing.variants[variant_id]
+        ab_testing._save_variants()
+        reloaded = PromptABTesting(tmp_path)
+        try:
+            assert reloaded.variants['concise_v1'].created_at == reloaded.variants['community_v1'].created_at
+        finally:
+            reloaded.close()
+
+
+class TestLogging:
+    def test_result_log_is_formatted_lazily(self, ab_testing, caplog):
+        import logging
+        with caplog.at_level(logging.INFO, logger='shadowops'):
+            ab_testing.record_result('detailed_v1', 'a', '1', 87.25, -1.0)
+        record = next(r for r in caplog.records if 'A/B Test Result' in r.msg)
+        assert record.args == ('detailed_v1', 87.25, -1.0)
+        assert record.getMessage().endswith('variant=detailed_v1, quality=87.2, feedback=-1.0')
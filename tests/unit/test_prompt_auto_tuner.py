@@ -0,0 +1,221 @@
+import pytest
+from unittest.mock import MagicMock
+
+from src.integrations.prompt_auto_tuner import PromptAutoTuner
+
+
+@pytest.fixture
+def tuner(tmp_path):
+    trainer = MagicMock()
+    trainer.training_data_file = tmp_path / 'training_data.jsonl'
+    return PromptAutoTuner(tmp_path, MagicMock(), trainer)
+
+
+NOTES = (
+    "**🆕 Neue Features**\n"
+    "• **Dashboard**: Zeigt jetzt Details\n"
+    "  - Detail eins\n"
+    "  • Detail zwei\n"
+    "- Punkt drei\n"
+    "**🐛 Bugfixes**\n"
+)
+
+
+class TestTextAnalysis:
+    def test_analyze_structure_counts_markers(self, tuner):
+        result = tuner._analyze_structure([NOTES, ""])
+        # '•' x2 + '- ' x2 / 2 texts
+        assert result['avg_bullets'] == 2.0
+        assert result['avg_categories'] == 1.0
+        assert result['avg_sub_bullets'] == 1.0
+
+    def test_analyze_structure_empty(self, tuner):
+        assert tuner._analyze_structure([]) == {
+            'avg_bullets': 0, 'avg_categories': 0, 'avg_sub_bullets': 0,
+        }
+
+    def test_common_words_lowercase_and_filter_short(self, tuner):
+        words = dict(tuner._get_common_words(["Detail detail DETAIL abc Punkt", "detail"]))
+        assert words['detail'] == 4
+        assert words['punkt'] == 1
+        assert 'abc' not in words
+
+
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from src.integrations import prompt_auto_tuner as tuner_module
+
+
+def _write_examples(path, examples):
+    with open(path, 'w', encoding='utf-8') as f:
+        for example in examples:
+            f.write(json.dumps(example) + '\n')
+
+
+def _example(days_ago, score, project='proj', notes='• Feature ä'):
+    ts = datetime.now(timezone.utc) - timedelta(days=days_ago)
+    return {'timestamp': ts.isoformat(), 'project': project,
+            'quality_score': score, 'generated_notes': notes}
+
+
+class TestReverseRead:
+    def test_iter_lines_reversed_across_chunks(self, tmp_path):
+        path = tmp_path / 'lines.jsonl'
+        lines = [f'{{"n": {i}, "txt": "äöü"}}' for i in range(50)]
+        path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+        got = [l.decode('utf-8') for l in tuner_module._iter_lines_reversed(path, chunk_size=7)]
+        assert got == list(reversed(lines))
+
+    def test_iter_lines_reversed_without_trailing_newline(self, tmp_path):
+        path = tmp_path / 'lines.jsonl'
+        path.write_bytes(b'a\nb\nc')
+        assert list(tuner_module._iter_lines_reversed(path)) == [b'c', b'b', b'a']
+
+    def test_analysis_stops_at_cutoff(self, tuner):
+        old = [_example(400 - i, 90) for i in range(50)]
+        recent = [_example(2, 90), _example(1, 40), _example(1, 85, project='other')]
+        _write_examples(tuner.trainer.training_data_file, old + recent)
+
+        with patch.object(tuner_module.fast_json, 'loads', wraps=tuner_module.fast_json.loads) as loads:
+            patterns = tuner.analyze_performance_patterns('proj', days=30)
+
+        # 3 aktuelle + 1 alter Eintrag der den Abbruch ausloest
+        assert loads.call_count == 4
+        assert patterns['high_performers']['count'] == 1
+        assert patterns['low_performers']['count'] == 1
+
+
+class TestCutoffComparison:
+    def test_whole_second_and_fractional_utc_timestamps(self, tuner):
+        base = (datetime.now(timezone.utc) - timedelta(days=1)).replace(microsecond=0)
+        examples = [
+            {'timestamp': base.isoformat(), 'project': 'p', 'quality_score': 90, 'generated_notes': 'a'},
+            {'timestamp': base.replace(microsecond=500).isoformat(), 'project': 'p',
+             'quality_score': 90, 'generated_notes': 'b'},
+        ]
+        _write_examples(tuner.trainer.training_data_file, examples)
+        assert tuner.analyze_performance_patterns('p', days=30)['high_performers']['count'] == 2
+
+    def test_non_utc_offsets_use_datetime_comparison(self, tuner):
+        tz = timezone(timedelta(hours=2))
+        recent = datetime.now(tz) - timedelta(days=1)
+        old = datetime.now(tz) - timedelta(days=60)
+        examples = [
+            {'timestamp': old.isoformat(), 'project': 'p', 'quality_score': 90, 'generated_notes': 'x'},
+            {'timestamp': recent.isoformat(), 'project': 'p', 'quality_score': 90, 'generated_notes': 'y'},
+        ]
+        _write_examples(tuner.trainer.training_data_file, examples)
+        assert tuner.analyze_performance_patterns('p', days=30)['high_performers']['count'] == 1
+
+
+class TestTuningLog:
+    def test_auto_tune_appends_json_line(self, tuner):
+        variant = MagicMock(template='T', name='Base')
+        variant.name = 'Base'
+        tuner.ab_testing.variants = {'v1': variant}
+        tuner.ab_testing.add_variant.return_value = 'custom_1'
+        with patch.object(tuner, 'suggest_prompt_improvements',
+                          return_value=[{'type': 'emphasis', 'suggestion': 'Mehr Details ä', 'rationale': 'r'}]):
+            assert tuner.auto_tune_variant('v1', 'proj') == 'custom_1'
+        row = json.loads(tuner.tuning_log_file.read_text(encoding='utf-8').splitlines()[0])
+        assert row['new_variant_id'] == 'custom_1'
+        assert row['suggestions_applied'][0]['suggestion'] == 'Mehr Details ä'
+
+
+class TestInsights:
+    @staticmethod
+    def _patterns(high_len, low_len, high_sub=0, low_sub=0, high_bullets=0, low_bullets=0):
+        def side(length, sub, bullets):
+            return {'avg_length': length, 'structure_patterns': {
+                'avg_sub_bullets': sub, 'avg_bullets': bullets, 'avg_categories': 0}}
+        return {'high_performers': side(high_len, high_sub, high_bullets),
+                'low_performers': side(low_len, low_sub, low_bullets)}
+
+    def test_insights_are_coded(self, tuner):
+        insights = tuner._generate_insights(self._patterns(2000, 1000, 3, 1, 10, 5))
+        assert [code for code, _ in insights] == [
+            tuner_module.INSIGHT_LONGER_BETTER,
+            tuner_module.INSIGHT_SUB_BULLETS,
+            tuner_module.INSIGHT_MORE_BULLETS,
+        ]
+
+    def test_suggestions_dispatch_on_codes(self, tuner):
+        tuner.ab_testing.get_best_variant.return_value = None
+        insights = [
+            (tuner_module.INSIGHT_CONCISE_BETTER, 'concise msg'),
+            (tuner_module.INSIGHT_SUB_BULLETS, 'sub msg'),
+            (tuner_module.INSIGHT_MORE_BULLETS, 'bullets msg'),
+        ]
+        with patch.object(tuner, 'analyze_performance_patterns', return_value={'insights': insights}):
+            suggestions = tuner.suggest_prompt_improvements('proj')
+        assert [(s['type'], s['rationale']) for s in suggestions] == [
+            ('emphasis', 'concise msg'), ('structure', 'sub msg'),
+        ]
+        assert 'concise' in suggestions[0]['suggestion']
+
+
+class TestMalformedTrainingData:
+    def test_malformed_lines_are_skipped(self, tuner):
+        good = _example(1, 90)
+        path = tuner.trainer.training_data_file
+        path.write_text(
+            json.dumps(good) + '\n'
+            + 'garbage\n'
+            + '[]\n'
+            + json.dumps({'timestamp': 5, 'quality_score': 90}) + '\n'
+            + json.dumps({**good, 'quality_score': None}) + '\n',
+            encoding='utf-8')
+        assert tuner.analyze_performance_patterns('proj')['high_performers']['count'] == 1
+
+    def test_rows_missing_keys_are_skipped(self, tuner):
+        good = _example(1, 90)
+        partial = {k: v for k, v in good.items() if k != 'quality_score'}
+        _write_examples(tuner.trainer.training_data_file, [good, partial])
+        assert tuner.analyze_performance_patterns('proj')['high_performers']['count'] == 1
+
+
+class TestCommonWords:
+    def test_top_n_and_ordering(self, tuner):
+        texts = ["alpha alpha alpha beta1 beta1 gamma", "alpha beta1 delta,"]
+        assert tuner._get_common_words(texts, top_n=2) == [('alpha', 4), ('beta1', 3)]
+
+    def test_empty_input(self, tuner):
+        assert tuner._get_common_words([]) == []
+
+
+class TestPatternCache:
+    def test_repeated_analysis_hits_cache(self, tuner):
+        _write_examples(tuner.trainer.training_data_file, [_example(1, 90)])
+        first = tuner.analyze_performance_patterns('proj')
+        with patch.object(tuner, '_compute_performance_patterns',
+                          side_effect=AssertionError('recomputed')):
+            assert tuner.analyze_performance_patterns('proj') is first
+
+    def test_file_change_invalidates(self, tuner):
+        path = tuner.trainer.training_data_file
+        _write_examples(path, [_example(1, 90)])
+        tuner.analyze_performance_patterns('proj')
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(_example(0, 95)) + '\n')
+        assert tuner.analyze_performance_patterns('proj')['high_performers']['count'] == 2
+
+    def test_ttl_expiry_recomputes(self, tuner):
+        _write_examples(tuner.trainer.training_data_file, [_example(1, 90)])
+        with patch.object(tuner_module.time, 'monotonic', return_value=1000.0):
+            tuner.analyze_performance_patterns('proj')
+        later = 1000.0 + tuner_module.PATTERN_CACHE_TTL_SECONDS + 1
+        with patch.object(tuner_module.time, 'monotonic', return_value=later), \
+                patch.object(tuner, '_compute_performance_patterns', return_value={'x': 1}) as compute:
+            assert tuner.analyze_performance_patterns('proj') == {'x': 1}
+        compute.assert_called_once()
+
+    def test_cache_is_bounded(self, tuner):
+        _write_examples(tuner.trainer.training_data_file, [_example(1, 90)])
+        for days in range(1, tuner_module.PATTERN_CACHE_SIZE + 5):
+            tuner.analyze_performance_patterns('proj', days=days)
+        assert len(tuner._patterns_cache) == tuner_module.PATTERN_CACHE_SIZE
+
+    def test_missing_file_returns_empty(self, tuner):
+        assert tuner.analyze_performance_patterns('proj') == {}
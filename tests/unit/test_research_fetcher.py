@@ -0,0 +1,342 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.integrations import research_fetcher
+from src.integrations.research_fetcher import ResearchFetcher
+
+PYPI_URL = "https://pypi.org/pypi/httpx/json"
+
+
+def _fetcher(handler):
+    fetcher = ResearchFetcher()
+    fetcher._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return fetcher
+
+
+class TestClientReuse:
+    @pytest.mark.asyncio
+    async def test_fetches_share_one_client(self):
+        seen = []
+
+        def handler(request):
+            seen.append(str(request.url))
+            return httpx.Response(200, json={"info": {"name": "httpx"}})
+
+        fetcher = _fetcher(handler)
+        client = fetcher._client
+
+        assert await fetcher.fetch(PYPI_URL, expect_json=True) == {"info": {"name": "httpx"}}
+        await fetcher.fetch(PYPI_URL)
+
+        assert fetcher._get_client() is client
+        assert len(seen) == 2
+        await fetcher.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_resets_client(self):
+        fetcher = ResearchFetcher()
+        client = fetcher._get_client()
+
+        await fetcher.aclose()
+
+        assert client.is_closed
+        assert fetcher._client is None
+        await fetcher.aclose()  # idempotent
+
+    @pytest.mark.asyncio
+    async def test_blocked_url_never_builds_client(self):
+        fetcher = ResearchFetcher()
+
+        assert await fetcher.fetch("https://example.com/evil") is None
+        assert fetcher._client is None
+
+
+class TestByteBudget:
+    @pytest.mark.asyncio
+    async def test_declared_oversize_is_rejected(self):
+        def handler(request):
+            return httpx.Response(200, headers={"content-length": "999999"}, content=b"x")
+
+        fetcher = _fetcher(handler)
+        assert await fetcher.fetch(PYPI_URL) is None
+        await fetcher.aclose()
+
+    @pytest.mark.asyncio
+    async def test_streamed_oversize_is_aborted(self):
+        pulled = 0
+
+        async def body():
+            nonlocal pulled
+            for _ in range(100):
+                pulled += 1
+                yield b"x" * 10_000
+
+        def handler(request):
+            return httpx.Response(200, content=body())
+
+        fetcher = _fetcher(handler)
+        fetcher.max_bytes = 25_000
+
+        assert await fetcher.fetch(PYPI_URL) is None
+        assert pulled < 100
+        await fetcher.aclose()
+
+    @pytest.mark.asyncio
+    async def test_body_within_budget_is_decoded(self):
+        def handler(request):
+            return httpx.Response(200, content="grüße".encode() + b"\xff")
+
+        fetcher = _fetcher(handler)
+        assert await fetcher.fetch(PYPI_URL) == "grüße"
+        await fetcher.aclose()
+
+
+class TestCache:
+    def _counting(self, payload=b'{"v": 1}'):
+        calls = []
+
+        def handler(request):
+            calls.append(str(request.url))
+            return httpx.Response(200, content=payload)
+
+        return _fetcher(handler), calls
+
+    @pytest.mark.asyncio
+    async def test_repeat_fetch_is_served_from_cache(self):
+        fetcher, calls = self._counting()
+
+        first = await fetcher.fetch(PYPI_URL, expect_json=True)
+        second = await fetcher.fetch(PYPI_URL, expect_json=True)
+
+        assert first == second == {"v": 1}
+        assert len(calls) == 1
+        await fetcher.aclose()
+
+    @pytest.mark.asyncio
+    async def test_text_and_json_are_cached_separately(self):
+        fetcher, calls = self._counting()
+
+        assert await fetcher.fetch(PYPI_URL, expect_json=True) == {"v": 1}
+        assert await fetcher.fetch(PYPI_URL) == '{"v": 1}'
+        assert len(calls) == 2
+        await fetcher.aclose()
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_refetched(self):
+        fetcher, calls = self._counting()
+        fetcher._cache_ttl = 0
+
+        await fetcher.fetch(PYPI_URL)
+        await fetcher.fetch(PYPI_URL)
+
+        assert len(calls) == 2
+        await fetcher.aclose()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_refetch(self):
+        fetcher, calls = self._counting()
+
+        await fetcher.fetch(PYPI_URL)
+        fetcher.invalidate(PYPI_URL)
+        await fetcher.fetch(PYPI_URL)
+
+        assert len(calls) == 2
+        await fetcher.aclose()
+
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded_lru(self):
+        fetcher, _ = self._counting()
+        fetcher._cache_max = 2
+
+        for name in ("a", "b", "c"):
+            await fetcher.fetch(f"https://pypi.org/pypi/{name}/json")
+
+        assert [url for url, _ in fetcher._cache] == [
+            "https://pypi.org/pypi/b/json",
+            "https://pypi.org/pypi/c/json",
+        ]
+        await fetcher.aclose()
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self):
+        def handler(request):
+            return httpx.Response(200, content=b"not json")
+
+        fetcher = _fetcher(handler)
+
+        assert await fetcher.fetch(PYPI_URL, expect_json=True) is None
+        assert fetcher._cache == {}
+        await fetcher.aclose()
+
+
+class TestAllowlist:
+    @pytest.mark.parametrize("url", [
+        "https://pypi.org/pypi/httpx/json",
+        "https://registry.npmjs.org/react",
+        "https://api.github.com/repos/encode/httpx",
+        "https://raw.githubusercontent.com/encode/httpx/master/README.md",
+    ])
+    def test_allowed_prefixes(self, url):
+        assert ResearchFetcher()._is_allowed(url)
+
+    @pytest.mark.parametrize("url", [
+        "http://pypi.org/pypi/httpx/json",
+        "https://pypi.org.evil.com/pypi/x",
+        "https://api.github.com/users/x",
+        "",
+    ])
+    def test_rejected_urls(self, url):
+        assert not ResearchFetcher()._is_allowed(url)
+
+
+class TestJsonParsing:
+    @pytest.mark.asyncio
+    async def test_large_json_is_parsed_off_loop(self, monkeypatch):
+        offloaded = []
+        real_to_thread = asyncio.to_thread
+
+        async def spy(func, *args):
+            offloaded.append(func)
+            return await real_to_thread(func, *args)
+
+        monkeypatch.setattr("src.integrations.research_fetcher.asyncio.to_thread", spy)
+        payload = {"releases": {f"1.{i}": [] for i in range(5000)}}
+
+        fetcher = _fetcher(lambda request: httpx.Response(200, json=payload))
+        assert await fetcher.fetch(PYPI_URL, expect_json=True) == payload
+        assert offloaded == [research_fetcher.fast_json.loads]
+        await fetcher.aclose()
+
+    @pytest.mark.asyncio
+    async def test_small_json_is_parsed_inline(self, monkeypatch):
+        async def forbidden(*args):
+            raise AssertionError("small body must not use a thread")
+
+        monkeypatch.setattr("src.integrations.research_fetcher.asyncio.to_thread", forbidden)
+
+        fetcher = _fetcher(lambda request: httpx.Response(200, json={"ok": True}))
+        assert await fetcher.fetch(PYPI_URL, expect_json=True) == {"ok": True}
+        await fetcher.aclose()
+
+
+class TestRateLimits:
+    @pytest.fixture
+    def sleeps(self, monkeypatch):
+        delays = []
+
+        async def fake_sleep(delay):
+            delays.append(delay)
+
+        monkeypatch.setattr("src.integrations.research_fetcher.asyncio.sleep", fake_sleep)
+        return delays
+
+    @pytest.mark.asyncio
+    async def test_429_honors_retry_after(self, sleeps):
+        responses = iter([
+            httpx.Response(429, headers={"retry-after": "2"}),
+            httpx.Response(200, json={"ok": True}),
+        ])
+
+        fetcher = _fetcher(lambda request: next(responses))
+        assert await fetcher.fetch(PYPI_URL, expect_json=True) == {"ok": True}
+        assert sleeps == [2.0]
+        await fetcher.aclose()
+
+    @pytest.mark.asyncio
+    async def test_5xx_backs_off_exponentially_and_gives_up(self, sleeps):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503, content=b"down")
+
+        fetcher = _fetcher(handler)
+        await fetcher.fetch(PYPI_URL)
+
+        assert len(calls) == research_fetcher.MAX_RETRIES + 1
+        assert [int(d) for d in sleeps] == [1, 2, 4]
+        await fetcher.aclose()
+
+    def test_retry_after_is_capped(self):
+        resp = httpx.Response(429, headers={"retry-after": "3600"})
+        assert ResearchFetcher._retry_delay(resp, 0) == research_fetcher.MAX_BACKOFF_SECONDS
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_limited_per_host(self):
+        active = peak = 0
+
+        async def handler(request):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return httpx.Response(200, content=b"ok")
+
+        fetcher = _fetcher(handler)
+        await asyncio.gather(*(
+            fetcher.fetch(f"https://pypi.org/pypi/pkg{i}/json") for i in range(12)
+        ))
+
+        assert peak == research_fetcher.HOST_CONCURRENCY_LIMIT
+        await fetcher.aclose()
+
+
+class TestSingleDecode:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("expect_json, expected", [(True, {"v": 1}), (False, '{"v": 1}')])
+    async def test_body_is_decoded_once_from_raw_bytes(self, monkeypatch, expect_json, expected):
+        def forbidden(self, *args, **kwargs):
+            raise AssertionError("httpx decode helper used")
+
+        fetcher = _fetcher(lambda request: httpx.Response(200, content=b'{"v": 1}'))
+        monkeypatch.setattr(httpx.Response, "text", property(forbidden))
+        monkeypatch.setattr(httpx.Response, "json", forbidden)
+        monkeypatch.setattr(httpx.Response, "content", property(forbidden))
+
+        assert await fetcher.fetch(PYPI_URL, expect_json=expect_json) == expected
+        await fetcher.aclose()
+
+
+class TestInflightDedup:
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_share_one_request(self):
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"v": 1})
+
+        fetcher = _fetcher(handler)
+        results = await asyncio.gather(*(
+            fetcher.fetch(PYPI_URL, expect_json=True) for _ in range(5)
+        ))
+
+        assert results == [{"v": 1}] * 5
+        assert len(calls) == 1
+        assert fetcher._inflight == {}
+        await fetcher.aclose()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_abort_shared_fetch(self):
+        release = asyncio.Event()
+
+        async def handler(request):
+            await release.wait()
+            return httpx.Response(200, content=b"ok")
+
+        fetcher = _fetcher(handler)
+        first = asyncio.create_task(fetcher.fetch(PYPI_URL))
+        second = asyncio.create_task(fetcher.fetch(PYPI_URL))
+        await asyncio.sleep(0.01)
+
+        first.cancel()
+        release.set()
+
+        assert await second == "ok"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        await fetcher.aclose()
@@ -0,0 +1,669 @@
+import ast
+import asyncio
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.integrations.event_watcher import SecurityEvent
+from src.integrations.self_healing import (
+    CircuitBreaker, RemediationAttempt, RemediationJob, SelfHealingCoordinator,
+)
+
+
+def _event(n, source='crowdsec', severity='HIGH'):
+    return SecurityEvent(
+        source=source,
+        event_type='threat',
+        severity=severity,
+        details={'n': n},
+        timestamp=datetime(2026, 1, 1, 12, 0, n),
+        event_id=f'{source}_{n}',
+    )
+
+
+def _queued(coord):
+    """event_ids in der Worker-Queue (Reihenfolge bleibt erhalten)."""
+    ids = []
+    while not coord._pending.empty():
+        ids.append(coord._pending.get_nowait())
+    for event_id in ids:
+        coord._pending.put_nowait(event_id)
+    return ids
+
+
+@pytest.fixture
+def coordinator():
+    config = SimpleNamespace(auto_remediation={'approval_mode': 'balanced'})
+    coord = SelfHealingCoordinator(Mock(), config)
+    coord._request_approval = AsyncMock()
+    return coord
+
+
+class TestJobIndex:
+    @pytest.mark.asyncio
+    async def test_new_events_wait_for_approval(self, coordinator):
+        await coordinator.handle_event(_event(1))
+
+        assert list(coordinator._awaiting_approval) == ['crowdsec_1']
+        assert _queued(coordinator) == []
+        assert coordinator.get_statistics()['pending_jobs'] == 1
+
+    @pytest.mark.asyncio
+    async def test_approve_moves_job_to_pending_fifo(self, coordinator):
+        for n in range(3):
+            await coordinator.handle_event(_event(n))
+
+        assert await coordinator.approve_job('crowdsec_2') is True
+        assert await coordinator.approve_job('crowdsec_0') is True
+        assert await coordinator.approve_job('crowdsec_0') is False
+
+        assert _queued(coordinator) == ['crowdsec_2', 'crowdsec_0']
+        assert list(coordinator._awaiting_approval) == ['crowdsec_1']
+        assert coordinator._jobs['crowdsec_2'].approval_required is False
+
+    @pytest.mark.asyncio
+    async def test_reject_drops_job(self, coordinator):
+        await coordinator.handle_event(_event(1))
+
+        assert await coordinator.reject_job('crowdsec_1') is True
+        assert await coordinator.reject_job('crowdsec_1') is False
+        assert coordinator._jobs == {}
+        assert coordinator.completed_jobs[-1].status == 'rejected'
+
+    @pytest.mark.asyncio
+    async def test_worker_runs_approved_jobs_in_order(self, coordinator):
+        executed = []
+
+        async def execute(job):
+            executed.append(job.event.event_id)
+            coordinator.active_jobs.pop(job.event.event_id)
+
+        coordinator._execute_remediation = execute
+        for n in range(3):
+            await coordinator.handle_event(_event(n))
+        await coordinator.approve_job('crowdsec_1')
+        await coordinator.approve_job('crowdsec_0')
+
+        await coordinator._process_next_job()
+        await coordinator._process_next_job()
+
+        assert executed == ['crowdsec_1', 'crowdsec_0']
+        assert list(coordinator._jobs) == ['crowdsec_2']
+
+    @pytest.mark.asyncio
+    async def test_stopped_job_is_skipped_by_worker(self, coordinator):
+        coordinator._execute_remediation = AsyncMock()
+        await coordinator.handle_event(_event(1))
+        await coordinator.approve_job('crowdsec_1')
+        coordinator._jobs.clear()
+
+        await coordinator._process_next_job()
+
+        coordinator._execute_remediation.assert_not_awaited()
+
+
+    @pytest.mark.asyncio
+    async def test_completed_history_is_bounded(self, coordinator):
+        coordinator._send_success_notification = AsyncMock()
+        coordinator.completed_jobs = type(coordinator.completed_jobs)(maxlen=3)
+        for n in range(5):
+            await coordinator._handle_success(Mock(event=_event(n), attempts=[]))
+        await coordinator.handle_event(_event(9))
+        await coordinator.reject_job('crowdsec_9')
+
+        assert [job.event.event_id for job in coordinator.completed_jobs] == [
+            'crowdsec_3', 'crowdsec_4', 'crowdsec_9',
+        ]
+
+    @pytest.mark.asyncio
+    async def test_stop_all_jobs_clears_every_index(self, coordinator):
+        for n in range(2):
+            await coordinator.handle_event(_event(n))
+        await coordinator.approve_job('crowdsec_0')
+
+        assert await coordinator.stop_all_jobs() == 2
+        assert _queued(coordinator) == []
+        assert not coordinator._awaiting_approval
+        assert not coordinator._jobs
+
+
+class TestEventDrivenWorker:
+    @pytest.mark.asyncio
+    async def test_approval_wakes_idle_worker_immediately(self, coordinator):
+        done = asyncio.Event()
+
+        async def execute(job):
+            coordinator.active_jobs.pop(job.event.event_id)
+            done.set()
+
+        coordinator._execute_remediation = execute
+        await coordinator.start()
+        try:
+            await asyncio.sleep(0.05)  # Worker wartet idle auf der Queue
+            await coordinator.handle_event(_event(1))
+            await coordinator.approve_job('crowdsec_1')
+            await asyncio.wait_for(done.wait(), timeout=1)
+        finally:
+            await coordinator.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_attempt_is_requeued_after_delay(self, coordinator, monkeypatch):
+        monkeypatch.setattr('src.integrations.self_healing.RETRY_DELAY_SECONDS', 0.05)
+        coordinator._send_failure_notification = AsyncMock()
+        await coordinator.handle_event(_event(1))
+        await coordinator.approve_job('crowdsec_1')
+        job = coordinator._jobs['crowdsec_1']
+
+        async def fail(job):
+            job.attempts.append(Mock())
+            await coordinator._handle_failure(job, 'boom')
+
+        coordinator._execute_remediation = fail
+        await coordinator._process_next_job()
+
+        assert coordinator._jobs == {'crowdsec_1': job}
+        assert job.next_retry_at is not None
+        assert _queued(coordinator) == []
+        await asyncio.sleep(0.1)
+        assert _queued(coordinator) == ['crowdsec_1']
+
+    @pytest.mark.parametrize('failed, expected', [(0, 5), (1, 5), (2, 10), (3, 20), (10, 300)])
+    def test_retry_delay_backs_off_exponentially(self, failed, expected):
+        delay = SelfHealingCoordinator._retry_delay(failed)
+        assert expected * 0.9 <= delay <= expected * 1.1
+
+    def test_retry_delay_is_jittered(self):
+        delays = {SelfHealingCoordinator._retry_delay(2) for _ in range(20)}
+        assert len(delays) > 1
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_defers_job_without_blocking_worker(self, coordinator, monkeypatch):
+        deferred = []
+        loop = asyncio.get_running_loop()
+        monkeypatch.setattr(loop, 'call_later', lambda delay, cb, *args: deferred.append(delay) or cb(*args))
+        coordinator._execute_remediation = AsyncMock()
+        breaker = coordinator._breaker_for('crowdsec')
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        await coordinator.handle_event(_event(1))
+        await coordinator.approve_job('crowdsec_1')
+
+        await coordinator._process_next_job()
+
+        coordinator._execute_remediation.assert_not_awaited()
+        assert deferred == [60]
+        assert 'crowdsec_1' in coordinator._jobs
+        breaker.record_success()
+        await asyncio.wait_for(coordinator._process_next_job(), timeout=1)
+        coordinator._execute_remediation.assert_awaited_once()
+
+
+class TestWorkerPool:
+    def test_concurrency_from_config(self):
+        config = SimpleNamespace(auto_remediation={'concurrency': 3})
+        assert SelfHealingCoordinator(Mock(), config).worker_count == 3
+
+        config = SimpleNamespace(auto_remediation={'concurrency': 0})
+        assert SelfHealingCoordinator(Mock(), config).worker_count == 1
+
+    @pytest.mark.asyncio
+    async def test_jobs_run_concurrently_up_to_pool_size(self, coordinator):
+        coordinator.worker_count = 2
+        release = asyncio.Event()
+        running = []
+
+        async def execute(job):
+            running.append(job.event.event_id)
+            await release.wait()
+            coordinator.active_jobs.pop(job.event.event_id)
+
+        coordinator._execute_remediation = execute
+        for n in range(3):
+            await coordinator.handle_event(_event(n))
+            await coordinator.approve_job(f'crowdsec_{n}')
+
+        await coordinator.start()
+        try:
+            await asyncio.sleep(0.05)
+            assert running == ['crowdsec_0', 'crowdsec_1']
+            release.set()
+            await asyncio.sleep(0.05)
+            assert running == ['crowdsec_0', 'crowdsec_1', 'crowdsec_2']
+        finally:
+            await coordinator.stop()
+
+        assert coordinator.worker_tasks == []
+
+
+class TestStrategyGeneration:
+    @pytest.fixture(autouse=True)
+    def ai_on_first_attempt(self, coordinator):
+        coordinator.fallback_first_attempt = False
+
+    @pytest.mark.asyncio
+    async def test_one_ai_call_per_attempt_with_job_context(self, coordinator):
+        coordinator.ai_service = Mock()
+        coordinator.ai_service.generate_fix_strategy = AsyncMock(return_value={'confidence': 0.9})
+        job = RemediationJob(event=_event(1), attempts=[
+            Mock(strategy='ban ip', result='failed', error_message='nft missing'),
+        ])
+
+        assert await coordinator._generate_fix_strategy(job) == {'confidence': 0.9}
+
+        coordinator.ai_service.generate_fix_strategy.assert_awaited_once_with({
+            'event': _event(1).to_dict(),
+            'previous_attempts': [{'strategy': 'ban ip', 'result': 'failed', 'error': 'nft missing'}],
+        })
+
+    @pytest.mark.asyncio
+    async def test_event_dict_is_built_once_per_job(self, coordinator, monkeypatch):
+        coordinator.ai_service = Mock()
+        coordinator.ai_service.generate_fix_strategy = AsyncMock(return_value=None)
+        job = RemediationJob(event=_event(1))
+        calls = []
+        monkeypatch.setattr(SecurityEvent, 'to_dict', lambda ev: calls.append(ev) or {'source': ev.source})
+
+        await coordinator._generate_fix_strategy(job)
+        job.attempts.append(Mock(strategy='ban ip', result='failed', error_message=None))
+        await coordinator._generate_fix_strategy(job)
+
+        assert len(calls) == 1
+
+    @pytest.mark.parametrize('use_orjson', [True, False], ids=['orjson', 'stdlib'])
+    def test_strategy_key_ignores_event_identity(self, monkeypatch, use_orjson):
+        from src.integrations import self_healing
+        if use_orjson and not self_healing.fast_json.ORJSON_AVAILABLE:
+            pytest.skip('orjson nicht installiert')
+        monkeypatch.setattr(self_healing.fast_json, 'ORJSON_AVAILABLE', use_orjson)
+
+        def key(n, details):
+            event = _event(n)
+            event.details = details
+            return SelfHealingCoordinator._strategy_key({'event': event.to_dict(), 'previous_attempts': []})
+
+        assert key(1, {'ip': '1.2.3.4', 'at': datetime(2026, 1, 1)}) == key(2, {'at': datetime(2026, 1, 1), 'ip': '1.2.3.4'})
+        assert key(1, {'ip': '1.2.3.4'}) != key(1, {'ip': '5.6.7.8'})
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_events_share_one_ai_call(self, coordinator):
+        release = asyncio.Event()
+
+        async def generate(context):
+            await release.wait()
+            return {'confidence': 0.9}
+
+        coordinator.ai_service = Mock()
+        coordinator.ai_service.generate_fix_strategy = AsyncMock(side_effect=generate)
+        # gleiche Bedrohung, unterschiedliche event_id/timestamp
+        jobs = [RemediationJob(event=_event(n), attempts=[]) for n in range(3)]
+        for job in jobs:
+            job.event.details = {'ip': '1.2.3.4'}
+
+        waiters = [asyncio.create_task(coordinator._generate_fix_strategy(job)) for job in jobs]
+        await asyncio.sleep(0.01)
+        release.set()
+
+        assert await asyncio.gather(*waiters) == [{'confidence': 0.9}] * 3
+        assert coordinator.ai_service.generate_fix_strategy.await_count == 1
+        assert coordinator._strategy_inflight == {}
+
+        # kalte Wiederholung innerhalb der TTL kommt aus dem Cache
+        await coordinator._generate_fix_strategy(RemediationJob(event=jobs[0].event, attempts=[]))
+        assert coordinator.ai_service.generate_fix_strategy.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_different_attempt_history_gets_own_call(self, coordinator):
+        coordinator.ai_service = Mock()
+        coordinator.ai_service.generate_fix_strategy = AsyncMock(return_value={'confidence': 0.9})
+        failed = Mock(strategy='ban ip', result='failed', error_message='nft missing')
+
+        await coordinator._generate_fix_strategy(RemediationJob(event=_event(1), attempts=[]))
+        await coordinator._generate_fix_strategy(RemediationJob(event=_event(1), attempts=[failed]))
+
+        assert coordinator.ai_service.generate_fix_strategy.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_generation_is_not_cached(self, coordinator):
+        coordinator.ai_service = Mock()
+        coordinator.ai_service.generate_fix_strategy = AsyncMock(side_effect=[RuntimeError('cli'), None, {'confidence': 0.9}])
+        job = RemediationJob(event=_event(1), attempts=[])
+
+        assert await coordinator._generate_fix_strategy(job) is None
+        assert await coordinator._generate_fix_strategy(job) is None
+        assert await coordinator._generate_fix_strategy(job) == {'confidence': 0.9}
+        assert coordinator._strategy_cache_get(coordinator._strategy_key({
+            'event': _event(1).to_dict(), 'previous_attempts': [],
+        })) == {'confidence': 0.9}
+
+    @pytest.mark.asyncio
+    async def test_streaming_calls_bypass_dedup(self, coordinator):
+        coordinator.ai_service = Mock()
+        coordinator.ai_service.generate_fix_strategy = AsyncMock(return_value={'confidence': 0.9})
+        job = RemediationJob(event=_event(1), attempts=[])
+
+        await coordinator._generate_fix_strategy(job, streaming_state={'token_count': 0})
+        await coordinator._generate_fix_strategy(job, streaming_state={'token_count': 0})
+
+        assert coordinator.ai_service.generate_fix_strategy.await_count == 2
+        assert not coordinator._strategy_cache
+
+
+class TestFallbackStrategy:
+    @pytest.mark.parametrize('source, confidence', [
+        ('trivy', 0.7), ('crowdsec', 0.9), ('fail2ban', 0.8), ('aide', 0.6), ('unknown', 0.3),
+    ])
+    def test_table_lookup_per_source(self, coordinator, source, confidence):
+        strategy = coordinator._get_fallback_strategy(_event(1, source=source))
+
+        assert strategy['confidence'] == confidence
+        assert isinstance(strategy['steps'], tuple)
+
+    def test_same_table_entry_is_returned(self, coordinator):
+        first = coordinator._get_fallback_strategy(_event(1))
+        assert coordinator._get_fallback_strategy(_event(2)) is first
+
+
+class TestApprovalFallback:
+    STRATEGY = {'confidence': 0.9}
+
+    @pytest.mark.parametrize('mode, severity, expected', [
+        ('paranoid', 'LOW', True),
+        ('balanced', 'HIGH', True),
+        ('balanced', 'MEDIUM', False),
+        ('aggressive', 'HIGH', False),
+        ('aggressive', 'CRITICAL', True),
+    ])
+    def test_severity_sets_per_mode(self, mode, severity, expected):
+        coord = SelfHealingCoordinator(Mock(), SimpleNamespace(auto_remediation={'approval_mode': mode}))
+        event = _event(1, source='trivy', severity=severity)
+
+        assert coord._requires_approval(event, self.STRATEGY) is expected
+
+    def test_balanced_fail2ban_uses_activity_check(self, coordinator):
+        coordinator._is_suspicious_fail2ban_activity = Mock(return_value=False)
+        event = _event(1, source='fail2ban', severity='CRITICAL')
+
+        assert coordinator._requires_approval(event, self.STRATEGY) is False
+        coordinator._is_suspicious_fail2ban_activity.assert_called_once_with(event)
+
+
+class TestFixDispatch:
+    @pytest.mark.asyncio
+    async def test_source_routes_to_registered_handler(self, coordinator):
+        handler = AsyncMock(return_value={'status': 'success'})
+        coordinator._fix_handlers['crowdsec'] = handler
+        event = _event(1)
+
+        assert await coordinator._apply_fix(event, {}) == {'status': 'success'}
+        handler.assert_awaited_once_with(event, {})
+
+    @pytest.mark.asyncio
+    async def test_unknown_source_fails_without_handler(self, coordinator):
+        result = await coordinator._apply_fix(_event(1, source='nmap'), {})
+        assert result == {'status': 'failed', 'error': 'Unknown source: nmap'}
+
+    @pytest.mark.asyncio
+    async def test_handler_exception_becomes_failed_result(self, coordinator):
+        coordinator._fix_handlers['crowdsec'] = AsyncMock(side_effect=RuntimeError('nft'))
+        assert await coordinator._apply_fix(_event(1), {}) == {'status': 'failed', 'error': 'nft'}
+
+
+class TestCircuitBreakerClock:
+    def test_timeout_uses_monotonic_clock(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr('src.integrations.self_healing.time.monotonic', lambda: now[0])
+        breaker = CircuitBreaker(failure_threshold=1, timeout_seconds=60)
+
+        breaker.record_failure()
+        assert breaker.can_attempt() is False
+        assert breaker.time_until_retry() == 60
+
+        now[0] += 61
+        assert breaker.can_attempt() is True
+        assert breaker.state == 'HALF_OPEN'
+
+    @pytest.fixture
+    def half_open(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr('src.integrations.self_healing.time.monotonic', lambda: now[0])
+        breaker = CircuitBreaker(failure_threshold=1, timeout_seconds=60, success_threshold=2)
+        breaker.record_failure()
+        now[0] += 61
+        return breaker
+
+    def test_half_open_allows_one_probe_at_a_time(self, half_open):
+        assert half_open.can_attempt() is True
+        assert half_open.state == 'HALF_OPEN'
+        assert half_open.can_attempt() is False
+
+        half_open.record_success()
+        assert half_open.state == 'HALF_OPEN'
+        assert half_open.can_attempt() is True
+        assert half_open.can_attempt() is False
+
+        half_open.record_success()
+        assert half_open.state == 'CLOSED'
+        assert half_open.can_attempt() is True
+
+    def test_failed_probe_reopens(self, half_open):
+        assert half_open.can_attempt() is True
+        half_open.record_failure()
+
+        assert half_open.state == 'OPEN'
+        assert half_open.can_attempt() is False
+
+    def test_status_reports_wall_clock_failure_time(self):
+        breaker = CircuitBreaker()
+        assert breaker.get_status()['last_failure'] is None
+
+        breaker.record_failure()
+        last = datetime.fromisoformat(breaker.get_status()['last_failure'])
+        assert abs((datetime.now() - last).total_seconds()) < 1
+
+
+class TestSourceBulkheads:
+    @pytest.mark.asyncio
+    async def test_failures_trip_only_their_own_breaker(self, coordinator):
+        coordinator._send_failure_notification = AsyncMock()
+        threshold = coordinator._breaker_for('trivy').failure_threshold
+        for n in range(threshold):
+            await coordinator._handle_failure(RemediationJob(event=_event(n, source='trivy'), max_attempts=0), 'boom')
+
+        assert coordinator._breaker_for('trivy').can_attempt() is False
+        assert coordinator._breaker_for('crowdsec').can_attempt() is True
+        stats = coordinator.get_statistics()['circuit_breakers']
+        assert stats['trivy']['state'] == 'OPEN'
+        assert stats['crowdsec']['state'] == 'CLOSED'
+
+    @pytest.mark.asyncio
+    async def test_busy_source_is_parked_while_others_run(self, coordinator):
+        coordinator.source_concurrency = 1
+        release = asyncio.Event()
+        started = []
+
+        async def execute(job):
+            started.append(job.event.event_id)
+            if job.event.source == 'trivy':
+                await release.wait()
+            coordinator.active_jobs.pop(job.event.event_id)
+
+        coordinator._execute_remediation = execute
+        for event in (_event(1, source='trivy'), _event(2, source='trivy'), _event(3)):
+            await coordinator.handle_event(event)
+            await coordinator.approve_job(event.event_id)
+
+        first = asyncio.create_task(coordinator._process_next_job())
+        await asyncio.sleep(0)
+        await coordinator._process_next_job()  # trivy_2 -> geparkt
+        await coordinator._process_next_job()  # crowdsec laeuft trotzdem
+
+        assert started == ['trivy_1', 'crowdsec_3']
+        assert _queued(coordinator) == []
+
+        release.set()
+        await first
+        assert _queued(coordinator) == ['trivy_2']
+        await coordinator._process_next_job()
+        assert started == ['trivy_1', 'crowdsec_3', 'trivy_2']
+
+
+class TestTimeouts:
+    @pytest.fixture(autouse=True)
+    def ai_on_first_attempt(self, coordinator):
+        coordinator.fallback_first_attempt = False
+
+    @staticmethod
+    async def _hang(*args):
+        await asyncio.Event().wait()
+
+    def test_timeouts_from_config(self):
+        config = SimpleNamespace(auto_remediation={'ai_timeout_seconds': 30, 'fix_timeout_seconds': 90})
+        coord = SelfHealingCoordinator(Mock(), config)
+        assert (coord.ai_timeout, coord.fix_timeout) == (30, 90)
+
+    @pytest.mark.asyncio
+    async def test_hung_ai_call_returns_no_strategy(self, coordinator):
+        coordinator.ai_timeout = 0.01
+        coordinator.ai_service = Mock(generate_fix_strategy=self._hang)
+
+        assert await coordinator._generate_fix_strategy(RemediationJob(event=_event(1))) is None
+        assert coordinator._strategy_inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_hung_fix_becomes_failed_result(self, coordinator):
+        coordinator.fix_timeout = 0.01
+        coordinator._fix_handlers['crowdsec'] = self._hang
+
+        result = await coordinator._apply_fix(_event(1), {})
+
+        assert result['status'] == 'failed'
+        assert result['error'].startswith('timeout')
+
+
+def test_log_calls_use_lazy_formatting():
+    """logger-Aufrufe formatieren erst beim Emittieren (%-Args statt f-Strings)."""
+    from src.integrations import self_healing
+    tree = ast.parse(Path(self_healing.__file__).read_text(encoding='utf-8'))
+    eager = [
+        node.lineno for node in ast.walk(tree)
+        if isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and getattr(node.func.value, 'id', None) == 'logger'
+        and node.args and isinstance(node.args[0], ast.JoinedStr)
+    ]
+    assert eager == []
+
+
+class TestFallbackFirstAttempt:
+    @pytest.fixture
+    def ai(self, coordinator):
+        coordinator.ai_service = Mock()
+        coordinator.ai_service.generate_fix_strategy = AsyncMock(return_value={'confidence': 0.95})
+        return coordinator.ai_service.generate_fix_strategy
+
+    @pytest.mark.asyncio
+    async def test_first_crowdsec_attempt_skips_ai(self, coordinator, ai):
+        strategy = await coordinator._generate_fix_strategy(RemediationJob(event=_event(1)))
+
+        assert strategy is coordinator._get_fallback_strategy(_event(1))
+        ai.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_retry_escalates_to_ai(self, coordinator, ai):
+        failed = Mock(strategy='ban ip', result='failed', error_message='nft missing')
+        job = RemediationJob(event=_event(1), attempts=[failed])
+
+        assert await coordinator._generate_fix_strategy(job) == {'confidence': 0.95}
+        ai.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('source', ['fail2ban', 'trivy', 'aide'])
+    async def test_other_sources_use_ai_first(self, coordinator, ai, source):
+        await coordinator._generate_fix_strategy(RemediationJob(event=_event(1, source=source)))
+        ai.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_knob_disables_shortcut(self, ai):
+        config = SimpleNamespace(auto_remediation={'fallback_first_attempt': False})
+        coord = SelfHealingCoordinator(Mock(), config)
+        coord.ai_service = Mock(generate_fix_strategy=ai)
+
+        await coord._generate_fix_strategy(RemediationJob(event=_event(1)))
+        ai.assert_awaited_once()
+
+
+class TestJobPersistence:
+    @pytest.fixture
+    def store_path(self, tmp_path):
+        return str(tmp_path / 'jobs.db')
+
+    def _coord(self, store_path):
+        config = SimpleNamespace(auto_remediation={'approval_mode': 'balanced', 'job_store_path': store_path})
+        coord = SelfHealingCoordinator(Mock(), config)
+        coord._request_approval = AsyncMock()
+        coord._execute_remediation = AsyncMock()
+        return coord
+
+    def test_payload_roundtrip(self):
+        job = RemediationJob(event=_event(1), approval_required=True, attempts=[
+            RemediationAttempt(event_id='crowdsec_1', attempt_number=1, timestamp=datetime(2026, 1, 1),
+                               strategy='ban ip', result='failed', error_message='nft missing'),
+        ])
+
+        restored = RemediationJob.from_payload(job.to_payload())
+
+        assert restored.event.to_dict() == job.event.to_dict()
+        assert restored.attempts == job.attempts
+        assert restored.approval_required is True
+        assert restored.created_at == job.created_at
+
+    @pytest.mark.asyncio
+    async def test_open_jobs_survive_restart(self, store_path):
+        first = self._coord(store_path)
+        await first.start()
+        for n in range(3):
+            await first.handle_event(_event(n))
+        await first.approve_job('crowdsec_0')
+        await first.reject_job('crowdsec_2')
+        await first.stop()
+
+        second = self._coord(store_path)
+        second.worker_count = 0  # ohne Worker bleibt die Queue zum Pruefen stehen
+        await second.start()
+        await asyncio.sleep(0)
+        try:
+            assert list(second._jobs) == ['crowdsec_0', 'crowdsec_1']
+            assert _queued(second) == ['crowdsec_0']
+            assert list(second._awaiting_approval) == ['crowdsec_1']
+            second._request_approval.assert_awaited_once_with(second._jobs['crowdsec_1'])
+        finally:
+            await second.stop()
+
+    @pytest.mark.asyncio
+    async def test_finished_jobs_are_removed_from_store(self, store_path):
+        coord = self._coord(store_path)
+        coord._send_success_notification = AsyncMock()
+        await coord.start()
+        try:
+            await coord.handle_event(_event(1))
+            await coord.approve_job('crowdsec_1')
+            job = coord._jobs['crowdsec_1']
+            assert [row[0] for row in coord._job_store.load()] == ['crowdsec_1']
+
+            await coord._handle_success(job)
+            assert coord._job_store.load() == []
+        finally:
+            await coord.stop()
+
+    @pytest.mark.asyncio
+    async def test_store_can_be_disabled(self, tmp_path):
+        coord = self._coord('')
+        await coord.start()
+        await coord.handle_event(_event(1))
+        await coord.stop()
+
+        assert coord._job_store is None
+        assert list(tmp_path.iterdir()) == []
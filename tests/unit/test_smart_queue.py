@@ -388,6 +388,16 @@ class TestGetStats:
         }
         assert expected_keys == set(stats.keys())
 
+    def test_stats_stay_scalar_for_deep_queue(self):
+        """Tiefe Fix-Queue: get_stats() liefert nur die Laenge, keine Items."""
+        q = SmartQueue({})
+        q.fix_queue.extend(_make_item(QueueItemType.FIX) for _ in range(200))
+
+        stats = q.get_stats()
+
+        assert stats["fix_queue_length"] == 200
+        assert all(isinstance(v, (int, bool)) for v in stats.values())
+
     async def test_stats_reflect_state(self):
         """Stats spiegeln den aktuellen Zustand wider."""
         q = SmartQueue({})
@@ -0,0 +1,34 @@
+import pytest
+
+from utils import fast_json
+
+
+@pytest.fixture(params=[True, False], ids=['orjson', 'stdlib'])
+def backend(request, monkeypatch):
+    """Beide Backends testen — stdlib-Fallback auch wenn orjson installiert ist."""
+    if request.param and not fast_json.ORJSON_AVAILABLE:
+        pytest.skip('orjson nicht installiert')
+    monkeypatch.setattr(fast_json, 'ORJSON_AVAILABLE', request.param)
+    return request.param
+
+
+def test_roundtrip(backend):
+    data = {'projects': {'zerodox': {'total_checks': 3, 'is_online': True}}, 'id': None}
+    raw = fast_json.dumps(data)
+
+    assert isinstance(raw, bytes)
+    assert fast_json.loads(raw) == data
+    assert fast_json.loads(raw.decode()) == data
+
+
+def test_indent_is_human_readable(backend):
+    raw = fast_json.dumps({'a': 1}, indent=True)
+
+    assert raw.decode() == '{\n  "a": 1\n}'
+
+
+def test_compact_and_unicode(backend):
+    raw = fast_json.dumps({'text': 'Ausfall-Dauer ✅'})
+
+    assert b': ' not in raw
+    assert fast_json.loads(raw)['text'] == 'Ausfall-Dauer ✅'